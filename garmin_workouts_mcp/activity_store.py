@@ -0,0 +1,285 @@
+"""Local SQLite index of activity summaries for offline queries."""
+
+import os
+import sqlite3
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+
+from .athletes import athlete_dir, current_athlete
+from .fastjson import dumps_str, loads
+
+DATA_HOME_ENV = "GARMIN_WORKOUTS_MCP_HOME"
+DEFAULT_DATA_HOME = "~/.garmin-workouts-mcp"
+ACTIVITY_DB_FILE = "activities.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS activities (
+    activity_id INTEGER PRIMARY KEY,
+    name TEXT,
+    type_key TEXT,
+    start_time_local TEXT,
+    start_time_gmt TEXT,
+    distance REAL,
+    duration REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_activities_start ON activities (start_time_local);
+CREATE INDEX IF NOT EXISTS idx_activities_type_start ON activities (type_key, start_time_local);
+CREATE INDEX IF NOT EXISTS idx_activities_distance ON activities (distance);
+CREATE TABLE IF NOT EXISTS sync_marks (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Sync marks (start times of activities, see `sync_activity_store`):
+# every activity starting at or before SYNCED_THROUGH is stored ...
+SYNCED_THROUGH = "synced_through"
+# ... and, while a sync is unfinished, every activity from the newest one
+# down to RESUME_BEFORE
+RESUME_BEFORE = "resume_before"
+
+
+def data_home() -> str:
+    """Directory holding the server's local data files."""
+    return os.path.expanduser(os.environ.get(DATA_HOME_ENV, DEFAULT_DATA_HOME))
+
+
+class ActivityStore:
+    """
+    SQLite-backed store of activity summaries as returned by the activity list endpoint.
+
+    Summaries are stored whole as JSON; the columns used for filtering are
+    extracted into indexed columns.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def count(self) -> int:
+        """Number of stored activities."""
+        return self._conn.execute("SELECT COUNT(*) FROM activities").fetchone()[0]
+
+    def latest_start_time(self) -> Optional[str]:
+        """Local start time of the most recent stored activity, if any."""
+        return self._conn.execute(
+            "SELECT MAX(start_time_local) FROM activities"
+        ).fetchone()[0]
+
+    def known_ids(self, activity_ids: Iterable[int]) -> Set[int]:
+        """
+        Returns which of the given activity IDs are already stored.
+
+        Args:
+            activity_ids: Activity IDs to look up
+
+        Returns:
+            The subset of IDs present in the store
+        """
+        ids = [int(activity_id) for activity_id in activity_ids]
+        if not ids:
+            return set()
+        placeholders = ",".join("?" * len(ids))
+        rows = self._conn.execute(
+            f"SELECT activity_id FROM activities WHERE activity_id IN ({placeholders})",
+            ids,
+        )
+        return {row[0] for row in rows}
+
+    def sync_mark(self, name: str) -> Optional[str]:
+        """Value of a sync mark (``SYNCED_THROUGH`` or ``RESUME_BEFORE``), if set."""
+        row = self._conn.execute(
+            "SELECT value FROM sync_marks WHERE name = ?", (name,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_sync_marks(self, marks: Dict[str, Optional[str]]) -> None:
+        """Sets sync marks; None clears a mark."""
+        with self._conn:
+            self._write_marks(marks)
+
+    def _write_marks(self, marks: Dict[str, Optional[str]]) -> None:
+        for name, value in marks.items():
+            if value is None:
+                self._conn.execute("DELETE FROM sync_marks WHERE name = ?", (name,))
+            else:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sync_marks VALUES (?, ?)", (name, value)
+                )
+
+    def upsert(
+        self,
+        activities: Iterable[dict],
+        marks: Optional[Dict[str, Optional[str]]] = None,
+    ) -> int:
+        """
+        Inserts or replaces activity summaries.
+
+        Args:
+            activities: Activity summaries from the activity list endpoint
+            marks: Sync marks to set in the same transaction, so the marks
+                never claim activities that were not written
+
+        Returns:
+            The number of rows written
+        """
+        rows = [
+            (
+                int(activity["activityId"]),
+                activity.get("activityName"),
+                (activity.get("activityType") or {}).get("typeKey"),
+                activity.get("startTimeLocal"),
+                activity.get("startTimeGMT"),
+                activity.get("distance"),
+                activity.get("duration"),
+                dumps_str(activity),
+            )
+            for activity in activities
+        ]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO activities VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            if marks:
+                self._write_marks(marks)
+        return len(rows)
+
+    def retain(self, activity_ids: Iterable[int]) -> int:
+        """
+        Deletes every stored activity not in the given IDs.
+
+        Returns:
+            The number of rows deleted
+        """
+        with self._conn:
+            self._conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS keep (id INTEGER PRIMARY KEY)"
+            )
+            self._conn.execute("DELETE FROM keep")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO keep VALUES (?)",
+                ((int(activity_id),) for activity_id in activity_ids),
+            )
+            cursor = self._conn.execute(
+                "DELETE FROM activities WHERE activity_id NOT IN (SELECT id FROM keep)"
+            )
+        return cursor.rowcount
+
+    def query(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        type_key: Optional[str] = None,
+        min_distance: Optional[float] = None,
+        max_distance: Optional[float] = None,
+        name: Optional[str] = None,
+        limit: int = 50,
+    ) -> List[dict]:
+        """
+        Finds stored activities, most recent first.
+
+        Args:
+            start_date: Only activities starting on or after this day
+            end_date: Only activities starting on or before this day
+            type_key: Activity type key, e.g. 'running'
+            min_distance: Minimum distance in meters
+            max_distance: Maximum distance in meters
+            name: Case-insensitive substring of the activity name
+            limit: Maximum number of activities to return
+
+        Returns:
+            The matching activity summaries
+        """
+        clauses, params = [], []
+        if start_date is not None:
+            clauses.append("start_time_local >= ?")
+            params.append(start_date.isoformat())
+        if end_date is not None:
+            clauses.append("start_time_local < ?")
+            params.append((end_date + timedelta(days=1)).isoformat())
+        if type_key is not None:
+            clauses.append("type_key = ?")
+            params.append(type_key)
+        if min_distance is not None:
+            clauses.append("distance >= ?")
+            params.append(min_distance)
+        if max_distance is not None:
+            clauses.append("distance <= ?")
+            params.append(max_distance)
+        if name:
+            clauses.append("name LIKE ? ESCAPE '\\'")
+            escaped = name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+
+        sql = "SELECT data FROM activities"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY start_time_local DESC LIMIT ?"
+        params.append(limit)
+
+        return [loads(row[0]) for row in self._conn.execute(sql, params)]
+
+    def daily_totals(
+        self, start_date: date, end_date: date, type_key: Optional[str] = None
+    ) -> List[tuple]:
+        """
+        Sums distance, duration and training load of stored activities per day.
+
+        Args:
+            start_date: First day to include
+            end_date: Last day to include
+            type_key: Only activities of this type key, e.g. 'running'
+
+        Returns:
+            (day 'YYYY-MM-DD', distance in meters, duration in seconds, training
+            load, activity count) tuples for the days with activities, in order.
+            Activities without Garmin's ``activityTrainingLoad`` add no load.
+        """
+        sql = (
+            "SELECT substr(start_time_local, 1, 10) AS day, "
+            "TOTAL(distance), TOTAL(duration), "
+            "TOTAL(json_extract(data, '$.activityTrainingLoad')), COUNT(*) "
+            "FROM activities WHERE start_time_local >= ? AND start_time_local < ?"
+        )
+        params = [start_date.isoformat(), (end_date + timedelta(days=1)).isoformat()]
+        if type_key is not None:
+            sql += " AND type_key = ?"
+            params.append(type_key)
+        sql += " GROUP BY day ORDER BY day"
+        return self._conn.execute(sql, params).fetchall()
+
+
+_store: Optional[ActivityStore] = None
+_athlete_stores: Dict[str, ActivityStore] = {}
+
+
+def get_activity_store(athlete: Optional[str] = None) -> ActivityStore:
+    """
+    Return an athlete's activity store, opening it on first use.
+
+    Args:
+        athlete: Athlete identifier. Defaults to the athlete of the current tool
+            call, or the server's default account if there is none.
+    """
+    global _store
+    if athlete is None:
+        athlete = current_athlete.get()
+    if athlete is None:
+        if _store is None:
+            _store = ActivityStore(os.path.join(data_home(), ACTIVITY_DB_FILE))
+        return _store
+
+    store = _athlete_stores.get(athlete)
+    if store is None:
+        path = os.path.join(athlete_dir(data_home(), athlete), ACTIVITY_DB_FILE)
+        store = _athlete_stores[athlete] = ActivityStore(path)
+    return store
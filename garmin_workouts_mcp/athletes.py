@@ -0,0 +1,94 @@
+"""Selection of the Garmin account (athlete) a tool call acts on.
+
+One server can act for several Garmin accounts. Each tool takes an optional
+``athlete`` identifier; while the tool runs it is held in a context variable,
+so the shared helpers (``get_client``, ``get_activity_store``, ...) resolve the
+athlete's own client, cache and activity index without threading it through
+every call. Tokens of each athlete live in ``$GARTH_HOME/athletes/<athlete>``.
+"""
+
+import functools
+import inspect
+import os
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+ATHLETES_DIR = "athletes"
+
+_ATHLETE_ID = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.@-]{0,63}$")
+
+current_athlete: ContextVar[Optional[str]] = ContextVar("current_athlete", default=None)
+
+
+def validate_athlete(athlete: str) -> str:
+    """
+    Check that an athlete identifier is safe to use as a directory name.
+
+    Args:
+        athlete: Athlete identifier, e.g. 'jane' or 'jane@example.com'
+
+    Returns:
+        The identifier
+
+    Raises:
+        ValueError: If the identifier is empty, too long or contains other
+            characters than letters, digits, '_', '.', '@' and '-'
+    """
+    if not isinstance(athlete, str) or not _ATHLETE_ID.match(athlete):
+        raise ValueError(
+            f"Invalid athlete identifier {athlete!r}: use up to 64 letters, digits, "
+            "'_', '.', '@' or '-', starting with a letter or digit"
+        )
+    return athlete
+
+
+def athlete_dir(base_dir: str, athlete: str) -> str:
+    """Directory under ``base_dir`` holding one athlete's files."""
+    return os.path.join(
+        os.path.expanduser(base_dir), ATHLETES_DIR, validate_athlete(athlete)
+    )
+
+
+@contextmanager
+def use_athlete(athlete: Optional[str]) -> Iterator[None]:
+    """Act on behalf of ``athlete`` (None for the default account) within the block."""
+    if athlete is not None:
+        validate_athlete(athlete)
+    token = current_athlete.set(athlete)
+    try:
+        yield
+    finally:
+        current_athlete.reset(token)
+
+
+def athlete_scoped(func: Callable) -> Callable:
+    """
+    Decorator running a tool on behalf of the athlete given in its ``athlete`` argument.
+
+    The tool must declare an ``athlete`` parameter; it is left in the signature
+    so FastMCP exposes it to clients.
+    """
+    signature = inspect.signature(func)
+    if "athlete" not in signature.parameters:
+        raise TypeError(f"{func.__name__} has no 'athlete' parameter")
+
+    def athlete_of(args, kwargs) -> Optional[str]:
+        return signature.bind_partial(*args, **kwargs).arguments.get("athlete")
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with use_athlete(athlete_of(args, kwargs)):
+                return await func(*args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with use_athlete(athlete_of(args, kwargs)):
+            return func(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,42 @@
+"""Bounded-concurrency fan-out for batch tools."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_CONCURRENCY = 5
+
+
+async def map_bounded(
+    func: Callable[[T], Awaitable[Any]],
+    items: Iterable[T],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> List[Tuple[Any, Optional[Exception]]]:
+    """
+    Runs a coroutine function over items with at most `concurrency` running at once.
+
+    A failing item does not cancel the others.
+
+    Args:
+        func: Coroutine function called once per item
+        items: The items to process
+        concurrency: Maximum number of calls in flight
+
+    Returns:
+        One ``(result, error)`` tuple per item, in input order. ``error`` is None
+        on success and ``result`` is None on failure.
+    """
+    if concurrency <= 0:
+        raise ValueError(f"concurrency must be positive, got {concurrency}")
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(item: T) -> Tuple[Any, Optional[Exception]]:
+        async with semaphore:
+            try:
+                return await func(item), None
+            except Exception as e:  # noqa: BLE001 - reported per item
+                return None, e
+
+    return await asyncio.gather(*(run(item) for item in items))
@@ -0,0 +1,165 @@
+"""Bounded in-process cache for Garmin Connect responses."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+DEFAULT_MAX_ENTRIES = 512
+
+_MISSING = object()
+
+
+def make_cache_key(path: str, params: Optional[dict] = None) -> Tuple:
+    """
+    Build a cache key from an endpoint path and its query parameters.
+
+    Args:
+        path: The endpoint path
+        params: Query parameters sent with the request, if any
+
+    Returns:
+        A hashable key; the path is always the first element so entries can be
+        invalidated by path prefix.
+    """
+    if not params:
+        return (path,)
+    return (path, tuple(sorted(params.items())))
+
+
+class ResponseCache:
+    """
+    TTL cache with least-recently-used eviction.
+
+    Each entry carries its own expiry so different endpoints can use different
+    TTLs. When the cache is full the least recently used entry is evicted.
+    A value loaded by ``get_or_load`` is not stored if its path was invalidated
+    while the load was running, since it may predate the write that invalidated it.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, Tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Invalidation counter, and the count at the latest invalidation of each
+        # path and prefix; only kept while loads are running
+        self._generation = 0
+        self._invalidated: Dict[str, int] = {}
+        self._invalidated_prefixes: Dict[str, int] = {}
+        self._loading = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look up a key, counting the hit or miss.
+
+        Returns:
+            The cached value, or ``default`` if the key is absent or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return default
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """Store a value for ``ttl`` seconds, evicting the LRU entry if full."""
+        if ttl <= 0:
+            return
+        self._entries[key] = (self._clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_load(
+        self, key: Hashable, ttl: float, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Return the cached value for ``key`` or await ``loader`` and cache its result.
+
+        The result is returned but not cached if the key's path was invalidated
+        while ``loader`` was running.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            started = self._generation
+            self._loading += 1
+            try:
+                value = await loader()
+                if not self._invalidated_since(key[0], started):
+                    self.set(key, value, ttl)
+            finally:
+                self._loading -= 1
+                if not self._loading:
+                    self._invalidated.clear()
+                    self._invalidated_prefixes.clear()
+        return value
+
+    def _invalidated_since(self, path: str, generation: int) -> bool:
+        """Whether ``path`` was invalidated after the counter was at ``generation``."""
+        if self._invalidated.get(path, 0) > generation:
+            return True
+        return any(
+            path.startswith(prefix) and invalidated > generation
+            for prefix, invalidated in self._invalidated_prefixes.items()
+        )
+
+    def invalidate(self, path: str) -> int:
+        """
+        Drop every entry for an endpoint path, whatever its query parameters.
+
+        Returns:
+            The number of entries removed.
+        """
+        if self._loading:
+            self._generation += 1
+            self._invalidated[path] = self._generation
+        stale = [key for key in self._entries if key[0] == path]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        """
+        Drop every entry whose endpoint path starts with ``prefix``.
+
+        Returns:
+            The number of entries removed.
+        """
+        if self._loading:
+            self._generation += 1
+            self._invalidated_prefixes[prefix] = self._generation
+        stale = [key for key in self._entries if key[0].startswith(prefix)]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        """Remove all entries. Counters are kept."""
+        self.invalidate_prefix("")
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the current size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "maxEntries": self.max_entries,
+        }
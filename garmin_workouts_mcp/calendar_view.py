@@ -0,0 +1,72 @@
+"""Helpers for cutting weekly calendar views out of monthly calendar documents."""
+
+from datetime import date, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+
+def week_bounds(day: date, start: int = 1) -> Tuple[date, date]:
+    """
+    Calculates the 7-day window containing a day.
+
+    Args:
+        day: A day inside the week
+        start: First weekday of the week as used by Garmin (0=Sunday, 1=Monday, ...)
+
+    Returns:
+        A tuple containing the first and last day of the week
+    """
+    # date.weekday() is Monday-based, Garmin's start offset is Sunday-based
+    sunday_based = (day.weekday() + 1) % 7
+    first = day - timedelta(days=(sunday_based - start) % 7)
+    return first, first + timedelta(days=6)
+
+
+def months_in_range(first: date, last: date) -> List[Tuple[int, int]]:
+    """
+    Lists the (year, month) pairs overlapping a date range of at most a few weeks.
+
+    Args:
+        first: First day of the range
+        last: Last day of the range
+
+    Returns:
+        The months in chronological order, 1-based
+    """
+    months = [(first.year, first.month)]
+    if (last.year, last.month) != months[0]:
+        months.append((last.year, last.month))
+    return months
+
+
+def slice_week(
+    month_documents: Iterable[Optional[dict]], first: date, last: date
+) -> dict:
+    """
+    Builds a weekly calendar document from the monthly documents covering it.
+
+    Args:
+        month_documents: Monthly calendar responses overlapping the week
+        first: First day of the week
+        last: Last day of the week
+
+    Returns:
+        A calendar document with the week's bounds and its calendar items in date order
+    """
+    first_iso, last_iso = first.isoformat(), last.isoformat()
+    items = []
+    seen = set()
+
+    for document in month_documents:
+        for item in (document or {}).get("calendarItems") or []:
+            item_date = item.get("date")
+            if not item_date or not first_iso <= item_date <= last_iso:
+                continue
+            # Month grids may repeat days of the neighbouring month
+            identity = (item.get("itemType"), item.get("id"), item_date)
+            if item.get("id") is not None and identity in seen:
+                continue
+            seen.add(identity)
+            items.append(item)
+
+    items.sort(key=lambda item: item["date"])
+    return {"startDate": first_iso, "endDate": last_iso, "calendarItems": items}
@@ -0,0 +1,396 @@
+"""Async HTTP client for the Garmin Connect API.
+
+The MCP tools share one process-wide ``httpx.AsyncClient`` so concurrent tool
+calls reuse pooled keep-alive connections and overlap their network waits.
+Authentication reuses the OAuth tokens held by garth; they are refreshed in the
+background ahead of expiry and persisted to ``GARTH_HOME``.
+
+Besides the default account, the server keeps one client per athlete (see
+``athletes``), each with its own garth tokens, response cache and rate limiter.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+import httpx
+
+from .athletes import athlete_dir, current_athlete
+from .cache import ResponseCache, make_cache_key
+from .fastjson import dumps, loads
+from .metrics import get_metrics
+from .ratelimit import AdaptiveRateLimiter, get_rate_limiter, parse_retry_after
+from .retry import RetryPolicy
+from .singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    import garth
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 10
+USER_AGENT = "GCM-iOS-5.22.1.4"
+
+GARTH_HOME_ENV = "GARTH_HOME"
+DEFAULT_GARTH_HOME = "~/.garth"
+
+# Background token refresh: renew this long before the OAuth2 token expires,
+# never more often than the minimum interval, and wait before retrying failures
+TOKEN_REFRESH_MARGIN = 300.0
+TOKEN_REFRESH_MIN_INTERVAL = 60.0
+TOKEN_REFRESH_RETRY_DELAY = 60.0
+
+
+def garth_home() -> str:
+    """Directory where garth's OAuth tokens are stored."""
+    return os.environ.get(GARTH_HOME_ENV, DEFAULT_GARTH_HOME)
+
+
+class GarminAPIError(Exception):
+    """Raised when Garmin Connect responds with an HTTP error status."""
+
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class GarminClient:
+    """Async Garmin Connect API client backed by a pooled HTTP connection."""
+
+    def __init__(
+        self,
+        garth_client: Optional["garth.Client"] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        limiter: Optional[AdaptiveRateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        token_dir: Optional[str] = None,
+        relogin_from_env: bool = True,
+    ):
+        if garth_client is None:
+            # Deferred: garth is only needed once a request is made
+            import garth
+
+            garth_client = garth.client
+        self.garth = garth_client
+        self.token_dir = token_dir
+        # GARMIN_EMAIL/GARMIN_PASSWORD belong to the default account only
+        self.relogin_from_env = relogin_from_env
+        self.limiter = limiter or get_rate_limiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self._transport = transport
+        self._http: Optional[httpx.AsyncClient] = None
+        self._refresh_lock = asyncio.Lock()
+        # Bumped on every token renewal, so callers that saw an old token can
+        # tell whether someone else already renewed it
+        self._auth_generation = 0
+        self._refresher: Optional[asyncio.Task] = None
+        self.cache = ResponseCache()
+        self.singleflight = SingleFlight()
+
+    @property
+    def base_url(self) -> str:
+        """Base URL of the Connect API for the configured garth domain."""
+        return f"https://connectapi.{self.garth.domain}"
+
+    def _get_http(self) -> httpx.AsyncClient:
+        """Return the pooled HTTP client, creating it on first use."""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=self.limits,
+                headers={"User-Agent": USER_AGENT},
+                transport=self._transport,
+            )
+        return self._http
+
+    async def _authorization(self) -> str:
+        """Get the Authorization header value, renewing the OAuth2 token if expired."""
+        token = self.garth.oauth2_token
+        if token is None or getattr(token, "expired", True):
+            await self.renew_token(self._auth_generation)
+        return str(self.garth.oauth2_token)
+
+    async def renew_token(self, seen_generation: Optional[int] = None) -> None:
+        """
+        Refresh the OAuth2 token, logging in again if the refresh is rejected.
+
+        Renewals are serialized: callers pass the token generation they saw
+        fail or expire, and if another caller has renewed the token since, the
+        call returns without contacting Garmin. Concurrent auth failures
+        therefore cause exactly one renewal.
+
+        Args:
+            seen_generation: Token generation the caller observed. If None, the
+                token is renewed unconditionally.
+        """
+        async with self._refresh_lock:
+            if seen_generation is not None and seen_generation != self._auth_generation:
+                return
+            # garth's token exchange and login are blocking
+            await asyncio.to_thread(self._renew_token_sync)
+            self._auth_generation += 1
+
+    def _renew_token_sync(self) -> None:
+        try:
+            self.garth.refresh_oauth2()
+        except Exception as e:
+            email = os.environ.get("GARMIN_EMAIL")
+            password = os.environ.get("GARMIN_PASSWORD")
+            if not self.relogin_from_env or not email or not password:
+                raise
+            logger.warning("OAuth2 token refresh failed (%s), logging in again", e)
+            self.garth.login(email, password)
+        if self.token_dir:
+            self.garth.dump(self.token_dir)
+
+    def start_token_refresher(self) -> asyncio.Task:
+        """Start renewing the OAuth2 token in the background ahead of its expiry."""
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.create_task(self._refresh_tokens_forever())
+        return self._refresher
+
+    async def _refresh_tokens_forever(self) -> None:
+        while True:
+            token = self.garth.oauth2_token
+            expires_at = getattr(token, "expires_at", None)
+            if expires_at is None:
+                # Not logged in (yet); nothing to refresh
+                delay = TOKEN_REFRESH_RETRY_DELAY
+            else:
+                delay = max(
+                    TOKEN_REFRESH_MIN_INTERVAL,
+                    expires_at - TOKEN_REFRESH_MARGIN - time.time(),
+                )
+            await asyncio.sleep(delay)
+            if getattr(self.garth.oauth2_token, "expires_at", None) is None:
+                continue
+            try:
+                await self.renew_token(self._auth_generation)
+                logger.info("Refreshed Garmin OAuth2 token ahead of expiry")
+            except Exception as e:  # noqa: BLE001 - keep the refresh loop alive
+                logger.warning("Background token refresh failed: %s", e)
+                await asyncio.sleep(TOKEN_REFRESH_RETRY_DELAY)
+
+    async def connectapi(
+        self,
+        path: str,
+        method: str = "GET",
+        idempotent: Optional[bool] = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Call a Connect API endpoint.
+
+        Concurrent GET requests for the same path and query parameters are
+        coalesced into a single HTTP request whose result all callers share.
+        Transient failures are retried according to the client's retry policy,
+        and a 401 renews the token once before the request is sent again.
+
+        Args:
+            path: Endpoint path, e.g. ``/workout-service/workouts``
+            method: HTTP method
+            idempotent: Whether the request may be repeated safely. Defaults to
+                True for GET, PUT and DELETE and False for POST.
+            **kwargs: Passed through to ``httpx.AsyncClient.request`` (``params``, ``json``, ...).
+                A ``json`` body is encoded with the fast encoder of ``fastjson``.
+
+        Returns:
+            The decoded JSON response, or None for empty responses.
+
+        Raises:
+            GarminAPIError: If Garmin responds with an error status.
+        """
+        if "json" in kwargs:
+            # Encode once, not on every retry, and faster than httpx's stdlib encoder
+            kwargs["content"] = dumps(kwargs.pop("json"))
+            kwargs["headers"] = {
+                **kwargs.get("headers", {}),
+                "Content-Type": "application/json",
+            }
+
+        async def attempt():
+            return await self.retry_policy.run(
+                lambda: self._request(method, path, **kwargs), method, idempotent
+            )
+
+        async def send():
+            generation = self._auth_generation
+            try:
+                return await attempt()
+            except GarminAPIError as e:
+                if e.status_code != 401:
+                    raise
+            # Rejected before processing, so resending is safe for any method
+            await self.renew_token(generation)
+            return await attempt()
+
+        if method.upper() == "GET":
+            key = make_cache_key(path, kwargs.get("params"))
+            return await self.singleflight.do(key, send)
+        return await send()
+
+    def invalidate(self, path: str) -> None:
+        """
+        Drop cached responses for an endpoint path after a write to it.
+
+        GETs of the path still in flight are neither cached nor joined by
+        later callers, whose requests see the write.
+        """
+        self.cache.invalidate(path)
+        self.singleflight.forget(lambda key: key[0] == path)
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        """Like ``invalidate`` for every endpoint path starting with ``prefix``."""
+        self.cache.invalidate_prefix(prefix)
+        self.singleflight.forget(lambda key: key[0].startswith(prefix))
+
+    async def _request(self, method: str, path: str, **kwargs) -> Any:
+        """Send one request through the rate limiter and decode its response."""
+        headers = {
+            **kwargs.pop("headers", {}),
+            "Authorization": await self._authorization(),
+        }
+        await self.limiter.acquire()
+        # Time spent waiting for the rate limiter is not Garmin I/O
+        started = time.perf_counter()
+        try:
+            response = await self._get_http().request(
+                method, path, headers=headers, **kwargs
+            )
+        except httpx.TransportError:
+            get_metrics().observe_request(
+                method, path, time.perf_counter() - started, error=True
+            )
+            raise
+        get_metrics().observe_request(
+            method,
+            path,
+            time.perf_counter() - started,
+            error=response.is_error,
+            size=len(response.content),
+        )
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        self.limiter.record(response.status_code, retry_after)
+
+        if response.is_error:
+            raise GarminAPIError(
+                f"Error in request: {response.status_code} {response.reason_phrase} "
+                f"for {method} {path}",
+                status_code=response.status_code,
+                retry_after=retry_after,
+            )
+
+        if response.status_code == 204 or not response.content:
+            return None
+        return loads(response.content)
+
+    async def aclose(self) -> None:
+        """Stop the background token refresh and close pooled connections."""
+        if self._refresher is not None:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+            self._refresher = None
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+
+_client: Optional[GarminClient] = None
+_athlete_clients: Dict[str, GarminClient] = {}
+
+
+def get_client(athlete: Optional[str] = None) -> GarminClient:
+    """
+    Return the Garmin client of an athlete, creating it on first use.
+
+    Args:
+        athlete: Athlete identifier. Defaults to the athlete of the current tool
+            call, or the server's default account if there is none.
+
+    Raises:
+        ValueError: If no tokens have been saved for the athlete.
+    """
+    global _client
+    if athlete is None:
+        athlete = current_athlete.get()
+    if athlete is None:
+        if _client is None:
+            _client = GarminClient(token_dir=garth_home())
+        return _client
+
+    client = _athlete_clients.get(athlete)
+    if client is None:
+        client = _athlete_clients[athlete] = create_athlete_client(athlete)
+    return client
+
+
+def create_athlete_client(athlete: str) -> GarminClient:
+    """
+    Create a client for an athlete from the tokens saved in their token directory.
+
+    Raises:
+        ValueError: If no tokens have been saved for the athlete.
+    """
+    import garth
+
+    token_dir = athlete_dir(garth_home(), athlete)
+    garth_client = garth.Client()
+    try:
+        garth_client.load(token_dir)
+    except FileNotFoundError:
+        raise ValueError(
+            f"No saved Garmin tokens for athlete '{athlete}'. "
+            f"Log in first with: garmin-workouts-mcp --login-athlete {athlete}"
+        )
+    client = GarminClient(
+        garth_client,
+        limiter=AdaptiveRateLimiter(),
+        token_dir=token_dir,
+        relogin_from_env=False,
+    )
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        client.start_token_refresher()
+    return client
+
+
+async def close_client() -> None:
+    """Close the default and every athlete's Garmin client."""
+    global _client
+    clients = list(_athlete_clients.values())
+    _athlete_clients.clear()
+    if _client is not None:
+        clients.append(_client)
+        _client = None
+    for client in clients:
+        await client.aclose()
+
+
+async def connectapi(path: str, method: str = "GET", **kwargs) -> Any:
+    """Async counterpart of ``garth.connectapi`` using the current athlete's client."""
+    return await get_client().connectapi(path, method, **kwargs)
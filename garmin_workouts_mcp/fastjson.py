@@ -0,0 +1,38 @@
+"""Fast JSON encoding and decoding for Garmin responses, request bodies and tool results.
+
+Uses orjson when it is installed (``pip install garmin-workouts-mcp[fast]``) and
+otherwise pydantic-core's JSON implementation, which always ships with FastMCP.
+Both are several times faster than the standard library ``json`` module on
+large activity pages and calendar months. Output is compact UTF-8; values that
+are not JSON types (dates, ...) are encoded with ``str``.
+"""
+
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+import pydantic_core
+
+BACKEND = "orjson" if orjson is not None else "pydantic-core"
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode ``obj`` as compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return pydantic_core.to_json(obj, fallback=str)
+
+
+def dumps_str(obj: Any) -> str:
+    """Encode ``obj`` as a compact JSON string."""
+    return dumps(obj).decode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode a JSON document."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return pydantic_core.from_json(data)
@@ -1,4 +1,9 @@
-from typing import List, Tuple
+import os
+import threading
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
 
 
 # Sport type mapping
@@ -103,6 +108,9 @@ DEFAULT_PACE = {
     "cardio": 0.36,  # Same as running
 }
 
+# Sport type keys of workouts whose distance means nothing; estimated as 0
+NO_DISTANCE_SPORTS = ("strength_training", "cardio_training")
+
 
 def make_payload(workout: dict) -> dict:
     """
@@ -136,18 +144,110 @@ def make_payload(workout: dict) -> dict:
         "workoutSteps": [],
     }
 
-    result = process_steps(workout["steps"], step_order)
+    # Steps, duration and distance estimates are built in the same pass
+    result = process_steps(workout["steps"], step_order, sport_type["sportTypeKey"])
     segment["workoutSteps"] = result["steps"]
     step_order = result["stepOrder"]
 
     payload["workoutSegments"].append(segment)
-    payload["estimatedDurationInSecs"] = calculate_estimated_duration(
-        payload["workoutSegments"]
-    )
+    payload["estimatedDurationInSecs"] = int(result["duration"])
+    if sport_type["sportTypeKey"] not in NO_DISTANCE_SPORTS:
+        payload["estimatedDistanceInMeters"] = int(result["distance"])
 
     return payload
 
 
+# Batches at least this large are compiled in the process pool; smaller ones
+# finish faster in-process than they take to send to the workers
+PROCESS_POOL_THRESHOLD = 1000
+
+# Workouts sent to a pool worker at a time
+PROCESS_POOL_CHUNK_SIZE = 250
+
+_pool: Optional["ProcessPoolExecutor"] = None
+_pool_lock = threading.Lock()
+
+
+def make_payloads(
+    workouts: Sequence[dict], threshold: int = PROCESS_POOL_THRESHOLD
+) -> List[Tuple[Optional[dict], Optional[Exception]]]:
+    """
+    Creates the payloads of many workouts in one call.
+
+    Batches of at least ``threshold`` workouts are compiled by a pool of worker
+    processes, one per CPU, so large conversions use several cores. They are
+    sent to the workers in chunks of ``PROCESS_POOL_CHUNK_SIZE`` workouts, or
+    in two halves when smaller than two chunks. The pool is started on first
+    use and kept for later batches. An invalid workout does not stop the others.
+
+    The pool is meant for bulk conversions by library users; the tools stay
+    below the threshold (`upload_workouts` takes at most 50 workouts) and
+    compile in-process.
+
+    Args:
+        workouts: The workout objects to convert, as for `make_payload`
+        threshold: Minimum batch size compiled in the process pool. A single
+            workout is always compiled in-process.
+
+    Returns:
+        One ``(payload, error)`` tuple per workout, in input order. ``error`` is
+        None on success and ``payload`` is None on failure.
+    """
+    workouts = list(workouts)
+    if len(workouts) < max(threshold, 2) or (os.cpu_count() or 1) < 2:
+        return _make_payload_chunk(workouts)
+
+    from concurrent.futures.process import BrokenProcessPool
+
+    # Halve smaller batches so at least two workers share them
+    chunk_size = min(PROCESS_POOL_CHUNK_SIZE, -(-len(workouts) // 2))
+    chunks = [workouts[i : i + chunk_size] for i in range(0, len(workouts), chunk_size)]
+    try:
+        results = []
+        for chunk_results in _get_process_pool().map(_make_payload_chunk, chunks):
+            results.extend(chunk_results)
+        return results
+    except BrokenProcessPool:
+        # Workers could not start (e.g. the main module cannot be re-imported)
+        shutdown_process_pool()
+        return _make_payload_chunk(workouts)
+
+
+def _get_process_pool() -> "ProcessPoolExecutor":
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # "spawn" rather than fork: the MCP server runs threads that fork
+            # could copy mid-operation
+            _pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def shutdown_process_pool() -> None:
+    """Stop the worker processes of `make_payloads`, if they were started."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _make_payload_chunk(
+    workouts: List[dict],
+) -> List[Tuple[Optional[dict], Optional[Exception]]]:
+    """Compile a chunk of workouts, capturing each one's error."""
+    results = []
+    for workout in workouts:
+        try:
+            results.append((make_payload(workout), None))
+        except Exception as e:  # noqa: BLE001 - reported per workout
+            results.append((None, e))
+    return results
+
+
 def get_sport_type(sport_type_key: str) -> dict:
     """
     Retrieves the sport type object from the mapping.
@@ -167,65 +267,122 @@ def get_sport_type(sport_type_key: str) -> dict:
     return sport_type
 
 
-def process_steps(steps_array: List[dict], step_order: int) -> dict:
+def process_steps(
+    steps_array: List[dict], step_order: int, sport_type: str = "running"
+) -> dict:
     """
-    Recursively processes an array of steps.
+    Processes an array of steps, including nested repeat groups.
+
+    Nested repeats are walked with an explicit stack rather than recursion, so
+    there is no limit on the nesting depth.
 
     Args:
         steps_array: The array of steps to process
         step_order: The current step order
+        sport_type: The sport type key used for estimates (e.g., 'running')
 
     Returns:
-        An object containing the array of formatted steps and updated stepOrder
+        An object containing the array of formatted steps, updated stepOrder
+        and the estimated duration (seconds) and distance (meters) of the steps
     """
-    steps = []
+    root = _StepFrame(steps_array)
+    stack = [root]
+
+    while stack:
+        frame = stack[-1]
+        step = next(frame.children, None)
+
+        if step is None:
+            # All children of this level are done: close its repeat group
+            stack.pop()
+            if frame.repeat_step is not None:
+                frame.repeat_step["workoutSteps"] = frame.steps
+                iterations = frame.repeat_step["numberOfIterations"]
+                parent = stack[-1]
+                parent.steps.append(frame.repeat_step)
+                parent.duration += iterations * frame.duration
+                parent.distance += iterations * frame.distance
+        elif is_repeat_step(step):
+            repeat_step = make_repeat_step(step, step_order)
+            step_order += 1
+            stack.append(_StepFrame(step["steps"], repeat_step))
+        else:
+            result = process_step(step, step_order, sport_type)
+            frame.steps.append(result["step"])
+            step_order = result["stepOrder"]
+            frame.duration += result["duration"]
+            frame.distance += result["distance"]
+
+    return {
+        "steps": root.steps,
+        "stepOrder": step_order,
+        "duration": root.duration,
+        "distance": root.distance,
+    }
 
-    for step in steps_array:
-        result = process_step(step, step_order)
-        steps.append(result["step"])
-        step_order = result["stepOrder"]
 
-    return {"steps": steps, "stepOrder": step_order}
+class _StepFrame:
+    """One level of the step traversal: its remaining input steps and its output so far."""
 
+    __slots__ = ("children", "distance", "duration", "repeat_step", "steps")
 
-def process_step(step: dict, step_order: int) -> dict:
+    def __init__(self, children: List[dict], repeat_step: Optional[dict] = None):
+        self.children = iter(children)
+        self.repeat_step = repeat_step
+        self.steps = []
+        self.duration = 0
+        self.distance = 0.0
+
+
+def is_repeat_step(step: dict) -> bool:
+    """Whether an input step is a repeat group with child steps."""
+    # Handle both stepType and endConditionType for identifying repeat steps
+    return bool(
+        step.get("numberOfIterations")
+        and step.get("steps")
+        and (
+            step.get("stepType") == "repeat" or step.get("endConditionType") == "repeat"
+        )
+    )
+
+
+def process_step(step: dict, step_order: int, sport_type: str = "running") -> dict:
     """
     Processes an individual step (regular or repeat).
 
     Args:
         step: The step object to process
         step_order: The current step order
+        sport_type: The sport type key used for estimates (e.g., 'running')
 
     Returns:
-        An object containing the formatted step and updated stepOrder
+        An object containing the formatted step, updated stepOrder and its
+        estimated duration and distance
     """
-    # Handle both stepType and endConditionType for identifying repeat steps
-    if (
-        step.get("numberOfIterations")
-        and step.get("steps")
-        and (
-            step.get("stepType") == "repeat" or step.get("endConditionType") == "repeat"
-        )
-    ):
-        return process_repeat_step(step, step_order)
+    if is_repeat_step(step):
+        return process_repeat_step(step, step_order, sport_type)
     elif not step.get("stepType"):
         raise ValueError(
             f"Missing stepType for step: {step.get('stepName', 'Unnamed Step')}"
         )
     else:
-        return process_regular_step(step, step_order)
+        return process_regular_step(step, step_order, sport_type)
 
 
-def process_regular_step(step: dict, step_order: int) -> dict:
+def process_regular_step(
+    step: dict, step_order: int, sport_type: str = "running"
+) -> dict:
     """
     Processes a regular executable step.
 
     Args:
         step: The step object to process
         step_order: The current step order
+        sport_type: The sport type key used for estimates (e.g., 'running')
 
     Returns:
-        An object containing the formatted executable step and updated stepOrder
+        An object containing the formatted executable step, updated stepOrder
+        and its estimated duration and distance
     """
     step_type = STEP_TYPE_MAPPING.get(
         step["stepType"].lower(), STEP_TYPE_MAPPING["interval"]
@@ -290,20 +447,67 @@ def process_regular_step(step: dict, step_order: int) -> dict:
     ):
         workout_step["targetValueUnit"] = None
 
+    if workout_step["endCondition"]["conditionTypeKey"] == "distance":
+        distance = workout_step["endConditionValue"]
+        duration = estimate_step_duration(workout_step, sport_type)
+    else:
+        duration = workout_step["endConditionValue"]
+        # Without a pace or speed target, the distance covered is unknown
+        pace = target_pace(workout_step)
+        distance = duration / pace if pace else 0
+
     step_order += 1
-    return {"step": workout_step, "stepOrder": step_order}
+    return {
+        "step": workout_step,
+        "stepOrder": step_order,
+        "duration": duration,
+        "distance": distance,
+    }
 
 
-def process_repeat_step(step: dict, step_order: int) -> dict:
+def process_repeat_step(
+    step: dict, step_order: int, sport_type: str = "running"
+) -> dict:
     """
     Processes a repeat step and its child steps.
 
     Args:
         step: The repeat step object to process
         step_order: The current step order
+        sport_type: The sport type key used for estimates (e.g., 'running')
+
+    Returns:
+        An object containing the formatted repeat step, updated stepOrder and
+        its estimated duration and distance (the children's times the iterations)
+    """
+    repeat_step = make_repeat_step(step, step_order)
+    step_order += 1
+
+    result = process_steps(step["steps"], step_order, sport_type)
+    repeat_step["workoutSteps"] = result["steps"]
+
+    iterations = repeat_step["numberOfIterations"]
+    return {
+        "step": repeat_step,
+        "stepOrder": result["stepOrder"],
+        "duration": iterations * result["duration"],
+        "distance": iterations * result["distance"],
+    }
+
+
+def make_repeat_step(step: dict, step_order: int) -> dict:
+    """
+    Formats a repeat group without its child steps.
+
+    Args:
+        step: The repeat step object
+        step_order: The step order of the repeat group
 
     Returns:
-        An object containing the formatted repeat step and updated stepOrder
+        The formatted repeat group; `workoutSteps` is filled in by the caller
+
+    Raises:
+        ValueError: If numberOfIterations is missing or not a positive integer
     """
     if (
         not isinstance(step.get("numberOfIterations"), int)
@@ -311,7 +515,7 @@ def process_repeat_step(step: dict, step_order: int) -> dict:
     ):
         raise ValueError("Invalid or missing numberOfIterations for repeat step.")
 
-    repeat_step = {
+    return {
         "stepId": step_order,
         "stepOrder": step_order,
         "stepType": STEP_TYPE_MAPPING["repeat"],
@@ -326,15 +530,6 @@ def process_repeat_step(step: dict, step_order: int) -> dict:
         "type": "RepeatGroupDTO",
     }
 
-    step_order += 1
-
-    # Recursively process child steps
-    result = process_steps(step["steps"], step_order)
-    repeat_step["workoutSteps"] = result["steps"]
-    step_order = result["stepOrder"]
-
-    return {"step": repeat_step, "stepOrder": step_order}
-
 
 def process_target(workout_step: dict, step: dict) -> None:
     """
@@ -443,34 +638,24 @@ def calculate_estimated_duration(workout_segments: List[dict]) -> int:
     """
     Calculates the estimated duration of a workout based on its segments and steps.
 
+    `make_payload` estimates the duration while building the steps; this walks
+    the segments of an already built payload, e.g. one fetched from Garmin.
+
     Args:
         workout_segments: The array of workout segments to calculate the duration for
 
     Returns:
         The estimated duration of the workout in seconds
     """
-    duration = 0
     sport_type = (
         workout_segments[0]["sportType"]["sportTypeKey"]
         if workout_segments
         else "running"
     )
 
+    duration = 0
     for segment in workout_segments:
-        for step in segment["workoutSteps"]:
-            if step["type"] == "ExecutableStepDTO":
-                if step["endCondition"]["conditionTypeKey"] == "distance":
-                    # For distance-based steps, estimate duration based on pace
-                    duration += estimate_step_duration(step, sport_type)
-                else:
-                    # For time-based steps, use the step duration directly
-                    duration += step["endConditionValue"]
-            elif step["type"] == "RepeatGroupDTO":
-                # Create a fake segment containing just the child steps of the repeat
-                child_steps_duration = calculate_steps_duration(
-                    step["workoutSteps"], sport_type
-                )
-                duration += step["numberOfIterations"] * child_steps_duration
+        duration += calculate_steps_duration(segment["workoutSteps"], sport_type)
 
     return int(duration)
 
@@ -479,6 +664,9 @@ def calculate_steps_duration(steps: List[dict], sport_type: str) -> int:
     """
     Calculates the duration for an array of steps.
 
+    Nested repeat groups are walked with an explicit stack; each step counts
+    once per iteration of every repeat group enclosing it.
+
     Args:
         steps: The array of steps to calculate the duration for
         sport_type: The sport type key (e.g., 'running')
@@ -487,18 +675,22 @@ def calculate_steps_duration(steps: List[dict], sport_type: str) -> int:
         The estimated duration in seconds
     """
     duration = 0
+    stack = [(steps, 1)]
 
-    for step in steps:
-        if step["type"] == "ExecutableStepDTO":
-            if step["endCondition"]["conditionTypeKey"] == "distance":
-                duration += estimate_step_duration(step, sport_type)
-            else:
-                duration += step["endConditionValue"]
-        elif step["type"] == "RepeatGroupDTO":
-            child_steps_duration = calculate_steps_duration(
-                step["workoutSteps"], sport_type
-            )
-            duration += step["numberOfIterations"] * child_steps_duration
+    while stack:
+        level_steps, iterations = stack.pop()
+        for step in level_steps:
+            if step["type"] == "ExecutableStepDTO":
+                if step["endCondition"]["conditionTypeKey"] == "distance":
+                    # For distance-based steps, estimate duration based on pace
+                    duration += iterations * estimate_step_duration(step, sport_type)
+                else:
+                    # For time-based steps, use the step duration directly
+                    duration += iterations * step["endConditionValue"]
+            elif step["type"] == "RepeatGroupDTO":
+                stack.append(
+                    (step["workoutSteps"], iterations * step["numberOfIterations"])
+                )
 
     return duration
 
@@ -516,6 +708,39 @@ def estimate_step_duration(step: dict, sport_type: str) -> int:
     """
     distance = step["endConditionValue"]  # distance in meters
 
+    # Calculate estimated duration
+    return int(distance * step_pace(step, sport_type))
+
+
+def step_pace(step: dict, sport_type: str) -> float:
+    """
+    Estimates the pace of a step from its pace or speed target.
+
+    Args:
+        step: The formatted workout step
+        sport_type: The sport type key (e.g., 'running'), for the default pace
+
+    Returns:
+        The pace in seconds per meter
+    """
+    pace_per_meter = target_pace(step)
+    if pace_per_meter is None:
+        # Use default pace value based on sport type
+        pace_per_meter = DEFAULT_PACE.get(sport_type.lower(), DEFAULT_PACE["running"])
+    return pace_per_meter
+
+
+def target_pace(step: dict) -> Optional[float]:
+    """
+    The pace of a step set by its pace or speed target.
+
+    Args:
+        step: The formatted workout step
+
+    Returns:
+        The pace in seconds per meter, or None if the step has no pace or
+        speed target
+    """
     # Check if the step has a pace target
     if (
         step.get("targetType")
@@ -536,8 +761,213 @@ def estimate_step_duration(step: dict, sport_type: str) -> int:
         avg_speed = (step["targetValueOne"] + step["targetValueTwo"]) / 2
         pace_per_meter = 1 / avg_speed
     else:
-        # Use default pace value based on sport type
-        pace_per_meter = DEFAULT_PACE.get(sport_type.lower(), DEFAULT_PACE["running"])
+        pace_per_meter = None
 
-    # Calculate estimated duration
-    return int(distance * pace_per_meter)
+    return pace_per_meter
+
+
+# Reverse mappings used to decode Garmin payloads
+SPORT_TYPE_BY_KEY = {v["sportTypeKey"]: k for k, v in SPORT_TYPE_MAPPING.items()}
+TARGET_TYPE_BY_KEY = {
+    v["workoutTargetTypeKey"]: k for k, v in TARGET_TYPE_MAPPING.items()
+}
+
+# Units of preferredEndConditionUnit in Garmin responses
+PREFERRED_DISTANCE_UNITS = {"meter": "m", "kilometer": "km", "mile": "mile"}
+
+# Relative tolerance when comparing decoded numbers (float round trips, rounding)
+DIFF_TOLERANCE = 1e-3
+
+
+def payload_to_workout(payload: dict) -> dict:
+    """
+    Converts a Garmin workout, as returned by the workout endpoint, back into
+    the workout object accepted by `make_payload`.
+
+    Paces are converted from m/s back to min/km and distances from meters
+    back to km, miles or meters. Step names do not exist on Garmin and are
+    left out. Nested repeat groups are walked with an explicit stack.
+
+    Args:
+        payload: The Garmin workout (or a payload built by `make_payload`)
+
+    Returns:
+        The workout object
+    """
+    sport_type_key = (payload.get("sportType") or {}).get("sportTypeKey", "running")
+    sport_type = SPORT_TYPE_BY_KEY.get(sport_type_key, sport_type_key)
+    workout = {"name": payload.get("workoutName", ""), "type": sport_type, "steps": []}
+
+    stack = [
+        (iter(segment.get("workoutSteps", [])), workout["steps"])
+        for segment in reversed(payload.get("workoutSegments", []))
+    ]
+    while stack:
+        children, steps = stack[-1]
+        step = next(children, None)
+        if step is None:
+            stack.pop()
+        elif step.get("type") == "RepeatGroupDTO":
+            repeat = {
+                "stepType": "repeat",
+                "numberOfIterations": step.get("numberOfIterations", 1),
+                "steps": [],
+            }
+            steps.append(repeat)
+            stack.append((iter(step.get("workoutSteps", [])), repeat["steps"]))
+        else:
+            steps.append(decode_step(step))
+
+    return workout
+
+
+def decode_step(step: dict) -> dict:
+    """
+    Converts one executable Garmin workout step back into a step object.
+
+    Args:
+        step: An ExecutableStepDTO
+
+    Returns:
+        The step object
+    """
+    decoded = {"stepType": (step.get("stepType") or {}).get("stepTypeKey", "interval")}
+    if step.get("description"):
+        decoded["stepDescription"] = step["description"]
+
+    condition = (step.get("endCondition") or {}).get("conditionTypeKey")
+    value = step.get("endConditionValue")
+    if condition == "distance" and value is not None:
+        unit = PREFERRED_DISTANCE_UNITS.get(
+            (step.get("preferredEndConditionUnit") or {}).get("unitKey")
+        ) or guess_distance_unit(value)
+        decoded["endConditionType"] = "distance"
+        decoded["stepDistance"] = _plain_number(
+            round(value / DISTANCE_UNIT_MAPPING[unit]["factor"], 6)
+        )
+        decoded["distanceUnit"] = unit
+    elif condition == "time" and value is not None:
+        decoded["endConditionType"] = "time"
+        decoded["stepDuration"] = _plain_number(value)
+    elif condition:
+        decoded["endConditionType"] = condition
+
+    target_key = (step.get("targetType") or {}).get("workoutTargetTypeKey")
+    target_type = TARGET_TYPE_BY_KEY.get(target_key, target_key)
+    if target_type and target_type != "no target":
+        decoded["target"] = decode_target(step, target_type)
+
+    return decoded
+
+
+def decode_target(step: dict, target_type: str) -> dict:
+    """
+    Converts the target values of a Garmin step back to the units of the input.
+
+    Args:
+        step: The Garmin workout step
+        target_type: The target type name (e.g., 'pace')
+
+    Returns:
+        The target object
+    """
+    target = {"type": target_type}
+    one, two = step.get("targetValueOne"), step.get("targetValueTwo")
+    if not one or not two:
+        return target
+
+    if target_type == "pace":
+        # m/s back to min/km, inverting the conversion of convert_value_to_unit
+        values = sorted(round(1000 / (v * 60), 3) for v in (one, two))
+        target["unit"] = "min_per_km"
+    else:
+        values = sorted(_plain_number(v) for v in (one, two))
+        if target_type == "heart rate":
+            target["unit"] = "bpm"
+    target["value"] = values
+    return target
+
+
+def guess_distance_unit(meters: float) -> str:
+    """The unit a distance was most likely entered in: whole km, whole miles, else meters."""
+    if meters >= 1000 and abs(meters / 1000 - round(meters / 1000)) < 1e-9:
+        return "km"
+    miles = meters / DISTANCE_UNIT_MAPPING["mile"]["factor"]
+    if miles >= 1 and abs(miles - round(miles, 2)) < 1e-9:
+        return "mile"
+    return "m"
+
+
+def _plain_number(value: float):
+    """Integral floats as ints, so 600.0 reads as 600."""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def diff_workouts(
+    expected: dict,
+    actual: dict,
+    ignore: Sequence[str] = ("stepName", "stepDescription"),
+) -> List[str]:
+    """
+    Lists the differences between two workout objects.
+
+    Numbers are compared with a small relative tolerance and step distances
+    in meters, so 1 km matches 1000 m. To compare workouts whose targets were
+    entered in different units (pace vs speed), decode both from their
+    payloads first: ``payload_to_workout(make_payload(workout))``.
+
+    Args:
+        expected: The reference workout object
+        actual: The workout object to compare with it
+        ignore: Keys whose values are not compared
+
+    Returns:
+        One ``"<JSON path>: <expected> != <actual>"`` entry per difference,
+        empty if the workouts match.
+    """
+    differences = []
+    stack = [("$", expected, actual)]
+    while stack:
+        path, a, b = stack.pop()
+        if isinstance(a, dict) and isinstance(b, dict):
+            a, b = _distance_in_meters(a), _distance_in_meters(b)
+            for key in sorted(set(a) | set(b), reverse=True):
+                if key not in ignore:
+                    stack.append((f"{path}.{key}", a.get(key), b.get(key)))
+        elif isinstance(a, list) and isinstance(b, list):
+            if len(a) != len(b):
+                differences.append(f"{path}: {len(a)} items != {len(b)} items")
+            else:
+                stack.extend(
+                    (f"{path}[{i}]", x, y)
+                    for i, (x, y) in reversed(list(enumerate(zip(a, b))))
+                )
+        elif not _values_equal(a, b):
+            differences.append(f"{path}: {a!r} != {b!r}")
+    return differences
+
+
+def _values_equal(a, b) -> bool:
+    if _is_number(a) and _is_number(b):
+        return abs(a - b) <= DIFF_TOLERANCE * max(abs(a), abs(b), 1)
+    if isinstance(a, str) and isinstance(b, str):
+        return a.lower() == b.lower()
+    return a == b
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _distance_in_meters(step: dict) -> dict:
+    """The step with its distance converted to meters, for comparison."""
+    unit = DISTANCE_UNIT_MAPPING.get(step.get("distanceUnit"))
+    if unit is None or not _is_number(step.get("stepDistance")):
+        return step
+    return {
+        **step,
+        "stepDistance": step["stepDistance"] * unit["factor"],
+        "distanceUnit": "m",
+    }
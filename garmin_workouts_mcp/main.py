@@ -1,10 +1,33 @@
-from fastmcp import FastMCP
-import garth
+import argparse
+import asyncio
+from contextlib import aclosing, asynccontextmanager
+from fastmcp import Context, FastMCP
 import os
 import sys
 import logging
-from datetime import datetime
-from .garmin_workout import make_payload
+from datetime import date as Date, datetime, timedelta
+from typing import List, Optional, Union
+from .activity_store import RESUME_BEFORE, SYNCED_THROUGH, get_activity_store
+from .athletes import athlete_dir, athlete_scoped, current_athlete
+from .batch import map_bounded
+from .cache import make_cache_key
+from .calendar_view import months_in_range, slice_week, week_bounds
+from .client import GarminAPIError, close_client, connectapi, garth_home, get_client
+from .fastjson import dumps_str
+from .garmin_workout import make_payload, make_payloads, shutdown_process_pool
+from .metrics import get_metrics, instrument_tool, metrics_file, timed_serializer
+from .middleware import (
+    SessionMetricsMiddleware,
+    ToolConcurrencyMiddleware,
+    ToolResultSizeMiddleware,
+)
+from .pagination import iter_pages
+from .projection import apply_projection, resolve_fields
+from .singleflight import SingleFlight
+from .training_load import WARMUP_DAYS, compute_training_load, report_period
+from .utils import compile_workout_description, split_workout_description
+from .validation import WorkoutValidationError, validate_workout
+from .workout_index import get_workout_index, payload_hash
 
 LIST_WORKOUTS_ENDPOINT = "/workout-service/workouts"
 GET_WORKOUT_ENDPOINT = "/workout-service/workout/{workout_id}"
@@ -18,6 +41,40 @@ CALENDAR_WEEK_ENDPOINT = (
 )
 CALENDAR_MONTH_ENDPOINT = "/calendar-service/year/{year}/month/{month}"
 
+# Cache lifetimes in seconds for read-only endpoints
+CACHE_TTL = {
+    LIST_WORKOUTS_ENDPOINT: 60,
+    GET_WORKOUT_ENDPOINT: 300,
+    GET_ACTIVITY_ENDPOINT: 3600,
+    GET_ACTIVITY_WEATHER_ENDPOINT: 86400,
+    CALENDAR_MONTH_ENDPOINT: 300,
+}
+
+CALENDAR_PATH_PREFIX = "/calendar-service/"
+
+# Paging of list_activities(all_pages=True)
+ACTIVITY_PAGE_SIZE = 100
+ACTIVITY_PAGE_PREFETCH = 3
+ALL_PAGES_MAX_ACTIVITIES = 1000
+
+# Batch tools (get_workouts, get_activities)
+BATCH_MAX_IDS = 100
+BATCH_CONCURRENCY = 5
+
+# Bulk upload (upload_workouts)
+UPLOAD_MAX_WORKOUTS = 50
+UPLOAD_CONCURRENCY = 3
+
+# HTTP transport (main --transport http); the flags default to these variables
+TRANSPORT_ENV = "GARMIN_WORKOUTS_MCP_TRANSPORT"
+HTTP_HOST_ENV = "GARMIN_WORKOUTS_MCP_HOST"
+HTTP_PORT_ENV = "GARMIN_WORKOUTS_MCP_PORT"
+MAX_CONCURRENCY_ENV = "GARMIN_WORKOUTS_MCP_MAX_CONCURRENCY"
+DEFAULT_HTTP_HOST = "127.0.0.1"
+DEFAULT_HTTP_PORT = 8000
+DEFAULT_HTTP_PATH = "/mcp"
+DEFAULT_MAX_CONCURRENCY = 16
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -26,62 +83,276 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-mcp = FastMCP(name="GarminConnectWorkoutsServer")
+
+_shared_resource_users = 0
+
+
+@asynccontextmanager
+async def shared_resources():
+    """
+    Hold the process-wide Garmin client for the duration of the block.
+
+    The first holder starts the background token refresh; when the last one
+    leaves, the client is closed, payload compiler workers are stopped and
+    metrics are dumped. The HTTP transport
+    holds the resources for the life of the process so they stay warm across
+    sessions.
+    """
+    global _shared_resource_users
+    _shared_resource_users += 1
+    if _shared_resource_users == 1:
+        get_client().start_token_refresher()
+    try:
+        yield
+    finally:
+        _shared_resource_users -= 1
+        if _shared_resource_users == 0:
+            await close_client()
+            shutdown_process_pool()
+            if metrics_file():
+                get_metrics().write_prometheus(metrics_file())
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Share the Garmin client, token refresh and cache with every other session."""
+    async with shared_resources():
+        yield
+
+
+mcp = FastMCP(
+    name="GarminConnectWorkoutsServer",
+    lifespan=lifespan,
+    middleware=[SessionMetricsMiddleware(), ToolResultSizeMiddleware()],
+    tool_serializer=timed_serializer(dumps_str),
+)
+
+
+async def cached_connectapi(endpoint: str, path: str, **kwargs):
+    """
+    GET a read-only endpoint through the response cache.
+
+    Args:
+        endpoint: The endpoint template, used to look up the cache TTL
+        path: The formatted endpoint path
+        **kwargs: Passed through to `connectapi`
+
+    Returns:
+        The cached or freshly fetched response.
+    """
+    key = make_cache_key(path, kwargs.get("params"))
+    return await get_client().cache.get_or_load(
+        key, CACHE_TTL[endpoint], lambda: connectapi(path, **kwargs)
+    )
+
+
+def invalidate_workout(workout_id: str = None) -> None:
+    """Drop cached entries made stale by a write to a workout."""
+    client = get_client()
+    client.invalidate(LIST_WORKOUTS_ENDPOINT)
+    if workout_id is not None:
+        client.invalidate(GET_WORKOUT_ENDPOINT.format(workout_id=workout_id))
+
+
+def invalidate_calendar(year: int = None, month: int = None) -> None:
+    """
+    Drop cached calendar months.
+
+    Args:
+        year: Year of the month to drop. If omitted, every cached month is dropped.
+        month: Month (1-12) to drop
+    """
+    client = get_client()
+    if year is None:
+        client.invalidate_prefix(CALENDAR_PATH_PREFIX)
+    else:
+        client.invalidate(CALENDAR_MONTH_ENDPOINT.format(year=year, month=month - 1))
+
+
+async def get_calendar_month(year: int, month: int):
+    """
+    Get a monthly calendar document through the month-keyed cache.
+
+    Args:
+        year: Year (e.g., 2025)
+        month: Month (1-12)
+
+    Returns:
+        The monthly calendar document as returned by Garmin Connect.
+    """
+    # Convert month from 1-based (human readable) to 0-based (Garmin API)
+    endpoint = CALENDAR_MONTH_ENDPOINT.format(year=year, month=month - 1)
+    return await cached_connectapi(CALENDAR_MONTH_ENDPOINT, endpoint)
 
 
 @mcp.tool
-def list_workouts() -> dict:
+@instrument_tool
+@athlete_scoped
+async def list_workouts(athlete: str = None) -> dict:
     """
     List all workouts available on Garmin Connect.
 
+    Args:
+        athlete: Athlete whose Garmin account to use, when the server acts for several
+            athletes. Omit for the server's default account.
+
     Returns:
         A dictionary containing a list of workouts.
     """
-    workouts = garth.connectapi(LIST_WORKOUTS_ENDPOINT)
+    workouts = await cached_connectapi(LIST_WORKOUTS_ENDPOINT, LIST_WORKOUTS_ENDPOINT)
     return {"workouts": workouts}
 
 
 @mcp.tool
-def get_workout(workout_id: str) -> dict:
+@instrument_tool
+@athlete_scoped
+async def get_workout(workout_id: str, athlete: str = None) -> dict:
     """
     Get details of a specific workout by its ID.
 
     Args:
         workout_id: ID of the workout to retrieve.
+        athlete: Athlete whose Garmin account to use, when the server acts for several
+            athletes. Omit for the server's default account.
 
     Returns:
         Workout details as a dictionary.
     """
     endpoint = GET_WORKOUT_ENDPOINT.format(workout_id=workout_id)
-    workout = garth.connectapi(endpoint)
+    workout = await cached_connectapi(GET_WORKOUT_ENDPOINT, endpoint)
     return {"workout": workout}
 
 
 @mcp.tool
-def get_activity(activity_id: str) -> dict:
+@instrument_tool
+@athlete_scoped
+async def get_activity(
+    activity_id: str, fields: Union[str, List[str]] = None, athlete: str = None
+) -> dict:
     """
     Get details of a specific activity by its ID. An activity represents a completed run, ride, swim, etc.
 
     Args:
         activity_id: ID of the activity to retrieve. As returned by the `get_calendar` tool.
+        fields: Only return these fields instead of the full document (hundreds of keys).
+            Either a profile name ("summary", "hr", "pace") or dotted field paths such as
+            "activityName,summaryDTO.distance". Profiles and paths can be mixed in a list.
+        athlete: Athlete whose Garmin account to use, when the server acts for several
+            athletes. Omit for the server's default account.
 
     Returns:
         Activity details as a dictionary.
     """
+    projection = resolve_fields(fields)
     endpoint = GET_ACTIVITY_ENDPOINT.format(activity_id=activity_id)
-    activity = garth.connectapi(endpoint)
-    return activity
+    activity = await cached_connectapi(GET_ACTIVITY_ENDPOINT, endpoint)
+    return apply_projection(activity, projection)
+
+
+def _check_batch_ids(ids: List[str]) -> List[str]:
+    """Validate a batch ID list and drop duplicates, keeping order."""
+    unique_ids = list(dict.fromkeys(str(i) for i in ids))
+    if not unique_ids:
+        raise ValueError("At least one ID must be provided")
+    if len(unique_ids) > BATCH_MAX_IDS:
+        raise ValueError(
+            f"At most {BATCH_MAX_IDS} IDs can be fetched at once, got {len(unique_ids)}"
+        )
+    return unique_ids
 
 
 @mcp.tool
-def list_activities(
-    limit: int = 20, start: int = 0, activityType: str = None, search: str = None
+@instrument_tool
+@athlete_scoped
+async def get_workouts(workout_ids: List[str], athlete: str = None) -> dict:
+    """
+    Get details of several workouts in one call. Prefer this over repeated `get_workout` calls.
+
+    Args:
+        workout_ids: IDs of the workouts to retrieve (at most 100).
+        athlete: Athlete whose Garmin account to use, when the server acts for several
+            athletes. Omit for the server's default account.
+
+    Returns:
+        workouts: Workout details keyed by workout ID.
+        errors: Error messages keyed by workout ID, for workouts that could not be retrieved.
+    """
+    ids = _check_batch_ids(workout_ids)
+
+    async def fetch(workout_id: str):
+        endpoint = GET_WORKOUT_ENDPOINT.format(workout_id=workout_id)
+        return await cached_connectapi(GET_WORKOUT_ENDPOINT, endpoint)
+
+    results = await map_bounded(fetch, ids, BATCH_CONCURRENCY)
+
+    workouts, errors = {}, {}
+    for workout_id, (workout, error) in zip(ids, results):
+        if error is None:
+            workouts[workout_id] = workout
+        else:
+            errors[workout_id] = str(error)
+    return {"workouts": workouts, "errors": errors}
+
+
+@mcp.tool
+@instrument_tool
+@athlete_scoped
+async def get_activities(
+    activity_ids: List[str], fields: Union[str, List[str]] = None, athlete: str = None
+) -> dict:
+    """
+    Get details of several activities in one call. Prefer this over repeated `get_activity` calls.
+
+    Args:
+        activity_ids: IDs of the activities to retrieve (at most 100).
+        fields: Only return these fields of each activity. Either a profile name
+            ("summary", "hr", "pace") or dotted field paths, as for `get_activity`.
+        athlete: Athlete whose Garmin account to use, when the server acts for several
+            athletes. Omit for the server's default account.
+
+    Returns:
+        activities: Activity details keyed by activity ID.
+        errors: Error messages keyed by activity ID, for activities that could not be retrieved.
+    """
+    ids = _check_batch_ids(activity_ids)
+    projection = resolve_fields(fields)
+
+    async def fetch(activity_id: str):
+        endpoint = GET_ACTIVITY_ENDPOINT.format(activity_id=activity_id)
+        return await cached_connectapi(GET_ACTIVITY_ENDPOINT, endpoint)
+
+    results = await map_bounded(fetch, ids, BATCH_CONCURRENCY)
+
+    activities, errors = {}, {}
+    for activity_id, (activity, error) in zip(ids, results):
+        if error is None:
+            activities[activity_id] = apply_projection(activity, projection)
+        else:
+            errors[activity_id] = str(error)
+    return {"activities": activities, "errors": errors}
+
+
+@mcp.tool
+@instrument_tool
+@athlete_scoped
+async def list_activities(
+    limit: int = 20,
+    start: int = 0,
+    activityType: str = None,
+    search: str = None,
+    startDate: str = None,
+    endDate: str = None,
+    all_pages: bool = False,
+    max_activities: int = None,
+    fields: Union[str, List[str]] = None,
+    athlete: str = None,
+    ctx: Context = None,
 ) -> dict:
     """
     List activities (completed runs, rides, swims, etc.) from Garmin Connect.
 
     Args:
-        limit: Number of activities to return (default=20)
+        limit: Number of activities to return (default=20). Ignored when `all_pages` is set.
         start: Starting position for pagination (default=0)
         activityType: Filter by activity type. Accepted values include:
             - "auto_racing", "backcountry_skiing_snowboarding_ws", "bouldering", "breathwork"
@@ -91,10 +362,24 @@ def list_activities(
             - "safety", "skate_skiing_ws", "surfing", "swimming", "walking"
             - "windsurfing", "winter_sports", "yoga"
         search: Search for activities containing this string in their name
+        startDate: Only include activities on or after this date (YYYY-MM-DD)
+        endDate: Only include activities on or before this date (YYYY-MM-DD)
+        all_pages: Walk all result pages instead of returning a single page. Use with
+            `startDate` and/or `max_activities` to fetch e.g. a whole season in one call.
+        max_activities: Maximum number of activities to return when `all_pages` is set
+            (default=1000)
+        fields: Only return these fields of each activity. Either a profile name
+            ("summary", "hr", "pace") or dotted field paths such as "activityName,distance".
+        athlete: Athlete whose Garmin account to use, when the server acts for several
+            athletes. Omit for the server's default account.
 
     Returns:
         A dictionary containing a list of activities and pagination info.
+
+    Raises:
+        ValueError: If a date is not in ISO format.
     """
+    projection = resolve_fields(fields)
     params = {"limit": limit, "start": start}
 
     if activityType is not None:
@@ -103,34 +388,342 @@ def list_activities(
     if search is not None:
         params["search"] = search
 
-    activities = garth.connectapi(LIST_ACTIVITIES_ENDPOINT, "GET", params=params)
-    return {"activities": activities}
+    for name, value in (("startDate", startDate), ("endDate", endDate)):
+        if value is not None:
+            try:
+                datetime.strptime(value, "%Y-%m-%d")
+            except ValueError:
+                raise ValueError(f"{name} must be in ISO format (YYYY-MM-DD)")
+            params[name] = value
+
+    if not all_pages:
+        activities = await connectapi(LIST_ACTIVITIES_ENDPOINT, "GET", params=params)
+        return {"activities": apply_projection(activities, projection)}
+
+    if max_activities is None:
+        max_activities = ALL_PAGES_MAX_ACTIVITIES
+
+    async def fetch_page(page_start: int, page_limit: int):
+        page_params = dict(params, start=page_start, limit=page_limit)
+        return await connectapi(LIST_ACTIVITIES_ENDPOINT, "GET", params=page_params)
+
+    activities = []
+    pages = 0
+    truncated = False
+    # One activity past the limit tells a walk cut short from one ending exactly at it
+    async for page in iter_pages(
+        fetch_page,
+        page_size=ACTIVITY_PAGE_SIZE,
+        start=start,
+        max_items=max_activities + 1,
+        prefetch=ACTIVITY_PAGE_PREFETCH,
+    ):
+        remaining = max_activities - len(activities)
+        if len(page) > remaining:
+            truncated = True
+            page = page[:remaining]
+        if not page:
+            continue
+        activities.extend(apply_projection(page, projection))
+        pages += 1
+        if ctx is not None:
+            await ctx.report_progress(len(activities), max_activities)
+
+    return {
+        "activities": activities,
+        "pagination": {
+            "start": start,
+            "count": len(activities),
+            "pages": pages,
+            "truncated": truncated,
+        },
+    }
+
+
+@mcp.tool
+@instrument_tool
+@athlete_scoped
+async def sync_activities(
+    full: bool = False, athlete: str = None, ctx: Context = None
+) -> dict:
+    """
+    Sync activity summaries from Garmin Connect into the local activity index used by
+    `query_activities`. Only activities newer than the last synced one are fetched; a
+    sync that failed partway is resumed where it stopped.
+
+    Args:
+        full: Re-fetch the whole activity history and drop activities deleted on Garmin
+            Connect, instead of fetching only new activities.
+        athlete: Athlete whose Garmin account to use, when the server acts for several
+            athletes. Omit for the server's default account.
+
+    Returns:
+        added: Number of activities fetched and stored.
+        total: Number of activities in the local index.
+        latestStartTime: Start time of the most recent indexed activity.
+    """
+    store = get_activity_store()
+    added = await sync_activity_store(store, full, ctx)
+    return {
+        "added": added,
+        "total": store.count(),
+        "latestStartTime": store.latest_start_time(),
+    }
+
+
+async def sync_activity_store(store, full: bool = False, ctx: Context = None) -> int:
+    """
+    Fetch activity summaries from Garmin Connect into a local activity store.
+
+    Activities are listed newest first. A sync only counts as caught up once it
+    reaches the end of the list or an activity at or before the store's
+    ``SYNCED_THROUGH`` mark, which is then moved to the newest activity.
+    Pages are stored as they arrive together with the ``RESUME_BEFORE`` mark,
+    the oldest activity stored contiguously from the newest one, so a sync
+    that fails partway is resumed below that mark by the next one instead of
+    leaving a gap.
+
+    Args:
+        store: The athlete's `ActivityStore`
+        full: Re-fetch the whole history and drop deleted activities
+        ctx: MCP context used to report progress, if any
+
+    Returns:
+        The number of activities fetched and stored.
+    """
+    synced_through = None if full else store.sync_mark(SYNCED_THROUGH)
+    unfinished_before = None if full else store.sync_mark(RESUME_BEFORE)
+
+    added = 0
+    resume_before = None
+    newest = None
+    seen_ids = []
+
+    async def walk(filters: dict, resuming: bool) -> Optional[str]:
+        """
+        Stores one newest-first pass over the activity list.
+
+        Returns "caught_up" once at the ``SYNCED_THROUGH`` mark, "resume" on
+        reaching the activities of an unfinished sync, or None at the end of
+        the list.
+        """
+        nonlocal added, newest, resume_before
+
+        async def fetch_page(page_start: int, page_limit: int):
+            params = {**filters, "limit": page_limit, "start": page_start}
+            return await connectapi(LIST_ACTIVITIES_ENDPOINT, "GET", params=params)
+
+        pages = iter_pages(
+            fetch_page,
+            page_size=ACTIVITY_PAGE_SIZE,
+            prefetch=ACTIVITY_PAGE_PREFETCH if full else 1,
+        )
+        async with aclosing(pages):
+            async for page in pages:
+                if newest is None and not resuming:
+                    newest = page[0].get("startTimeLocal")
+                known = (
+                    set() if full else store.known_ids(a["activityId"] for a in page)
+                )
+                new = []
+                outcome = None
+                for activity in page:
+                    start = activity.get("startTimeLocal")
+                    if synced_through and start and start <= synced_through:
+                        outcome = "caught_up"
+                        break
+                    if int(activity["activityId"]) not in known:
+                        new.append(activity)
+                    elif unfinished_before and not resuming:
+                        outcome = "resume"
+                        break
+                if full:
+                    seen_ids.extend(activity["activityId"] for activity in page)
+
+                # Everything from the newest activity down to this page is stored,
+                # and on reaching the unfinished sync, down to where it stopped
+                if outcome == "resume":
+                    resume_before = unfinished_before
+                elif outcome is None:
+                    oldest = page[-1].get("startTimeLocal")
+                    if oldest and not (resuming and oldest >= resume_before):
+                        resume_before = oldest
+                added += store.upsert(new, marks={RESUME_BEFORE: resume_before})
+                if ctx is not None:
+                    await ctx.report_progress(added)
+                if outcome is not None:
+                    return outcome
+        return None
+
+    if await walk({}, resuming=False) == "resume":
+        # Continue below the activities stored by the unfinished sync
+        await walk({"endDate": unfinished_before[:10]}, resuming=True)
+
+    if full:
+        store.retain(seen_ids)
+    store.set_sync_marks(
+        {SYNCED_THROUGH: newest or synced_through, RESUME_BEFORE: None}
+    )
+
+    return added
+
+
+@mcp.tool
+@instrument_tool
+@athlete_scoped
+def query_activities(
+    startDate: str = None,
+    endDate: str = None,
+    activityType: str = None,
+    minDistance: float = None,
+    maxDistance: float = None,
+    search: str = None,
+    limit: int = 50,
+    fields: Union[str, List[str]] = None,
+    athlete: str = None,
+) -> dict:
+    """
+    Query the local activity index without contacting Garmin Connect. Much faster than
+    `list_activities` for searches over long periods. Run `sync_activities` first to
+    bring the index up to date.
+
+    Args:
+        startDate: Only include activities on or after this date (YYYY-MM-DD)
+        endDate: Only include activities on or before this date (YYYY-MM-DD)
+        activityType: Activity type key, e.g. "running", "cycling" (see `list_activities`)
+        minDistance: Minimum distance in meters
+        maxDistance: Maximum distance in meters
+        search: Case-insensitive text contained in the activity name
+        limit: Maximum number of activities to return, most recent first (default=50)
+        fields: Only return these fields of each activity. Either a profile name
+            ("summary", "hr", "pace") or dotted field paths.
+        athlete: Athlete whose Garmin account to use, when the server acts for several
+            athletes. Omit for the server's default account.
+
+    Returns:
+        A dictionary containing the matching activities and their count.
+
+    Raises:
+        ValueError: If a date is not in ISO format.
+    """
+    projection = resolve_fields(fields)
+
+    dates = {}
+    for name, value in (("startDate", startDate), ("endDate", endDate)):
+        if value is not None:
+            try:
+                dates[name] = datetime.strptime(value, "%Y-%m-%d").date()
+            except ValueError:
+                raise ValueError(f"{name} must be in ISO format (YYYY-MM-DD)")
+
+    activities = get_activity_store().query(
+        start_date=dates.get("startDate"),
+        end_date=dates.get("endDate"),
+        type_key=activityType,
+        min_distance=minDistance,
+        max_distance=maxDistance,
+        name=search,
+        limit=limit,
+    )
+    return {
+        "activities": apply_projection(activities, projection),
+        "count": len(activities),
+    }
+
+
+@mcp.tool
+@instrument_tool
+@athlete_scoped
+async def get_training_load(
+    weeks: int = 12,
+    endDate: str = None,
+    activityType: str = None,
+    sync: bool = True,
+    daily: bool = False,
+    athlete: str = None,
+    ctx: Context = None,
+) -> dict:
+    """
+    Get training load trends and weekly volume, computed on the server from the local activity
+    index. Use this instead of adding up `list_activities` results to answer questions such as
+    "how has my load trended over the last 12 weeks".
+
+    Load is Garmin's per-activity training load. ATL (acute, 7-day) and CTL (chronic, 42-day)
+    are exponentially weighted averages of the daily load; TSB (form) is CTL - ATL.
+
+    Args:
+        weeks: Number of weeks to report, ending with the week of endDate (1-104, default=12)
+        endDate: Last day to report (YYYY-MM-DD). Defaults to today.
+        activityType: Only count activities of this type key, e.g. "running"
+        sync: Fetch new activities from Garmin Connect into the local index first (default=True)
+        daily: Also return a per-day table of load, ATL, CTL and TSB
+        athlete: Athlete whose Garmin account to use, when the server acts for several
+            athletes. Omit for the server's default account.
+
+    Returns:
+        startDate, endDate: The reported period; weeks start on Monday.
+        current: ATL, CTL and TSB on endDate.
+        weekly: Table with `columns` and one row per week: activities, distance (km),
+            time (hours), load and the ATL/CTL/TSB at the end of the week.
+        daily: Per-day table, if requested.
+
+    Raises:
+        ValueError: If weeks is out of range or endDate is not in ISO format.
+    """
+    if not 1 <= weeks <= 104:
+        raise ValueError("weeks must be between 1 and 104")
+    if endDate is None:
+        end = Date.today()
+    else:
+        try:
+            end = datetime.strptime(endDate, "%Y-%m-%d").date()
+        except ValueError:
+            raise ValueError("endDate must be in ISO format (YYYY-MM-DD)")
+
+    store = get_activity_store()
+    if sync:
+        await sync_activity_store(store, ctx=ctx)
+
+    start, end = report_period(end, weeks)
+    with get_metrics().time_stage("training_load"):
+        totals = store.daily_totals(
+            start - timedelta(days=WARMUP_DAYS), end, type_key=activityType
+        )
+        return compute_training_load(totals, start, end, daily=daily)
 
 
 @mcp.tool
-def get_activity_weather(activity_id: str) -> dict:
+@instrument_tool
+@athlete_scoped
+async def get_activity_weather(activity_id: str, athlete: str = None) -> dict:
     """
     Get weather information for a specific activity.
 
     Args:
         activity_id: ID of the activity to retrieve weather for.
+        athlete: Athlete whose Garmin account to use, when the server acts for several
+            athletes. Omit for the server's default account.
 
     Returns:
         Weather details as a dictionary containing temperature, conditions, etc.
     """
     endpoint = GET_ACTIVITY_WEATHER_ENDPOINT.format(activity_id=activity_id)
-    weather = garth.connectapi(endpoint)
+    weather = await cached_connectapi(GET_ACTIVITY_WEATHER_ENDPOINT, endpoint)
     return weather
 
 
 @mcp.tool
-def schedule_workout(workout_id: str, date: str) -> dict:
+@instrument_tool
+@athlete_scoped
+async def schedule_workout(workout_id: str, date: str, athlete: str = None) -> dict:
     """
     Schedule a workout on Garmin Connect.
 
     Args:
         workout_id: ID of the workout to schedule.
         date: Date to schedule the workout in ISO format (YYYY-MM-DD).
+        athlete: Athlete whose Garmin account to use, when the server acts for several
+            athletes. Omit for the server's default account.
 
     Returns:
         workoutScheduleId: ID of the scheduled workout.
@@ -142,7 +735,7 @@ def schedule_workout(workout_id: str, date: str) -> dict:
 
     # verify date format
     try:
-        datetime.strptime(date, "%Y-%m-%d")
+        scheduled_date = datetime.strptime(date, "%Y-%m-%d")
     except ValueError:
         raise ValueError("Date must be in ISO format (YYYY-MM-DD)")
 
@@ -151,7 +744,9 @@ def schedule_workout(workout_id: str, date: str) -> dict:
     }
 
     endpoint = SCHEDULE_WORKOUT_ENDPOINT.format(workout_id=workout_id)
-    result = garth.connectapi(endpoint, method="POST", json=payload)
+    result = await connectapi(endpoint, method="POST", json=payload)
+    invalidate_workout(workout_id)
+    invalidate_calendar(scheduled_date.year, scheduled_date.month)
     workout_scheduled_id = result.get("workoutScheduleId")
     if workout_scheduled_id is None:
         raise Exception(f"Scheduling workout failed: {result}")
@@ -160,12 +755,16 @@ def schedule_workout(workout_id: str, date: str) -> dict:
 
 
 @mcp.tool
-def delete_workout(workout_id: str) -> bool:
+@instrument_tool
+@athlete_scoped
+async def delete_workout(workout_id: str, athlete: str = None) -> bool:
     """
     Delete a workout from Garmin Connect.
 
     Args:
         workout_id: ID of the workout to delete.
+        athlete: Athlete whose Garmin account to use, when the server acts for several
+            athletes. Omit for the server's default account.
 
     Returns:
         True if the deletion was successful, False otherwise.
@@ -173,7 +772,11 @@ def delete_workout(workout_id: str) -> bool:
     endpoint = GET_WORKOUT_ENDPOINT.format(workout_id=workout_id)
 
     try:
-        garth.connectapi(endpoint, method="DELETE")
+        await connectapi(endpoint, method="DELETE")
+        invalidate_workout(workout_id)
+        get_workout_index().discard(workout_id)
+        # Deleting a workout also removes its scheduled calendar entries
+        invalidate_calendar()
         logger.info("Workout %s deleted successfully", workout_id)
         return True
     except Exception as e:
@@ -182,50 +785,217 @@ def delete_workout(workout_id: str) -> bool:
 
 
 @mcp.tool
-def upload_workout(workout_data: dict) -> dict:
+@instrument_tool
+@athlete_scoped
+async def upload_workout(workout_data: dict, athlete: str = None) -> dict:
     """
-    Uploads a structured workout to Garmin Connect.
+    Uploads a structured workout to Garmin Connect. Uploading an identical workout again
+    returns the existing workout's ID instead of creating a duplicate.
 
     Args:
         workout_data: Workout data in JSON format to upload. Use the `generate_workout_data_prompt` tool to create a prompt for the LLM to generate this data.
+        athlete: Athlete whose Garmin account to use, when the server acts for several
+            athletes. Omit for the server's default account.
 
     Returns:
         The uploaded workout's ID on Garmin Connect.
 
     Raises:
+        ValueError: If the workout data is invalid. The message lists every problem found,
+            each with its JSON path (e.g. `$.steps[1].stepDuration`), so all can be fixed at once.
         Exception: If the upload fails or the workout ID is not returned.
     """
 
     logger.info("Workout data received from client: %s", workout_data)
 
+    with get_metrics().time_stage("validate_workout"):
+        workout_data = validate_workout(workout_data)
+
     try:
         # Convert to Garmin payload format
-        payload = make_payload(workout_data)
+        with get_metrics().time_stage("make_payload"):
+            payload = make_payload(workout_data)
 
         # logging the payload for debugging
         logger.info("Payload to be sent to Garmin Connect: %s", payload)
 
-        # Create workout on Garmin Connect
-        result = garth.connectapi(
-            "/workout-service/workout", method="POST", json=payload
+        workout_id = await create_workout(payload)
+        return {"workoutId": workout_id}
+
+    except Exception as e:
+        raise Exception(f"Failed to upload workout to Garmin Connect: {str(e)}")
+
+
+# Uploads in flight by athlete and payload hash, so that the same workout
+# uploaded again before the first upload finished is not created twice
+_uploads = SingleFlight()
+
+
+async def find_uploaded_workout(digest: str):
+    """
+    Look up a workout previously uploaded with an identical payload.
+
+    The indexed workout is fetched (through the response cache) to make sure it
+    still exists; an entry whose workout was deleted on Garmin Connect is dropped.
+
+    Args:
+        digest: Payload hash as returned by `payload_hash`
+
+    Returns:
+        The workout ID, or None if the payload has not been uploaded before.
+    """
+    index = get_workout_index()
+    workout_id = index.get(digest)
+    if workout_id is None:
+        return None
+    try:
+        await cached_connectapi(
+            GET_WORKOUT_ENDPOINT, GET_WORKOUT_ENDPOINT.format(workout_id=workout_id)
         )
+    except GarminAPIError as e:
+        if e.status_code != 404:
+            raise
+        logger.info("Indexed workout %s no longer exists", workout_id)
+        index.discard(workout_id)
+        return None
+    return workout_id
 
-        # logging the result for debugging
-        logger.info("Response from Garmin Connect: %s", result)
 
-        workout_id = result.get("workoutId")
+async def create_workout(payload: dict) -> str:
+    """
+    Create a workout on Garmin Connect from a compiled payload.
 
-        if workout_id is None:
-            raise Exception("No workout ID returned")
+    Uploads are idempotent: if an identical payload was uploaded before and
+    that workout still exists, its ID is returned without creating a new one.
+    Concurrent uploads of the same payload share one upload.
 
-        return {"workoutId": str(workout_id)}
+    Args:
+        payload: Workout payload as built by `make_payload`
 
-    except Exception as e:
-        raise Exception(f"Failed to upload workout to Garmin Connect: {str(e)}")
+    Returns:
+        The workout's ID.
+
+    Raises:
+        Exception: If no workout ID is returned.
+    """
+    digest = payload_hash(payload)
+    return await _uploads.do(
+        (current_athlete.get(), digest), lambda: _create_workout(payload, digest)
+    )
+
+
+async def _create_workout(payload: dict, digest: str) -> str:
+    existing_id = await find_uploaded_workout(digest)
+    if existing_id is not None:
+        logger.info("Identical workout already uploaded as %s", existing_id)
+        return existing_id
+
+    result = await connectapi(CREATE_WORKOUT_ENDPOINT, method="POST", json=payload)
+    invalidate_workout()
+
+    # logging the result for debugging
+    logger.info("Response from Garmin Connect: %s", result)
+
+    workout_id = result.get("workoutId")
+
+    if workout_id is None:
+        raise Exception("No workout ID returned")
+
+    get_workout_index().put(digest, str(workout_id))
+    return str(workout_id)
 
 
 @mcp.tool
-def get_calendar(year: int, month: int, day: int = None, start: int = 1) -> dict:
+@instrument_tool
+@athlete_scoped
+async def upload_workouts(workouts: List[dict], athlete: str = None) -> dict:
+    """
+    Uploads several structured workouts to Garmin Connect in one call, e.g. a week of sessions.
+    Prefer this over repeated `upload_workout` calls.
+
+    All workouts are validated before anything is uploaded: if any of them is invalid, nothing
+    is uploaded and the error lists every problem with its path, e.g.
+    `workouts[2].steps[0].stepType`. Valid workouts are then uploaded concurrently; a failed
+    upload does not stop the others.
+
+    Args:
+        workouts: List of workouts in the same JSON format as for `upload_workout` (at most 50).
+        athlete: Athlete whose Garmin account to use, when the server acts for several
+            athletes. Omit for the server's default account.
+
+    Returns:
+        results: One entry per workout, in input order, with `index`, `name` and either
+            `workoutId` or `error`.
+        uploaded: Number of workouts uploaded.
+        failed: Number of workouts that failed to upload.
+
+    Raises:
+        ValueError: If the list is empty, too long, or contains invalid workouts.
+    """
+    if not workouts:
+        raise ValueError("At least one workout must be provided")
+    if len(workouts) > UPLOAD_MAX_WORKOUTS:
+        raise ValueError(
+            f"At most {UPLOAD_MAX_WORKOUTS} workouts can be uploaded at once, got {len(workouts)}"
+        )
+
+    # Validate and compile every payload before any network I/O so bad input fails fast
+    normalized = []
+    invalid = []
+    with get_metrics().time_stage("validate_workout"):
+        for index, workout_data in enumerate(workouts):
+            try:
+                normalized.append(validate_workout(workout_data))
+            except WorkoutValidationError as e:
+                invalid.extend(
+                    f"workouts[{index}]{error['path'][1:]}: {error['message']}"
+                    for error in e.errors
+                )
+    if invalid:
+        raise ValueError(
+            "Invalid workouts, nothing was uploaded: " + "; ".join(invalid)
+        )
+
+    # Compiling runs off the event loop so other sessions' I/O is not held up
+    with get_metrics().time_stage("make_payloads"):
+        compiled = await asyncio.to_thread(make_payloads, normalized)
+    invalid = [
+        f"workouts[{index}]: {error}"
+        for index, (_, error) in enumerate(compiled)
+        if error is not None
+    ]
+    if invalid:
+        raise ValueError(
+            "Invalid workouts, nothing was uploaded: " + "; ".join(invalid)
+        )
+    payloads = [payload for payload, _ in compiled]
+
+    uploads = await map_bounded(create_workout, payloads, UPLOAD_CONCURRENCY)
+
+    results = []
+    for index, (payload, (workout_id, error)) in enumerate(zip(payloads, uploads)):
+        result = {"index": index, "name": payload.get("workoutName")}
+        if error is None:
+            result["workoutId"] = workout_id
+        else:
+            logger.error("Failed to upload workout %d: %s", index, error)
+            result["error"] = str(error)
+        results.append(result)
+
+    uploaded = sum(1 for result in results if "workoutId" in result)
+    return {
+        "results": results,
+        "uploaded": uploaded,
+        "failed": len(results) - uploaded,
+    }
+
+
+@mcp.tool
+@instrument_tool
+@athlete_scoped
+async def get_calendar(
+    year: int, month: int, day: int = None, start: int = 1, athlete: str = None
+) -> dict:
     """
     Get calendar data from Garmin Connect for different time periods.
 
@@ -243,6 +1013,8 @@ def get_calendar(year: int, month: int, day: int = None, start: int = 1) -> dict
                - start=4: Week starts on Thursday
                And so on. Different start values return different 7-day windows with varying
                calendar items, useful for different training schedules and calendar preferences.
+        athlete: Athlete whose Garmin account to use, when the server acts for several
+            athletes. Omit for the server's default account.
 
     Returns:
         Calendar data with workouts and activities for the specified period.
@@ -261,22 +1033,24 @@ def get_calendar(year: int, month: int, day: int = None, start: int = 1) -> dict
         if not (1 <= day <= 31):
             raise ValueError(f"Day must be between 1 and 31, got {day}")
 
-    # Convert month from 1-based (human readable) to 0-based (Garmin API)
-    garmin_month = month - 1
-
     if day is not None:
-        # Weekly view
-        endpoint = CALENDAR_WEEK_ENDPOINT.format(
-            year=year, month=garmin_month, day=day, start=start
+        try:
+            target_day = Date(year, month, day)
+        except ValueError:
+            raise ValueError(f"Day {day} is out of range for {year}-{month:02d}")
+
+        # Weekly view, cut locally from the cached months overlapping the week
+        first, last = week_bounds(target_day, start)
+        months = await asyncio.gather(
+            *(get_calendar_month(y, m) for y, m in months_in_range(first, last))
         )
+        calendar_data = slice_week(months, first, last)
         view_type = "week"
     else:
         # Monthly view (default)
-        endpoint = CALENDAR_MONTH_ENDPOINT.format(year=year, month=garmin_month)
+        calendar_data = await get_calendar_month(year, month)
         view_type = "month"
 
-    calendar_data = garth.connectapi(endpoint)
-
     return {
         "calendar": calendar_data,
         "view_type": view_type,
@@ -290,6 +1064,124 @@ def get_calendar(year: int, month: int, day: int = None, start: int = 1) -> dict
 
 
 @mcp.tool
+@instrument_tool
+@athlete_scoped
+def get_cache_stats(athlete: str = None) -> dict:
+    """
+    Get hit and miss counters of the server's response cache.
+
+    Args:
+        athlete: Athlete whose Garmin account to use, when the server acts for several
+            athletes. Omit for the server's default account.
+
+    Returns:
+        Cache statistics (hits, misses, hit rate, evictions and current size).
+    """
+    return get_client().cache.stats()
+
+
+@mcp.tool
+@instrument_tool
+@athlete_scoped
+def get_server_metrics(athlete: str = None) -> dict:
+    """
+    Get latency and size metrics of this server, to find which tools and Garmin endpoints are slow.
+
+    Args:
+        athlete: Athlete whose Garmin account to use, when the server acts for several
+            athletes. Omit for the server's default account.
+
+    Returns:
+        tools: Per tool: call count, errors, latency percentiles (p50/p90/p99, in ms) and
+            bytes of JSON results returned.
+        endpoints: The same per Garmin Connect endpoint (IDs collapsed to `{id}`), with
+            response bytes received and time spent waiting on Garmin.
+        stages: Latency of internal stages such as `make_payload` and `json_encode`.
+        cache: Response cache statistics.
+        rateLimiter: Current request rate and throttling counters.
+        retries: Number of retried Garmin requests.
+        prometheusFile: Path of the Prometheus text dump, if GARMIN_WORKOUTS_MCP_METRICS_FILE
+            is set; it is rewritten on every call.
+    """
+    client = get_client()
+    result = {
+        **get_metrics().snapshot(),
+        "cache": client.cache.stats(),
+        "rateLimiter": client.limiter.stats(),
+        "retries": client.retry_policy.retries,
+    }
+    if metrics_file():
+        result["prometheusFile"] = get_metrics().write_prometheus(metrics_file())
+    return result
+
+
+@mcp.tool
+@instrument_tool
+@athlete_scoped
+async def compile_workout(
+    description: str,
+    name: str = None,
+    sport: str = "running",
+    upload: bool = False,
+    athlete: str = None,
+) -> dict:
+    """
+    Compile a natural language workout description into structured workout data, without an
+    LLM round trip. Try this before `generate_workout_data_prompt`.
+
+    Understands comma- or "then"-separated steps with a duration ("5min", "90sec") or distance
+    ("3km", "400m"), warmup/cooldown/recovery keywords, heart rate targets ("zone 2",
+    "162-168bpm", "under 125bpm") and repeats ("4x(5min at 173-180bpm, 3min jog)").
+
+    Args:
+        description: Workout description, e.g. "3km warmup at zone 2, 4x(5min at 173-180bpm, 3min jog), 2km cooldown".
+        name: Workout name. Defaults to the first step of the description.
+        sport: Sport type: 'running', 'cycling', 'swimming', 'cardio' or 'strength'.
+        upload: Also upload the workout to Garmin Connect if the whole description was understood.
+        athlete: Athlete whose Garmin account to use, when the server acts for several
+            athletes. Omit for the server's default account.
+
+    Returns:
+        workout: The workout in the format accepted by `upload_workout`.
+        estimatedDurationInSecs: Estimated duration of the workout.
+        fallback: True if parts of the description were not understood. The workout is then
+            incomplete (or a single guessed step) and was not uploaded; use
+            `generate_workout_data_prompt` instead.
+        unparsed: The parts of the description that were not understood.
+        workoutId: ID of the uploaded workout, if `upload` was requested and it succeeded.
+
+    Raises:
+        ValueError: If the description is empty or the sport is not supported.
+    """
+    if not description or not description.strip():
+        raise ValueError("A workout description must be provided")
+
+    first_step = (split_workout_description(description) or [description.strip()])[0]
+    workout, unparsed = compile_workout_description(description, name or first_step)
+    workout.type = sport
+    if name:
+        workout.name = name
+    workout_data = workout.model_dump(exclude_none=True)
+
+    with get_metrics().time_stage("make_payload"):
+        payload = make_payload(workout_data)
+
+    fallback = bool(unparsed)
+    result = {
+        "workout": workout_data,
+        "estimatedDurationInSecs": payload["estimatedDurationInSecs"],
+        "fallback": fallback,
+        "unparsed": unparsed,
+    }
+    if fallback:
+        logger.info("Could not compile parts of workout description: %s", unparsed)
+    elif upload:
+        result["workoutId"] = await create_workout(payload)
+    return result
+
+
+@mcp.tool
+@instrument_tool
 def generate_workout_data_prompt(description: str) -> dict:
     """
     Generate prompt for LLM to create structured workout data based on a natural language description. The LLM
@@ -319,7 +1211,7 @@ def generate_workout_data_prompt(description: str) -> dict:
     - Use the following structure for the workout object:
     {{
     "name": "Workout Name",
-    "type": "running" | "cycling" | "swimming" | "walking" | "cardio" | "strength",
+    "type": "running" | "cycling" | "swimming" | "cardio" | "strength",
     "steps": [
         {{
         "stepName": "Step Name",
@@ -350,9 +1242,11 @@ def generate_workout_data_prompt(description: str) -> dict:
 
 def login():
     """Login to Garmin Connect."""
-    garth_home = os.environ.get("GARTH_HOME", "~/.garth")
+    import garth
+
+    token_dir = garth_home()
     try:
-        garth.resume(garth_home)
+        garth.resume(token_dir)
     except Exception:
         email = os.environ.get("GARMIN_EMAIL")
         password = os.environ.get("GARMIN_PASSWORD")
@@ -369,13 +1263,130 @@ def login():
             sys.exit(1)
 
         # Save credentials for future use
-        garth.save(garth_home)
+        garth.save(token_dir)
+
+
+def login_athlete(athlete: str) -> str:
+    """
+    Log an athlete in with GARMIN_EMAIL/GARMIN_PASSWORD and save their tokens, so
+    tools can act for them by passing `athlete`.
+
+    Args:
+        athlete: Identifier the athlete is referred to by in tool calls
+
+    Returns:
+        The directory the tokens were saved to.
+    """
+    import garth
+
+    token_dir = athlete_dir(garth_home(), athlete)
+    email = os.environ.get("GARMIN_EMAIL")
+    password = os.environ.get("GARMIN_PASSWORD")
+    if not email or not password:
+        raise ValueError(
+            "The athlete's Garmin email and password must be provided via environment variables (GARMIN_EMAIL, GARMIN_PASSWORD)."
+        )
+
+    garth_client = garth.Client()
+    garth_client.login(email, password)
+    garth_client.dump(token_dir)
+    logger.info("Saved Garmin tokens of athlete %s to %s", athlete, token_dir)
+    return token_dir
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    """Parse the server's command line options."""
+    parser = argparse.ArgumentParser(
+        prog="garmin-workouts-mcp", description="Garmin Workouts MCP Server"
+    )
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "http"],
+        default=os.environ.get(TRANSPORT_ENV, "stdio"),
+        help="stdio serves one client; http serves many sessions from one warm process",
+    )
+    parser.add_argument(
+        "--host", default=os.environ.get(HTTP_HOST_ENV, DEFAULT_HTTP_HOST)
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=int(os.environ.get(HTTP_PORT_ENV, DEFAULT_HTTP_PORT)),
+    )
+    parser.add_argument("--path", default=DEFAULT_HTTP_PATH, help="HTTP endpoint path")
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=int(os.environ.get(MAX_CONCURRENCY_ENV, DEFAULT_MAX_CONCURRENCY)),
+        help="Maximum tool calls executing at once across all HTTP sessions",
+    )
+    parser.add_argument(
+        "--login-athlete",
+        metavar="ATHLETE",
+        help="Log in with GARMIN_EMAIL/GARMIN_PASSWORD, save the tokens for this athlete and exit",
+    )
+    args = parser.parse_args(argv)
+    if args.max_concurrency < 1:
+        parser.error("--max-concurrency must be at least 1")
+    return args
+
+
+def create_http_app(
+    path: str = DEFAULT_HTTP_PATH, max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+):
+    """
+    Build the streamable HTTP application serving many MCP sessions.
+
+    Args:
+        path: Path of the MCP endpoint
+        max_concurrency: Maximum tool calls executing at once across all sessions
 
+    Returns:
+        The ASGI application
+    """
+    mcp.middleware = [
+        m for m in mcp.middleware if not isinstance(m, ToolConcurrencyMiddleware)
+    ]
+    mcp.add_middleware(ToolConcurrencyMiddleware(max_concurrency))
+    app = mcp.http_app(path=path)
+    session_manager_lifespan = app.router.lifespan_context
 
-def main():
+    @asynccontextmanager
+    async def app_lifespan(app):
+        # Keep the shared client warm between sessions, not just during them
+        async with shared_resources(), session_manager_lifespan(app):
+            yield
+
+    app.router.lifespan_context = app_lifespan
+    return app
+
+
+def run_http(host: str, port: int, path: str, max_concurrency: int) -> None:
+    """Serve the MCP server over streamable HTTP until interrupted."""
+    import uvicorn
+
+    app = create_http_app(path, max_concurrency)
+    logger.info(
+        "Serving MCP over HTTP at http://%s:%s%s (max %d concurrent tool calls)",
+        host,
+        port,
+        path,
+        max_concurrency,
+    )
+    uvicorn.run(app, host=host, port=port, log_level="warning")
+
+
+def main(argv: List[str] = None):
     """Main entry point for the console script."""
+    args = parse_args(argv)
+    if args.login_athlete:
+        login_athlete(args.login_athlete)
+        return
     login()
-    mcp.run()
+    if args.transport == "http":
+        run_http(args.host, args.port, args.path, args.max_concurrency)
+    else:
+        mcp.run()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,392 @@
+"""In-process latency and size metrics for tools, Garmin endpoints, internal stages and sessions."""
+
+import bisect
+import functools
+import inspect
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+METRICS_FILE_ENV = "GARMIN_WORKOUTS_MCP_METRICS_FILE"
+
+# Upper bounds in seconds of the latency histogram buckets, roughly x2.5 apart
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+PERCENTILES = (50, 90, 99)
+
+# Sessions tracked individually; the least recently active are dropped beyond this
+MAX_TRACKED_SESSIONS = 256
+
+_NUMERIC_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_label(path: str) -> str:
+    """
+    Collapse IDs and dates in a request path so it can be used as a metric label.
+
+    ``/workout-service/workout/123`` becomes ``/workout-service/workout/{id}``.
+    """
+    return _NUMERIC_SEGMENT.sub("/{id}", path.split("?", 1)[0])
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram.
+
+    Observations are counted in ``LATENCY_BUCKETS`` (plus an overflow bucket),
+    so memory stays constant however many calls are recorded. Percentiles are
+    estimated by linear interpolation inside the bucket they fall into.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one duration."""
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """
+        Estimate a percentile of the recorded durations.
+
+        Args:
+            p: Percentile between 0 and 100
+
+        Returns:
+            The estimated duration in seconds, or None if nothing was recorded
+        """
+        if not self.count:
+            return None
+        rank = p / 100 * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / bucket_count
+                return min(estimate, self.max)
+            seen += bucket_count
+        return self.max
+
+    def summary(self) -> dict:
+        """Return the count, mean, max and percentiles in milliseconds."""
+        result = {
+            "count": self.count,
+            "meanMs": round(self.sum / self.count * 1000, 3) if self.count else None,
+            "maxMs": round(self.max * 1000, 3),
+        }
+        for p in PERCENTILES:
+            value = self.percentile(p)
+            result[f"p{p}Ms"] = round(value * 1000, 3) if value is not None else None
+        return result
+
+
+class _Series:
+    """Latency, error and byte counters for one tool, endpoint or stage."""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.bytes = 0
+
+    def summary(self) -> dict:
+        return {**self.latency.summary(), "errors": self.errors, "bytes": self.bytes}
+
+
+class MetricsRegistry:
+    """
+    Collects per-tool, per-endpoint, per-stage and per-session metrics.
+
+    Safe to use from both coroutines and threads.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.tools: Dict[str, _Series] = {}
+        self.endpoints: Dict[str, _Series] = {}
+        self.stages: Dict[str, _Series] = {}
+        self.sessions: OrderedDict[str, _Series] = OrderedDict()
+
+    def _observe(
+        self,
+        series: Dict[str, _Series],
+        name: str,
+        seconds: float,
+        error: bool = False,
+        size: int = 0,
+    ) -> None:
+        with self._lock:
+            entry = series.get(name)
+            if entry is None:
+                entry = series[name] = _Series()
+            entry.latency.observe(seconds)
+            entry.errors += bool(error)
+            entry.bytes += size
+
+    def observe_tool(self, name: str, seconds: float, error: bool = False) -> None:
+        """Record one tool call."""
+        self._observe(self.tools, name, seconds, error)
+
+    def observe_tool_result(self, name: str, size: int) -> None:
+        """Record the size in bytes of a tool's result as sent to the client."""
+        with self._lock:
+            entry = self.tools.get(name)
+            if entry is None:
+                entry = self.tools[name] = _Series()
+            entry.bytes += size
+
+    def observe_request(
+        self, method: str, path: str, seconds: float, error: bool = False, size: int = 0
+    ) -> None:
+        """Record one Garmin Connect request and the size of its response body."""
+        self._observe(
+            self.endpoints,
+            f"{method.upper()} {endpoint_label(path)}",
+            seconds,
+            error,
+            size,
+        )
+
+    def observe_stage(self, name: str, seconds: float, error: bool = False) -> None:
+        """Record one run of an internal stage such as ``make_payload``."""
+        self._observe(self.stages, name, seconds, error)
+
+    def observe_session(
+        self, session_id: str, seconds: float, error: bool = False
+    ) -> None:
+        """Record one tool call made by an MCP client session."""
+        self._observe(self.sessions, session_id, seconds, error)
+        with self._lock:
+            self.sessions.move_to_end(session_id)
+            while len(self.sessions) > MAX_TRACKED_SESSIONS:
+                self.sessions.popitem(last=False)
+
+    @contextmanager
+    def time_stage(self, name: str) -> Iterator[None]:
+        """Context manager timing the enclosed block as stage ``name``."""
+        started = self._clock()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.observe_stage(name, self._clock() - started, error)
+
+    def snapshot(self) -> dict:
+        """Return every series' latency percentiles and counters."""
+        with self._lock:
+            return {
+                "tools": {name: s.summary() for name, s in sorted(self.tools.items())},
+                "endpoints": {
+                    name: s.summary() for name, s in sorted(self.endpoints.items())
+                },
+                "stages": {
+                    name: s.summary() for name, s in sorted(self.stages.items())
+                },
+                # Most recently active first
+                "sessions": {
+                    name: {k: v for k, v in s.summary().items() if k != "bytes"}
+                    for name, s in reversed(self.sessions.items())
+                },
+            }
+
+    def reset(self) -> None:
+        """Drop all recorded metrics."""
+        with self._lock:
+            self.tools.clear()
+            self.endpoints.clear()
+            self.stages.clear()
+            self.sessions.clear()
+
+    def to_prometheus(self) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        Per-session series are left out: session IDs would be unbounded label values.
+        """
+        families = (
+            ("garmin_mcp_tool", "tool", self.tools, "MCP tool calls", "result"),
+            (
+                "garmin_mcp_request",
+                "endpoint",
+                self.endpoints,
+                "Garmin Connect requests",
+                "response",
+            ),
+            (
+                "garmin_mcp_stage",
+                "stage",
+                self.stages,
+                "internal processing stages",
+                None,
+            ),
+        )
+        lines: List[str] = []
+        with self._lock:
+            for prefix, label, series, description, payload in families:
+                if not series:
+                    continue
+                lines.append(
+                    f"# HELP {prefix}_duration_seconds Latency of {description}."
+                )
+                lines.append(f"# TYPE {prefix}_duration_seconds histogram")
+                for name, s in sorted(series.items()):
+                    labels = f'{label}="{_escape_label(name)}"'
+                    cumulative = 0
+                    for bound, bucket_count in zip(s.latency.buckets, s.latency.counts):
+                        cumulative += bucket_count
+                        lines.append(
+                            f'{prefix}_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}'
+                        )
+                    lines.append(
+                        f'{prefix}_duration_seconds_bucket{{{labels},le="+Inf"}} {s.latency.count}'
+                    )
+                    lines.append(
+                        f"{prefix}_duration_seconds_sum{{{labels}}} {s.latency.sum:.6f}"
+                    )
+                    lines.append(
+                        f"{prefix}_duration_seconds_count{{{labels}}} {s.latency.count}"
+                    )
+                lines.append(f"# HELP {prefix}_errors_total Failed {description}.")
+                lines.append(f"# TYPE {prefix}_errors_total counter")
+                for name, s in sorted(series.items()):
+                    lines.append(
+                        f'{prefix}_errors_total{{{label}="{_escape_label(name)}"}} {s.errors}'
+                    )
+                if payload:
+                    lines.append(
+                        f"# HELP {prefix}_{payload}_bytes_total Bytes of {description} {payload}s."
+                    )
+                    lines.append(f"# TYPE {prefix}_{payload}_bytes_total counter")
+                    for name, s in sorted(series.items()):
+                        lines.append(
+                            f'{prefix}_{payload}_bytes_total{{{label}="{_escape_label(name)}"}} {s.bytes}'
+                        )
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> str:
+        """
+        Atomically write the Prometheus text dump to a file.
+
+        Args:
+            path: Destination file; ``~`` is expanded
+
+        Returns:
+            The absolute path written
+        """
+        path = os.path.abspath(os.path.expanduser(path))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+        return path
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def timed_serializer(serializer: Callable[[Any], str]) -> Callable[[Any], str]:
+    """
+    Wrap a tool result serializer so each encode is timed as the ``json_encode`` stage.
+
+    Pass the result as FastMCP's ``tool_serializer``; the size of the encoded
+    results is recorded by `ToolResultSizeMiddleware`.
+    """
+
+    @functools.wraps(serializer)
+    def serialize(result: Any) -> str:
+        with get_metrics().time_stage("json_encode"):
+            return serializer(result)
+
+    return serialize
+
+
+def instrument_tool(func: Callable) -> Callable:
+    """
+    Decorator recording a tool's latency and errors.
+
+    Apply it below ``@mcp.tool`` so FastMCP registers the instrumented function.
+    """
+    name = func.__name__
+
+    def record(started: float, error: bool) -> None:
+        metrics = get_metrics()
+        metrics.observe_tool(name, metrics._clock() - started, error)
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            started = get_metrics()._clock()
+            try:
+                result = await func(*args, **kwargs)
+            except BaseException:
+                record(started, True)
+                raise
+            record(started, False)
+            return result
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = get_metrics()._clock()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            record(started, True)
+            raise
+        record(started, False)
+        return result
+
+    return wrapper
+
+
+def metrics_file() -> Optional[str]:
+    """Path of the Prometheus dump configured through the environment, if any."""
+    return os.environ.get(METRICS_FILE_ENV) or None
+
+
+_metrics: Optional[MetricsRegistry] = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Return the process-wide metrics registry."""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = MetricsRegistry()
+        return _metrics
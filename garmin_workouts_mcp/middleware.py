@@ -0,0 +1,93 @@
+"""FastMCP middleware for serving many MCP sessions from one process."""
+
+import asyncio
+import time
+from typing import Any, Iterable
+
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+
+from .metrics import get_metrics
+
+
+def session_id(context: MiddlewareContext) -> str:
+    """ID of the MCP session a request belongs to."""
+    fastmcp_context = context.fastmcp_context
+    if fastmcp_context is None:
+        return "unknown"
+    try:
+        return fastmcp_context.session_id
+    except RuntimeError:
+        # No request context, e.g. when the server is driven directly
+        return "unknown"
+
+
+class SessionMetricsMiddleware(Middleware):
+    """Records each session's tool call count, errors and latency."""
+
+    async def on_call_tool(
+        self, context: MiddlewareContext, call_next: CallNext
+    ) -> Any:
+        started = time.perf_counter()
+        error = False
+        try:
+            return await call_next(context)
+        except Exception:
+            error = True
+            raise
+        finally:
+            get_metrics().observe_session(
+                session_id(context), time.perf_counter() - started, error
+            )
+
+
+def content_size(content: Iterable[Any]) -> int:
+    """Size in bytes of a tool result's content blocks: text as UTF-8, binary as encoded."""
+    size = 0
+    for block in content:
+        text = getattr(block, "text", None)
+        if text is not None:
+            size += len(text.encode("utf-8"))
+        else:
+            size += len(getattr(block, "data", "") or "")
+    return size
+
+
+class ToolResultSizeMiddleware(Middleware):
+    """
+    Records the size of each tool's results as sent to the client.
+
+    Reads the content FastMCP already serialized, so results are not encoded
+    a second time just to be measured.
+    """
+
+    async def on_call_tool(
+        self, context: MiddlewareContext, call_next: CallNext
+    ) -> Any:
+        result = await call_next(context)
+        get_metrics().observe_tool_result(
+            context.message.name, content_size(getattr(result, "content", None) or [])
+        )
+        return result
+
+
+class ToolConcurrencyMiddleware(Middleware):
+    """
+    Caps the number of tool calls executing at once across all sessions.
+
+    Calls beyond the limit wait for a free slot; the wait is recorded as the
+    ``tool_queue`` stage.
+    """
+
+    def __init__(self, max_concurrency: int):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def on_call_tool(
+        self, context: MiddlewareContext, call_next: CallNext
+    ) -> Any:
+        started = time.perf_counter()
+        async with self._semaphore:
+            get_metrics().observe_stage("tool_queue", time.perf_counter() - started)
+            return await call_next(context)
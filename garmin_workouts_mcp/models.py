@@ -1,8 +1,15 @@
 """Pydantic models for training plan data."""
 
 from datetime import date, time
-from typing import List, Optional, Dict, Any, Union
-from pydantic import BaseModel, Field, validator
+from typing import List, Optional, Dict, Any, Tuple, Union
+from pydantic import BaseModel, Field, field_validator, model_validator, validator
+from pydantic_core import PydanticCustomError
+
+from .garmin_workout import (
+    DISTANCE_UNIT_MAPPING,
+    SPORT_TYPE_MAPPING,
+    TARGET_TYPE_MAPPING,
+)
 
 
 class TrainingSession(BaseModel):
@@ -67,21 +74,139 @@ class TrainingPlan(BaseModel):
 
 
 class WorkoutStep(BaseModel):
-    """Model for a single workout step."""
+    """
+    Model for a single workout step.
+
+    Besides the field types, validation checks the rules `make_payload`
+    applies to a step, reporting every problem of the step at once.
+    """
 
-    stepName: str
-    stepDescription: str
-    endConditionType: str = Field(description="'time' or 'distance'")
-    stepDuration: Optional[int] = Field(None, description="Duration in seconds")
+    stepName: Optional[str] = None
+    stepDescription: Optional[str] = None
+    endConditionType: Optional[str] = Field(
+        None, description="'time', 'distance' or, for repeat groups, 'repeat'"
+    )
+    stepDuration: Optional[float] = Field(None, description="Duration in seconds")
     stepDistance: Optional[float] = Field(None, description="Distance value")
     distanceUnit: Optional[str] = Field(None, description="'m', 'km', or 'mile'")
-    stepType: str = Field(
-        description="'warmup', 'cooldown', 'interval', 'recovery', 'rest', 'repeat'"
+    stepType: Optional[str] = Field(
+        None,
+        description="'warmup', 'cooldown', 'interval', 'recovery', 'rest', 'repeat'",
     )
     target: Optional[Dict[str, Any]] = None
     numberOfIterations: Optional[int] = None
     steps: Optional[List["WorkoutStep"]] = None
 
+    @field_validator("stepDuration")
+    @classmethod
+    def whole_seconds(cls, v: Optional[float]) -> Optional[float]:
+        """Keep whole durations integral, as they were given to `make_payload` before."""
+        if v is not None and v.is_integer():
+            return int(v)
+        return v
+
+    @model_validator(mode="after")
+    def check_step(self) -> "WorkoutStep":
+        """Check that `make_payload` can convert the step."""
+        issues = step_issues(self)
+        if issues:
+            raise PydanticCustomError(
+                "workout_step",
+                "; ".join(message for _, message in issues),
+                {
+                    "issues": [
+                        {"field": field, "message": message}
+                        for field, message in issues
+                    ]
+                },
+            )
+        return self
+
+
+def step_issues(step: WorkoutStep) -> List[Tuple[str, str]]:
+    """
+    Lists what keeps `make_payload` from converting a step.
+
+    Returns:
+        (field, message) tuples, empty if the step is valid
+    """
+    name = step.stepName or "Unnamed Step"
+    issues = []
+
+    # Same test as garmin_workout.is_repeat_step
+    if (
+        step.numberOfIterations
+        and step.steps
+        and (step.stepType == "repeat" or step.endConditionType == "repeat")
+    ):
+        if step.numberOfIterations <= 0:
+            issues.append(
+                (
+                    "numberOfIterations",
+                    "Invalid or missing numberOfIterations for repeat step.",
+                )
+            )
+        return issues
+
+    if step.stepType == "repeat" or step.endConditionType == "repeat":
+        field = "steps" if step.numberOfIterations else "numberOfIterations"
+        issues.append(
+            (
+                field,
+                f"Repeat step {name} needs a positive numberOfIterations and a non-empty steps list",
+            )
+        )
+        return issues
+
+    if not step.stepType:
+        issues.append(("stepType", f"Missing stepType for step: {name}"))
+
+    if step.endConditionType == "distance" and step.stepDistance and step.distanceUnit:
+        if step.distanceUnit.lower() not in DISTANCE_UNIT_MAPPING:
+            issues.append(
+                ("distanceUnit", f"Unsupported distance unit: {step.distanceUnit}")
+            )
+    elif step.stepDuration is None or step.stepDuration <= 0:
+        if step.endConditionType == "distance":
+            issues.append(
+                (
+                    "stepDistance",
+                    f"Distance step {name} needs a positive stepDistance and a distanceUnit",
+                )
+            )
+        else:
+            issues.append(
+                ("stepDuration", f"Invalid or missing stepDuration for step: {name}")
+            )
+
+    if step.target:
+        issues.extend(
+            ("target." + field, message)
+            for field, message in target_issues(step.target)
+        )
+    return issues
+
+
+def target_issues(target: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """Lists what keeps `make_payload` from converting a step target, as (field, message) tuples."""
+    target_type = target.get("type")
+    if not isinstance(target_type, str):
+        return [("type", "Missing target type")]
+    if target_type.lower() not in TARGET_TYPE_MAPPING:
+        return [("type", f"Unsupported target type: {target_type}")]
+
+    value = target.get("value")
+    if not value:
+        return []
+    values = value if isinstance(value, list) else [value]
+    if isinstance(value, list) and len(value) != 2:
+        return [("value", "Target value must be a number or a [min, max] pair")]
+    if not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+        return [("value", "Target values must be numbers")]
+    if target.get("unit") == "min_per_km" and not all(v > 0 for v in values):
+        return [("value", "Pace targets must be positive minutes per km")]
+    return []
+
 
 # Update forward references
 WorkoutStep.model_rebuild()
@@ -92,10 +217,20 @@ class WorkoutData(BaseModel):
 
     name: str
     type: str = Field(
-        description="'running', 'cycling', 'swimming', 'walking', 'cardio', 'strength'"
+        description="'running', 'cycling', 'swimming', 'cardio', 'strength'"
     )
     steps: List[WorkoutStep]
 
+    @field_validator("type")
+    @classmethod
+    def check_sport_type(cls, v: str) -> str:
+        """Only sports `make_payload` supports."""
+        if v.lower() not in SPORT_TYPE_MAPPING:
+            raise PydanticCustomError(
+                "sport_type", "Unsupported sport type: {sport}", {"sport": v}
+            )
+        return v
+
 
 class ScheduleResult(BaseModel):
     """Model for workout scheduling result."""
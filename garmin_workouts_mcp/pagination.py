@@ -0,0 +1,71 @@
+"""Auto-paginating iteration over offset/limit paged Garmin Connect endpoints."""
+
+import asyncio
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_PREFETCH = 3
+
+PageFetcher = Callable[[int, int], Awaitable[Optional[List[dict]]]]
+
+
+async def iter_pages(
+    fetch_page: PageFetcher,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    start: int = 0,
+    max_items: Optional[int] = None,
+    prefetch: int = DEFAULT_PREFETCH,
+) -> AsyncIterator[List[dict]]:
+    """
+    Iterates over all pages of a paged endpoint, fetching the next pages ahead.
+
+    Up to ``prefetch`` page requests are in flight at once. Pages are yielded in
+    order as soon as each one arrives, so consumers can process the first page
+    while later pages are still downloading. Iteration stops at the first short
+    or empty page, or once ``max_items`` items were requested. Requests already
+    in flight past the end are cancelled.
+
+    Args:
+        fetch_page: Coroutine function taking ``(start, limit)`` and returning one page
+        page_size: Number of items requested per page
+        start: Offset of the first item
+        max_items: Maximum number of items to fetch, or None for no limit
+        prefetch: Maximum number of page requests in flight
+
+    Yields:
+        Non-empty pages of items
+    """
+    if page_size <= 0:
+        raise ValueError(f"page_size must be positive, got {page_size}")
+    if prefetch <= 0:
+        raise ValueError(f"prefetch must be positive, got {prefetch}")
+
+    end = None if max_items is None else start + max_items
+    next_start = start
+    pending = deque()
+
+    try:
+        while True:
+            while len(pending) < prefetch and (end is None or next_start < end):
+                limit = page_size if end is None else min(page_size, end - next_start)
+                task = asyncio.ensure_future(fetch_page(next_start, limit))
+                pending.append((limit, task))
+                next_start += limit
+
+            if not pending:
+                return
+
+            limit, task = pending.popleft()
+            page = await task or []
+            if page:
+                yield page
+            if len(page) < limit:
+                return
+    finally:
+        for _, task in pending:
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                # Mark failures of discarded pages as retrieved
+                task.exception()
@@ -0,0 +1,174 @@
+"""Field projection for trimming large Garmin Connect documents before serialization."""
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+# Dotted field paths kept by each named profile. Paths cover both the flat
+# activity list items and the nested `summaryDTO` of a single activity; paths
+# missing from a document are skipped.
+PROFILES = {
+    "summary": (
+        "activityId",
+        "activityName",
+        "activityType.typeKey",
+        "activityTypeDTO.typeKey",
+        "startTimeLocal",
+        "summaryDTO.startTimeLocal",
+        "distance",
+        "summaryDTO.distance",
+        "duration",
+        "summaryDTO.duration",
+        "movingDuration",
+        "summaryDTO.movingDuration",
+        "elevationGain",
+        "summaryDTO.elevationGain",
+        "averageHR",
+        "summaryDTO.averageHR",
+        "calories",
+        "summaryDTO.calories",
+        "trainingEffectLabel",
+        "aerobicTrainingEffect",
+        "summaryDTO.trainingEffect",
+    ),
+    "hr": (
+        "activityId",
+        "activityName",
+        "startTimeLocal",
+        "summaryDTO.startTimeLocal",
+        "duration",
+        "summaryDTO.duration",
+        "averageHR",
+        "maxHR",
+        "minHR",
+        "summaryDTO.averageHR",
+        "summaryDTO.maxHR",
+        "summaryDTO.minHR",
+        "hrTimeInZone_1",
+        "hrTimeInZone_2",
+        "hrTimeInZone_3",
+        "hrTimeInZone_4",
+        "hrTimeInZone_5",
+    ),
+    "pace": (
+        "activityId",
+        "activityName",
+        "startTimeLocal",
+        "summaryDTO.startTimeLocal",
+        "distance",
+        "summaryDTO.distance",
+        "duration",
+        "summaryDTO.duration",
+        "movingDuration",
+        "summaryDTO.movingDuration",
+        "averageSpeed",
+        "maxSpeed",
+        "avgGradeAdjustedSpeed",
+        "summaryDTO.averageSpeed",
+        "summaryDTO.averageMovingSpeed",
+        "summaryDTO.maxSpeed",
+        "summaryDTO.avgGradeAdjustedSpeed",
+        "averageRunningCadenceInStepsPerMinute",
+        "summaryDTO.averageRunCadence",
+    ),
+}
+
+# A compiled projection maps each key to keep either to None (keep the whole
+# value) or to the compiled projection of its children.
+Projection = Dict[str, Optional["Projection"]]
+
+
+@lru_cache(maxsize=128)
+def compile_projection(paths: Tuple[str, ...]) -> Projection:
+    """
+    Compiles dotted field paths into a projection tree.
+
+    Args:
+        paths: Dotted field paths, e.g. ``("activityId", "summaryDTO.distance")``
+
+    Returns:
+        The projection tree used by `apply_projection`
+    """
+    tree: Projection = {}
+    for path in paths:
+        node = tree
+        *parents, leaf = path.split(".")
+        for key in parents:
+            child = node.get(key, {})
+            if child is None:
+                # A parent is already kept whole
+                break
+            node = node.setdefault(key, child)
+        else:
+            node[leaf] = None
+    return tree
+
+
+# Profiles are compiled once at import
+COMPILED_PROFILES = {
+    name: compile_projection(paths) for name, paths in PROFILES.items()
+}
+
+
+def resolve_fields(fields: Union[str, Iterable[str], None]) -> Optional[Projection]:
+    """
+    Resolves a `fields` tool argument into a compiled projection.
+
+    Args:
+        fields: A profile name, a comma-separated string of dotted paths, a list
+            mixing both, or None for no projection
+
+    Returns:
+        The compiled projection, or None if every field should be kept
+
+    Raises:
+        ValueError: If no field is given
+    """
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        if fields in COMPILED_PROFILES:
+            return COMPILED_PROFILES[fields]
+        fields = fields.split(",")
+
+    paths: List[str] = []
+    for field in fields:
+        field = field.strip()
+        if field in PROFILES:
+            paths.extend(PROFILES[field])
+        elif field:
+            paths.append(field)
+
+    if not paths:
+        raise ValueError("fields must name a profile or at least one field path")
+    return compile_projection(tuple(dict.fromkeys(paths)))
+
+
+def apply_projection(document: Any, projection: Optional[Projection]) -> Any:
+    """
+    Applies a compiled projection to a document.
+
+    Dicts keep only the projected keys, lists are projected item by item, and
+    other values are returned unchanged. The input is never modified.
+
+    Args:
+        document: The document to trim
+        projection: A compiled projection, or None to return the document as is
+
+    Returns:
+        The trimmed document
+    """
+    if projection is None:
+        return document
+    if isinstance(document, list):
+        return [apply_projection(item, projection) for item in document]
+    if not isinstance(document, dict):
+        return document
+
+    result = {}
+    for key, children in projection.items():
+        if key in document:
+            value = document[key]
+            result[key] = (
+                value if children is None else apply_projection(value, children)
+            )
+    return result
@@ -0,0 +1,155 @@
+"""Adaptive token-bucket rate limiting for outbound Garmin Connect requests."""
+
+import asyncio
+import threading
+import time
+from typing import Callable, Optional
+
+DEFAULT_RATE = 4.0  # requests per second
+DEFAULT_BURST = 8
+DEFAULT_MIN_RATE = 0.25
+DEFAULT_MAX_RATE = 10.0
+DEFAULT_INCREASE = 0.05  # added to the rate per successful request
+DEFAULT_DECREASE = 0.5  # rate multiplier on throttling
+THROTTLE_COOLDOWN = 1.0  # seconds during which further throttle signals are ignored
+
+THROTTLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def is_throttle_status(status_code: Optional[int]) -> bool:
+    """Whether a response status indicates the service is overloaded or throttling."""
+    return status_code in THROTTLE_STATUS_CODES
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket whose refill rate adapts to the service's responses.
+
+    Tokens refill at ``rate`` per second up to ``burst``. Each request takes one
+    token; when the bucket is empty the request is delayed until its token is
+    due (the balance may go negative, queueing callers fairly). On throttling
+    the rate is cut multiplicatively, and every success raises it additively
+    (AIMD), so throughput converges on what Garmin allows.
+
+    Safe to use from both coroutines and threads.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        min_rate: float = DEFAULT_MIN_RATE,
+        max_rate: float = DEFAULT_MAX_RATE,
+        increase: float = DEFAULT_INCREASE,
+        decrease: float = DEFAULT_DECREASE,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._last_decrease = float("-inf")
+        self.throttled = 0
+        self.waited = 0.0
+
+    def reserve(self) -> float:
+        """
+        Take one token.
+
+        Returns:
+            How many seconds the caller must wait before sending its request.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.waited += delay
+            return delay
+
+    async def acquire(self) -> None:
+        """Wait for a token without blocking the event loop."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def acquire_sync(self) -> None:
+        """Wait for a token, blocking the calling thread."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def on_success(self) -> None:
+        """Record a successful request, raising the rate."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """
+        Record a throttled request (HTTP 429 or 5xx), cutting the rate.
+
+        Args:
+            retry_after: Seconds the service asked clients to wait, if given
+        """
+        with self._lock:
+            now = self._clock()
+            self.throttled += 1
+            # Requests in flight when throttling starts all fail together;
+            # count them as one signal
+            if now - self._last_decrease >= THROTTLE_COOLDOWN:
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self._last_decrease = now
+            # Drop saved-up burst capacity and honour Retry-After
+            self._tokens = min(self._tokens, 0.0)
+            if retry_after:
+                self._tokens -= retry_after * self.rate
+
+    def record(
+        self, status_code: Optional[int], retry_after: Optional[float] = None
+    ) -> None:
+        """Feed a response status back into the limiter."""
+        if is_throttle_status(status_code):
+            self.on_throttle(retry_after)
+        elif status_code is not None and status_code < 400:
+            self.on_success()
+
+    def stats(self) -> dict:
+        """Return the current rate and counters."""
+        return {
+            "rate": round(self.rate, 3),
+            "burst": self.burst,
+            "throttled": self.throttled,
+            "waitedSeconds": round(self.waited, 3),
+        }
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds; HTTP dates are ignored."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+_limiter: Optional[AdaptiveRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> AdaptiveRateLimiter:
+    """Return the process-wide rate limiter shared by all Garmin requests."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = AdaptiveRateLimiter()
+        return _limiter
@@ -0,0 +1,134 @@
+"""Retry policy for transient Garmin Connect failures."""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+# Statuses and errors where the request was rejected before Garmin processed it,
+# so even a non-idempotent POST can be sent again without creating duplicates
+NOT_PROCESSED_STATUS_CODES = frozenset({429})
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class RetryPolicy:
+    """
+    Retries transient failures with jittered exponential backoff under a deadline.
+
+    Idempotent requests are retried on retryable HTTP statuses (408, 429, 5xx)
+    and on transport errors (connection resets, timeouts). Non-idempotent
+    requests are only retried when the request is known not to have been
+    processed: the connection could not be opened, or Garmin answered 429.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        deadline: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        rng: random.Random = None,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self.retries = 0
+
+    def is_retryable(self, error: Exception, idempotent: bool) -> bool:
+        """
+        Classifies a failure.
+
+        Args:
+            error: The exception raised by the request
+            idempotent: Whether repeating the request is harmless
+
+        Returns:
+            True if the request should be attempted again
+        """
+        status_code = getattr(error, "status_code", None)
+        if status_code is not None:
+            if idempotent:
+                return status_code in RETRYABLE_STATUS_CODES
+            return status_code in NOT_PROCESSED_STATUS_CODES
+        if isinstance(error, NOT_SENT_ERRORS):
+            return True
+        if isinstance(error, httpx.TransportError):
+            return idempotent
+        return False
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Delay before the next attempt, using "full jitter" exponential backoff.
+
+        Args:
+            attempt: Number of attempts made so far (1 for the first retry)
+            retry_after: Delay requested by the server, used as a lower bound
+
+        Returns:
+            The delay in seconds
+        """
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        delay = self._rng.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    async def run(
+        self,
+        func: Callable[[], Awaitable[Any]],
+        method: str = "GET",
+        idempotent: Optional[bool] = None,
+    ) -> Any:
+        """
+        Call ``func`` until it succeeds, fails permanently, or attempts or time run out.
+
+        Args:
+            func: Coroutine function performing one attempt
+            method: HTTP method of the request, used to decide idempotency
+            idempotent: Override the method-based idempotency decision
+
+        Returns:
+            The result of the first successful attempt.
+
+        Raises:
+            Exception: The last error, once retrying is not possible.
+        """
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        give_up_at = self._clock() + self.deadline
+
+        attempt = 1
+        while True:
+            try:
+                return await func()
+            except Exception as e:
+                if attempt >= self.max_attempts or not self.is_retryable(e, idempotent):
+                    raise
+                delay = self.backoff(attempt, getattr(e, "retry_after", None))
+                if self._clock() + delay > give_up_at:
+                    raise
+                logger.warning(
+                    "Attempt %d of %s failed: %s. Retrying in %.2fs",
+                    attempt,
+                    method,
+                    e,
+                    delay,
+                )
+                self.retries += 1
+                await self._sleep(delay)
+                attempt += 1
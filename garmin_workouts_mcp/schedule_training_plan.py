@@ -10,15 +10,14 @@ from datetime import datetime, date
 from typing import List, Optional, Dict, Any, Tuple
 
 import click
-import garth
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
-from rich.table import Table
 from rich.panel import Panel
 
 from .models import TrainingPlan, TrainingSession, ScheduleResult, WorkoutData
 from .utils import parse_training_plan_markdown, parse_workout_description
-from .garmin_workout import make_payload
+from .garmin_workout import diff_workouts, make_payload, payload_to_workout
+from .ratelimit import get_rate_limiter, parse_retry_after
+from .workout_index import get_workout_index, payload_hash
 
 # Set up logging
 logging.basicConfig(
@@ -28,6 +27,10 @@ logger = logging.getLogger(__name__)
 
 console = Console()
 
+# Not compared when matching existing workouts: names are compared separately,
+# step names and descriptions are only labels
+DIFF_IGNORED_KEYS = ("name", "stepName", "stepDescription")
+
 
 class GarminWorkoutScheduler:
     """Handles scheduling workouts to Garmin Connect."""
@@ -35,6 +38,26 @@ class GarminWorkoutScheduler:
     def __init__(self, dry_run: bool = False):
         self.dry_run = dry_run
         self.console = console
+        self.limiter = get_rate_limiter()
+
+    def connectapi(self, path: str, method: str = "GET", **kwargs):
+        """Call the Garmin Connect API through the shared rate limiter."""
+        import garth
+        from garth.exc import GarthHTTPError
+
+        self.limiter.acquire_sync()
+        try:
+            result = garth.connectapi(path, method=method, **kwargs)
+        except GarthHTTPError as e:
+            response = getattr(e.error, "response", None)
+            if response is not None:
+                self.limiter.record(
+                    response.status_code,
+                    parse_retry_after(response.headers.get("Retry-After")),
+                )
+            raise
+        self.limiter.on_success()
+        return result
 
     def login(self):
         """Login to Garmin Connect."""
@@ -42,6 +65,8 @@ class GarminWorkoutScheduler:
             self.console.print("[yellow]Dry run mode - skipping Garmin login[/yellow]")
             return
 
+        import garth
+
         try:
             garth_home = os.environ.get("GARTH_HOME", "~/.garth")
             garth.resume(garth_home)
@@ -66,13 +91,24 @@ class GarminWorkoutScheduler:
                 sys.exit(1)
 
     def upload_workout(self, workout_data: WorkoutData) -> Optional[str]:
-        """Upload a workout to Garmin Connect."""
+        """
+        Upload a workout to Garmin Connect.
+
+        If an identical workout was uploaded before and still exists, its ID is
+        returned instead of creating a duplicate.
+        """
         if self.dry_run:
             return "dry-run-workout-id"
 
         try:
             payload = make_payload(workout_data.model_dump())
-            result = garth.connectapi(
+            digest = payload_hash(payload)
+            existing_id = self.find_uploaded_workout(digest)
+            if existing_id:
+                logger.info(f"Identical workout already uploaded as {existing_id}")
+                return existing_id
+
+            result = self.connectapi(
                 "/workout-service/workout", method="POST", json=payload
             )
             workout_id = result.get("workoutId")
@@ -80,11 +116,35 @@ class GarminWorkoutScheduler:
             if not workout_id:
                 raise Exception("No workout ID returned")
 
+            get_workout_index().put(digest, str(workout_id))
             return str(workout_id)
         except Exception as e:
             logger.error(f"Failed to upload workout: {e}")
             raise
 
+    def find_uploaded_workout(self, digest: str) -> Optional[str]:
+        """
+        Look up a workout previously uploaded with an identical payload.
+
+        Returns:
+            The workout ID, or None if it was never uploaded or has since been deleted.
+        """
+        from garth.exc import GarthHTTPError
+
+        index = get_workout_index()
+        workout_id = index.get(digest)
+        if workout_id is None:
+            return None
+        try:
+            self.connectapi(f"/workout-service/workout/{workout_id}")
+        except GarthHTTPError as e:
+            response = getattr(e.error, "response", None)
+            if response is None or response.status_code != 404:
+                raise
+            index.discard(workout_id)
+            return None
+        return workout_id
+
     def schedule_workout(
         self, workout_id: str, schedule_date: date, planned_workout: WorkoutData = None
     ) -> Tuple[Optional[str], bool]:
@@ -134,7 +194,7 @@ class GarminWorkoutScheduler:
             # Schedule the new workout
             payload = {"date": schedule_date.isoformat()}
             endpoint = f"/workout-service/schedule/{workout_id}"
-            result = garth.connectapi(endpoint, method="POST", json=payload)
+            result = self.connectapi(endpoint, method="POST", json=payload)
 
             schedule_id = result.get("workoutScheduleId")
             if not schedule_id:
@@ -152,7 +212,7 @@ class GarminWorkoutScheduler:
 
         try:
             endpoint = f"/calendar-service/year/{target_date.year}/month/{target_date.month - 1}/day/{target_date.day}/start/1"
-            return garth.connectapi(endpoint)
+            return self.connectapi(endpoint)
         except Exception:
             return None
 
@@ -163,7 +223,7 @@ class GarminWorkoutScheduler:
 
         try:
             endpoint = f"/workout-service/schedule/{schedule_id}"
-            garth.connectapi(endpoint, method="DELETE")
+            self.connectapi(endpoint, method="DELETE")
         except Exception as e:
             logger.warning(f"Failed to delete scheduled workout {schedule_id}: {e}")
 
@@ -174,7 +234,7 @@ class GarminWorkoutScheduler:
 
         try:
             endpoint = f"/workout-service/workout/{workout_id}"
-            return garth.connectapi(endpoint)
+            return self.connectapi(endpoint)
         except Exception as e:
             logger.error(f"Failed to get workout {workout_id}: {e}")
             return None
@@ -182,44 +242,34 @@ class GarminWorkoutScheduler:
     def workouts_match(
         self, existing_workout: Dict[str, Any], planned_workout: WorkoutData
     ) -> bool:
-        """Compare if existing workout matches the planned workout structure."""
-        try:
-            # Compare workout type
-            if (
-                existing_workout.get("sportType", {}).get("sportTypeKey")
-                != planned_workout.type
-            ):
-                return False
-
-            # Compare number of steps (segments and steps)
-            existing_segments = existing_workout.get("workoutSegments", [])
-            if not existing_segments:
-                return False
-
-            # For now, we'll do a simple comparison based on workout name and step count
-            # This could be enhanced to do deeper structural comparison
-            existing_steps = []
-            for segment in existing_segments:
-                existing_steps.extend(segment.get("workoutSteps", []))
+        """
+        Compare if existing workout matches the planned workout.
 
-            if len(existing_steps) != len(planned_workout.steps):
+        Both are decoded from their Garmin payloads into workout objects and
+        compared step by step (types, durations, distances, targets, repeats),
+        so a workout uploaded from the same plan matches whatever units the
+        plan used. Names must be equal or contain one another.
+        """
+        try:
+            planned = payload_to_workout(make_payload(planned_workout.model_dump()))
+            existing = payload_to_workout(existing_workout)
+
+            differences = diff_workouts(planned, existing, ignore=DIFF_IGNORED_KEYS)
+            if differences:
+                logger.info(
+                    f"Existing workout {existing['name']!r} differs from the plan: "
+                    + "; ".join(differences[:5])
+                )
                 return False
 
-            # Compare workout names (if available)
-            existing_name = existing_workout.get("workoutName", "").lower()
+            # Compare workout names
+            existing_name = existing["name"].lower()
             planned_name = planned_workout.name.lower()
-
-            # Basic name similarity check
-            if existing_name and planned_name:
-                # Check if names are similar enough
-                if existing_name == planned_name:
-                    return True
-                # Check if one contains the other
-                if planned_name in existing_name or existing_name in planned_name:
-                    return True
-
-            # If we can't determine by name, assume they don't match to be safe
-            return False
+            # One must contain the other; without both names, assume they
+            # don't match to be safe
+            return bool(existing_name and planned_name) and (
+                planned_name in existing_name or existing_name in planned_name
+            )
 
         except Exception as e:
             logger.warning(f"Error comparing workouts: {e}")
@@ -313,6 +363,8 @@ class GarminWorkoutScheduler:
 
     async def schedule_training_plan(self, plan: TrainingPlan) -> List[ScheduleResult]:
         """Schedule all sessions in a training plan."""
+        from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn
+
         results = []
 
         with Progress(
@@ -356,16 +408,14 @@ class GarminWorkoutScheduler:
 
                 progress.advance(task)
 
-                # Small delay to avoid rate limiting
-                if not self.dry_run:
-                    await asyncio.sleep(0.5)
-
         return results
 
     async def validate_scheduled_workouts(
         self, plan: TrainingPlan, results: List[ScheduleResult]
     ) -> List[ScheduleResult]:
         """Validate that all workouts were scheduled correctly."""
+        from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn
+
         self.console.print("\n[bold]Validating scheduled workouts...[/bold]\n")
 
         with Progress(
@@ -412,10 +462,6 @@ class GarminWorkoutScheduler:
 
                 progress.advance(task)
 
-                # Small delay to avoid rate limiting
-                if not self.dry_run:
-                    await asyncio.sleep(0.2)
-
         return results
 
     async def validate_session(self, session: TrainingSession) -> str:
@@ -478,6 +524,7 @@ def main(
     verbose: bool,
 ):
     """Schedule marathon training plan from markdown file to Garmin Connect."""
+    from rich.table import Table
 
     if verbose:
         logging.getLogger().setLevel(logging.DEBUG)
@@ -0,0 +1,70 @@
+"""Coalescing of concurrent identical requests into a single in-flight call."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Shares one in-flight call between concurrent callers using the same key.
+
+    The first caller for a key starts the call; callers arriving while it is
+    still running wait for the same result (or exception) instead of starting
+    their own. Once the call finishes the key is released, so later callers
+    start a fresh call. A caller being cancelled does not cancel the shared call.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.started = 0
+        self.shared = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``func`` unless a call for ``key`` is already in flight, then await its result.
+
+        Args:
+            key: Identity of the call
+            func: Coroutine function starting the call
+
+        Returns:
+            The result of the shared call.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            self.started += 1
+            task.add_done_callback(lambda done: self._release(key, done))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def forget(self, match: Callable[[Hashable], bool]) -> int:
+        """
+        Detach in-flight calls whose key matches, e.g. after a write made them stale.
+
+        Callers already waiting still get the detached call's result; later
+        callers start a fresh call.
+
+        Args:
+            match: Predicate selecting the keys to detach
+
+        Returns:
+            The number of calls detached.
+        """
+        stale = [key for key in self._calls if match(key)]
+        for key in stale:
+            del self._calls[key]
+        return len(stale)
+
+    def _release(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Retrieve the exception so it isn't reported as unhandled when
+            # every waiter was cancelled
+            task.exception()
@@ -0,0 +1,142 @@
+"""Training load trends (acute/chronic load, form) and weekly volume from daily activity totals.
+
+Acute (ATL) and chronic (CTL) training load are exponentially weighted
+averages of the daily training load with time constants of 7 and 42 days;
+form (TSB) is their difference, CTL - ATL. The averages are seeded from a
+warm-up period before the reported weeks, so the first reported week does
+not start from zero.
+"""
+
+from datetime import date, timedelta
+from typing import Iterable, List, Sequence, Tuple
+
+from .calendar_view import week_bounds
+
+ATL_DAYS = 7
+CTL_DAYS = 42
+
+# Days of history before the reported period used to seed the averages
+WARMUP_DAYS = 3 * CTL_DAYS
+
+WEEKLY_COLUMNS = [
+    "weekStart",
+    "activities",
+    "distanceKm",
+    "durationH",
+    "load",
+    "atl",
+    "ctl",
+    "tsb",
+]
+DAILY_COLUMNS = ["date", "load", "atl", "ctl", "tsb"]
+
+
+def report_period(end: date, weeks: int) -> Tuple[date, date]:
+    """
+    First and last day of the ``weeks`` Monday-based weeks ending with the week of ``end``.
+
+    The last day is ``end`` itself, so the current week may be partial.
+    """
+    first_monday = week_bounds(end, start=1)[0] - timedelta(weeks=weeks - 1)
+    return first_monday, end
+
+
+def exponential_average(values: Sequence[float], time_constant: float) -> List[float]:
+    """
+    Exponentially weighted moving average of a daily series, starting from zero.
+
+    Args:
+        values: One value per consecutive day
+        time_constant: Time constant in days (7 for ATL, 42 for CTL)
+
+    Returns:
+        The average on each day
+    """
+    averages = []
+    average = 0.0
+    for value in values:
+        average += (value - average) / time_constant
+        averages.append(average)
+    return averages
+
+
+def compute_training_load(
+    totals: Iterable[tuple], start: date, end: date, daily: bool = False
+) -> dict:
+    """
+    Builds the weekly (and optionally daily) training load tables.
+
+    Args:
+        totals: (day 'YYYY-MM-DD', distance m, duration s, load, activity count)
+            tuples, as returned by `ActivityStore.daily_totals`, covering
+            ``WARMUP_DAYS`` before ``start`` up to ``end``
+        start: First reported day, a Monday
+        end: Last reported day
+        daily: Also return the per-day table
+
+    Returns:
+        Tables as ``{"columns": [...], "rows": [[...], ...]}`` and the load
+        values on ``end``.
+    """
+    first = start - timedelta(days=WARMUP_DAYS)
+    size = (end - first).days + 1
+
+    # Dense per-day arrays indexed by days since `first`
+    distance = [0.0] * size
+    duration = [0.0] * size
+    load = [0.0] * size
+    count = [0] * size
+    for day, day_distance, day_duration, day_load, day_count in totals:
+        i = (date.fromisoformat(day) - first).days
+        if 0 <= i < size:
+            distance[i] += day_distance or 0.0
+            duration[i] += day_duration or 0.0
+            load[i] += day_load or 0.0
+            count[i] += day_count
+
+    atl = exponential_average(load, ATL_DAYS)
+    ctl = exponential_average(load, CTL_DAYS)
+
+    offset = WARMUP_DAYS
+    weekly_rows = []
+    for week_start in range(offset, size, 7):
+        week_end = min(week_start + 7, size)
+        last = week_end - 1
+        weekly_rows.append(
+            [
+                (first + timedelta(days=week_start)).isoformat(),
+                sum(count[week_start:week_end]),
+                round(sum(distance[week_start:week_end]) / 1000, 2),
+                round(sum(duration[week_start:week_end]) / 3600, 2),
+                round(sum(load[week_start:week_end]), 1),
+                round(atl[last], 1),
+                round(ctl[last], 1),
+                round(ctl[last] - atl[last], 1),
+            ]
+        )
+
+    result = {
+        "startDate": start.isoformat(),
+        "endDate": end.isoformat(),
+        "current": {
+            "atl": round(atl[-1], 1),
+            "ctl": round(ctl[-1], 1),
+            "tsb": round(ctl[-1] - atl[-1], 1),
+        },
+        "weekly": {"columns": WEEKLY_COLUMNS, "rows": weekly_rows},
+    }
+    if daily:
+        result["daily"] = {
+            "columns": DAILY_COLUMNS,
+            "rows": [
+                [
+                    (first + timedelta(days=i)).isoformat(),
+                    round(load[i], 1),
+                    round(atl[i], 1),
+                    round(ctl[i], 1),
+                    round(ctl[i] - atl[i], 1),
+                ]
+                for i in range(offset, size)
+            ],
+        }
+    return result
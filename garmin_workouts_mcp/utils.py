@@ -157,68 +157,95 @@ def parse_workout_description(
 
 def parse_workout_intelligently(description: str, session_name: str) -> WorkoutData:
     """Parse workout using intelligent logic to create properly structured steps."""
+    workout, _ = compile_workout_description(description, session_name)
+    return workout
+
+
+def compile_workout_description(
+    description: str, session_name: str
+) -> Tuple[WorkoutData, List[str]]:
+    """
+    Parse a workout description and report the parts that could not be parsed.
+
+    Args:
+        description: Workout description, e.g. "3km warmup, 4x(5min at 173-180bpm, 3min jog)"
+        session_name: Name of the session, used to name the workout
+
+    Returns:
+        The parsed workout and the parts of the description that were not
+        understood, including steps of repeats and repeats without parentheses
+        ("10x400m") compiled as a single step. If no segment was understood,
+        the workout is a single step guessed from the whole description.
+    """
     # Generate appropriate workout name based on session type
     workout_name = generate_workout_name(session_name)
 
     # Split description into logical parts
     steps = []
+    unparsed = []
 
     # Handle different description patterns
     if "," in description or " then " in description.lower():
-        # Split by commas and "then", but be smart about parentheses
-        parts = []
-        current_part = ""
-        paren_depth = 0
-        i = 0
-
-        while i < len(description):
-            char = description[i]
-
-            # Check for "then" separator
-            if (
-                paren_depth == 0
-                and i + 5 < len(description)
-                and description[i : i + 5].lower() == " then"
-            ):
-                if current_part.strip():
-                    parts.append(current_part.strip())
-                current_part = ""
-                i += 5  # Skip " then"
-                continue
-
-            if char == "(":
-                paren_depth += 1
-            elif char == ")":
-                paren_depth -= 1
-            elif char == "," and paren_depth == 0:
-                if current_part.strip():
-                    parts.append(current_part.strip())
-                current_part = ""
-                i += 1
-                continue
-
-            current_part += char
-            i += 1
-
-        if current_part.strip():
-            parts.append(current_part.strip())
-
-        # Process each part
-        for part in parts:
-            parsed_steps = process_workout_segment(part)
-            if parsed_steps:
-                steps.extend(parsed_steps)
+        parts = split_workout_description(description)
     else:
         # Single segment workout
-        parsed_steps = process_workout_segment(description)
+        parts = [description.strip()]
+
+    # Process each part
+    for part in parts:
+        parsed_steps = process_workout_segment(part, unparsed)
         if parsed_steps:
             steps.extend(parsed_steps)
+        else:
+            unparsed.append(part)
 
     # If no steps parsed, create a simple workout
     if not steps:
         steps = [create_simple_step(description, session_name)]
 
-    return WorkoutData(name=workout_name, type="running", steps=steps)
+    return WorkoutData(name=workout_name, type="running", steps=steps), unparsed
+
+
+def split_workout_description(description: str) -> List[str]:
+    """Split a description on commas and "then", leaving parenthesized repeats whole."""
+    parts = []
+    current_part = ""
+    paren_depth = 0
+    i = 0
+
+    while i < len(description):
+        char = description[i]
+
+        # Check for "then" separator
+        if (
+            paren_depth == 0
+            and i + 5 < len(description)
+            and description[i : i + 5].lower() == " then"
+        ):
+            if current_part.strip():
+                parts.append(current_part.strip())
+            current_part = ""
+            i += 5  # Skip " then"
+            continue
+
+        if char == "(":
+            paren_depth += 1
+        elif char == ")":
+            paren_depth -= 1
+        elif char == "," and paren_depth == 0:
+            if current_part.strip():
+                parts.append(current_part.strip())
+            current_part = ""
+            i += 1
+            continue
+
+        current_part += char
+        i += 1
+
+    if current_part.strip():
+        parts.append(current_part.strip())
+
+    return parts
 
 
 def generate_workout_name(session_name: str) -> str:
@@ -270,9 +297,19 @@ def generate_workout_name(session_name: str) -> str:
     return session_name
 
 
-def process_workout_segment(segment: str) -> List[WorkoutStep]:
-    """Process a single workout segment and return list of steps."""
+def process_workout_segment(
+    segment: str, unparsed: Optional[List[str]] = None
+) -> List[WorkoutStep]:
+    """
+    Process a single workout segment and return list of steps.
+
+    Args:
+        segment: One segment of a workout description
+        unparsed: If given, parts of the segment that were dropped or not fully
+            understood are appended to it
+    """
     steps = []
+    dropped = []
 
     # Check for repeat pattern (e.g., "4x(4min at 172-177bpm, 3min recovery)")
     repeat_match = re.match(r"(\d+)[xX]\s*\(([^)]+)\)", segment)
@@ -287,6 +324,8 @@ def process_workout_segment(segment: str) -> List[WorkoutStep]:
             step = create_step_from_text(part.strip())
             if step:
                 repeat_steps.append(step)
+            elif part.strip():
+                dropped.append(part.strip())
 
         if repeat_steps:
             repeat_step = WorkoutStep(
@@ -303,7 +342,12 @@ def process_workout_segment(segment: str) -> List[WorkoutStep]:
         step = create_step_from_text(segment)
         if step:
             steps.append(step)
+            # A repeat without parentheses ("10x400m") becomes a single step
+            if re.match(r"\d+\s*[xX×]\s*\d", segment):
+                dropped.append(segment)
 
+    if steps and unparsed is not None:
+        unparsed.extend(dropped)
     return steps
 
 
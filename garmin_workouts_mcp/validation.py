@@ -0,0 +1,161 @@
+"""Validation of workout JSON sent by MCP clients before it is converted to a Garmin payload.
+
+``make_payload`` stops at the first problem it meets. The validator checks the
+whole workout in one pass with pydantic ``TypeAdapter``s built once for
+``models.WorkoutData`` and ``models.WorkoutStep`` and reports every error with
+its JSON path, so a client can fix all of them in one retry.
+
+Steps are validated one at a time while walking the repeat groups with an
+explicit stack, like ``make_payload`` builds them, so deeply nested workouts
+are not limited by pydantic's recursion limit.
+"""
+
+from typing import Any, List, Optional, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+
+from .models import WorkoutData, WorkoutStep
+
+WORKOUT_ADAPTER = TypeAdapter(WorkoutData)
+STEP_ADAPTER = TypeAdapter(WorkoutStep)
+PLACEHOLDER_STEP = WorkoutStep(stepType="interval", stepDuration=1)
+
+
+class WorkoutValidationError(ValueError):
+    """Raised when workout data cannot be converted; ``errors`` lists every problem."""
+
+    def __init__(self, errors: List[dict]):
+        super().__init__("; ".join(f"{e['path']}: {e['message']}" for e in errors))
+        self.errors = errors
+
+
+def json_path(loc: Tuple[Any, ...], root: str = "$") -> str:
+    """Render a pydantic error location such as ``('steps', 1, 'stepDuration')`` as ``$.steps[1].stepDuration``."""
+    path = root
+    for part in loc:
+        path += f"[{part}]" if isinstance(part, int) else f".{part}"
+    return path
+
+
+def workout_errors(workout_data: Any) -> List[dict]:
+    """
+    Check workout data as accepted by `upload_workout`.
+
+    Args:
+        workout_data: Workout JSON, as a dict
+
+    Returns:
+        One ``{"path": ..., "message": ...}`` entry per problem, empty if the
+        workout is valid.
+    """
+    return _check(workout_data)[1]
+
+
+def validate_workout(workout_data: Any) -> dict:
+    """
+    Validate workout data and normalize it for `make_payload`.
+
+    Values are coerced to their declared types (e.g. ``"600"`` to ``600``) and
+    unset fields are dropped.
+
+    Args:
+        workout_data: Workout JSON, as a dict
+
+    Returns:
+        The normalized workout data
+
+    Raises:
+        WorkoutValidationError: Listing every problem found, with JSON paths
+    """
+    normalized, errors = _check(workout_data)
+    if errors:
+        raise WorkoutValidationError(errors)
+    return normalized
+
+
+class _Node:
+    """The workout or one of its steps, with its validated children."""
+
+    __slots__ = ("children", "data", "errors", "instances", "loc", "next", "normalized")
+
+    def __init__(self, data: Any, loc: Tuple[Any, ...]):
+        self.data = data
+        self.loc = loc
+        steps = data.get("steps") if isinstance(data, dict) else None
+        self.children = steps if isinstance(steps, list) else None
+        self.next = 0
+        self.instances = []
+        self.normalized = []
+        self.errors = []
+
+
+def _check(workout_data: Any) -> Tuple[Optional[dict], List[dict]]:
+    """
+    Validates the workout and its steps bottom-up, without recursion.
+
+    Each step is validated on its own, with its ``steps`` replaced by the
+    already validated child steps: pydantic only re-runs their step check,
+    without descending into them again.
+
+    Returns:
+        The normalized workout data (None if invalid) and the errors, in
+        document order
+    """
+    root = _Node(workout_data, ())
+    stack = [root]
+    # Nodes in document order, to report errors in that order
+    nodes = [root]
+    normalized = None
+    while stack:
+        node = stack[-1]
+        if node.children is not None and node.next < len(node.children):
+            child = _Node(node.children[node.next], node.loc + ("steps", node.next))
+            node.next += 1
+            stack.append(child)
+            nodes.append(child)
+            continue
+
+        stack.pop()
+        adapter = STEP_ADAPTER if stack else WORKOUT_ADAPTER
+        data = node.data
+        if node.children is not None:
+            data = {**data, "steps": node.instances}
+        try:
+            instance = adapter.validate_python(data)
+        except ValidationError as e:
+            node.errors = _errors(e, node.loc)
+            # A valid step stands in for the invalid one in its repeat group,
+            # so the group itself is still checked
+            instance, dumped = PLACEHOLDER_STEP, None
+        else:
+            dumped = instance.model_dump(exclude_none=True, exclude={"steps"})
+            if node.children is not None:
+                dumped["steps"] = node.normalized
+
+        if stack:
+            stack[-1].instances.append(instance)
+            stack[-1].normalized.append(dumped)
+        else:
+            normalized = dumped
+
+    errors = [error for node in nodes for error in node.errors]
+    return (None if errors else normalized), errors
+
+
+def _errors(error: ValidationError, loc: Tuple[Any, ...] = ()) -> List[dict]:
+    errors = []
+    for item in error.errors(include_url=False, include_input=False):
+        item_loc = loc + tuple(item["loc"])
+        issues = (item.get("ctx") or {}).get("issues")
+        if issues:
+            # A step-level check: one entry per offending field of the step
+            for issue in issues:
+                errors.append(
+                    {
+                        "path": json_path(item_loc + tuple(issue["field"].split("."))),
+                        "message": issue["message"],
+                    }
+                )
+        else:
+            errors.append({"path": json_path(item_loc), "message": item["msg"]})
+    return errors
@@ -0,0 +1,127 @@
+"""Local index of uploaded workouts keyed by a hash of their Garmin payload.
+
+Uploading the same workout twice (an agent retrying a call, a training plan
+being scheduled again) would otherwise create a duplicate in the Garmin
+workout library. Before uploading, the payload built by ``make_payload`` is
+hashed; if an identical payload was uploaded before, its workout ID is reused
+instead of POSTing again.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from .activity_store import data_home
+from .athletes import athlete_dir, current_athlete
+
+WORKOUT_INDEX_FILE = "workouts.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploaded_workouts (
+    payload_hash TEXT PRIMARY KEY,
+    workout_id TEXT NOT NULL,
+    uploaded_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_uploaded_workouts_id ON uploaded_workouts (workout_id);
+"""
+
+
+def payload_hash(payload: dict) -> str:
+    """
+    Content hash of a workout payload.
+
+    The payload is serialized canonically (sorted keys, no whitespace), so
+    equal payloads hash the same whatever their key order.
+
+    Args:
+        payload: Workout payload as built by `make_payload`
+
+    Returns:
+        The hex SHA-256 digest
+    """
+    canonical = json.dumps(
+        payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class WorkoutIndex:
+    """SQLite-backed map from payload hash to the ID of the workout uploaded with it."""
+
+    def __init__(self, path: str):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def count(self) -> int:
+        """Number of indexed workouts."""
+        return self._conn.execute("SELECT COUNT(*) FROM uploaded_workouts").fetchone()[
+            0
+        ]
+
+    def get(self, digest: str) -> Optional[str]:
+        """Workout ID uploaded with the payload of the given hash, if any."""
+        row = self._conn.execute(
+            "SELECT workout_id FROM uploaded_workouts WHERE payload_hash = ?", (digest,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def put(self, digest: str, workout_id: str) -> None:
+        """Record that the payload of the given hash was uploaded as ``workout_id``."""
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO uploaded_workouts VALUES (?, ?, ?)",
+                (digest, str(workout_id), datetime.now(timezone.utc).isoformat()),
+            )
+
+    def discard(self, workout_id: str) -> int:
+        """
+        Forgets a workout, e.g. after it was deleted from Garmin Connect.
+
+        Args:
+            workout_id: ID of the workout
+
+        Returns:
+            The number of entries removed
+        """
+        with self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM uploaded_workouts WHERE workout_id = ?", (str(workout_id),)
+            )
+        return cursor.rowcount
+
+
+_index: Optional[WorkoutIndex] = None
+_athlete_indexes: Dict[str, WorkoutIndex] = {}
+
+
+def get_workout_index(athlete: Optional[str] = None) -> WorkoutIndex:
+    """
+    Return an athlete's workout index, opening it on first use.
+
+    Args:
+        athlete: Athlete identifier. Defaults to the athlete of the current tool
+            call, or the server's default account if there is none.
+    """
+    global _index
+    if athlete is None:
+        athlete = current_athlete.get()
+    if athlete is None:
+        if _index is None:
+            _index = WorkoutIndex(os.path.join(data_home(), WORKOUT_INDEX_FILE))
+        return _index
+
+    index = _athlete_indexes.get(athlete)
+    if index is None:
+        path = os.path.join(athlete_dir(data_home(), athlete), WORKOUT_INDEX_FILE)
+        index = _athlete_indexes[athlete] = WorkoutIndex(path)
+    return index
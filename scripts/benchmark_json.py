@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Compare JSON encode/decode time of the standard library and ``fastjson``.
+
+Runs on recorded Garmin responses given as JSON files, e.g. saved from
+``list_activities`` or ``get_calendar``:
+
+    python scripts/benchmark_json.py activities.json calendar.json
+
+Without files, it uses synthetic documents shaped like a 100-item activity
+page and a month calendar. Every available backend is measured: the stdlib,
+pydantic-core and, if installed, orjson.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pydantic_core
+
+from garmin_workouts_mcp import fastjson
+
+
+def synthetic_activity_page(count: int = 100) -> list:
+    """Activity summaries with roughly the size and shape of the list endpoint's."""
+    rng = random.Random(0)
+    return [
+        {
+            "activityId": 19000000000 + i,
+            "activityName": f"Zürich Running {i}",
+            "activityType": {"typeId": 1, "typeKey": "running", "parentTypeId": 17},
+            "startTimeLocal": "2025-06-01 07:00:00",
+            "startTimeGMT": "2025-06-01 05:00:00",
+            **{f"metric{k}": rng.random() * 1000 for k in range(60)},
+            "splitSummaries": [
+                {"splitType": "RWD_RUN", "distance": 1000.0, "duration": 300.0 + j}
+                for j in range(10)
+            ],
+            "hrTimeInZone": [rng.random() * 600 for _ in range(5)],
+        }
+        for i in range(count)
+    ]
+
+
+def synthetic_calendar_month() -> dict:
+    """A month calendar with a few items per day."""
+    return {
+        "startDayOfMonth": 0,
+        "numOfDaysInMonth": 30,
+        "calendarItems": [
+            {
+                "id": day * 10 + n,
+                "itemType": ["workout", "activity", "event"][n],
+                "title": f"Session {day}-{n}",
+                "date": f"2025-06-{day:02d}",
+                "duration": 3600.0,
+                "distance": 10000.0,
+                "workoutId": 900000000 + day,
+                "activityTypeKey": "running",
+            }
+            for day in range(1, 31)
+            for n in range(3)
+        ],
+    }
+
+
+def backends() -> dict:
+    """Encoders and decoders to compare, keyed by name."""
+    result = {
+        "stdlib": (lambda obj: json.dumps(obj).encode(), json.loads),
+        "pydantic-core": (
+            lambda obj: pydantic_core.to_json(obj, fallback=str),
+            pydantic_core.from_json,
+        ),
+    }
+    if fastjson.orjson is not None:
+        result["orjson"] = (fastjson.dumps, fastjson.loads)
+    return result
+
+
+def bench(func, number: int) -> float:
+    """Mean milliseconds per call."""
+    return timeit.timeit(func, number=number) / number * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", help="Recorded JSON responses")
+    parser.add_argument(
+        "--number", type=int, default=50, help="Iterations per measurement"
+    )
+    args = parser.parse_args()
+
+    if args.files:
+        documents = {}
+        for path in args.files:
+            with open(path, "rb") as f:
+                documents[os.path.basename(path)] = json.load(f)
+    else:
+        documents = {
+            "activity page (100)": synthetic_activity_page(),
+            "calendar month": synthetic_calendar_month(),
+        }
+
+    print(f"fastjson backend: {fastjson.BACKEND}")
+    for name, doc in documents.items():
+        raw = json.dumps(doc).encode()
+        print(f"\n{name}: {len(raw) / 1024:.0f} KiB")
+        baseline = None
+        for backend, (encode, decode) in backends().items():
+            encode_ms = bench(lambda encode=encode, doc=doc: encode(doc), args.number)
+            decode_ms = bench(lambda decode=decode, raw=raw: decode(raw), args.number)
+            if baseline is None:
+                baseline = encode_ms + decode_ms
+            speedup = baseline / (encode_ms + decode_ms)
+            print(
+                f"  {backend:<14} encode {encode_ms:7.3f} ms  decode {decode_ms:7.3f} ms"
+                f"  ({speedup:.1f}x)"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Measure ``make_payload`` cost per step on workouts with deeply nested repeat groups.
+
+Each synthetic workout nests repeat groups ``depth`` levels deep, every level
+holding one recovery step and the next level's repeat group, so the number of
+steps grows linearly with the depth. With the explicit-stack traversal the
+cost per step should stay flat from 1 to 1000 levels; a recursive builder
+would slow down with depth and fail near Python's recursion limit.
+
+Usage:
+    python scripts/benchmark_nesting.py [--depths 1 10 100 1000] [--number 20]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from garmin_workouts_mcp.garmin_workout import (
+    calculate_estimated_duration,
+    make_payload,
+)
+
+
+def nested_workout(depth: int) -> dict:
+    """A running workout with repeat groups nested ``depth`` levels deep."""
+    steps = [
+        {
+            "stepType": "interval",
+            "endConditionType": "distance",
+            "stepDistance": 400,
+            "distanceUnit": "m",
+            "target": {"type": "pace", "value": 4.0, "unit": "min_per_km"},
+        }
+    ]
+    for _ in range(depth):
+        steps = [
+            {"stepType": "recovery", "stepDuration": 60},
+            {"stepType": "repeat", "numberOfIterations": 1, "steps": steps},
+        ]
+    return {"name": f"Nested {depth}", "type": "running", "steps": steps}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument(
+        "--number", type=int, default=20, help="Iterations per measurement"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'depth':>6} {'steps':>6} {'make_payload':>14} {'per step':>10} {'estimate':>10}"
+    )
+    for depth in args.depths:
+        workout = nested_workout(depth)
+        payload = make_payload(workout)
+        segments = payload["workoutSegments"]
+        step_count = 2 * depth + 1
+
+        build_ms = min(
+            timeit.repeat(
+                lambda workout=workout: make_payload(workout),
+                number=args.number,
+                repeat=3,
+            )
+        )
+        build_ms = build_ms / args.number * 1000
+        estimate_ms = min(
+            timeit.repeat(
+                lambda segments=segments: calculate_estimated_duration(segments),
+                number=args.number,
+                repeat=3,
+            )
+        )
+        estimate_ms = estimate_ms / args.number * 1000
+        print(
+            f"{depth:>6} {step_count:>6} {build_ms:>11.3f} ms {build_ms / step_count * 1000:>7.2f} us"
+            f" {estimate_ms:>7.3f} ms"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Measure cold-start time of the console entry points and fail on regressions.
+
+Every measurement runs in a fresh interpreter, the way MCP clients spawn the
+server for each session:
+
+- import time of ``garmin_workouts_mcp.main`` (MCP server)
+- import time of ``garmin_workouts_mcp.schedule_training_plan`` (plan CLI)
+- time to first tool response: interpreter start to the result of an
+  in-memory ``generate_workout_data_prompt`` call (no network, no login)
+
+The median of ``--runs`` runs is compared against a budget in milliseconds;
+the script exits with status 1 if any budget is exceeded.
+
+Usage:
+    python scripts/benchmark_startup.py [--runs 5] [--max-server-import-ms 1500] ...
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = """
+import json, time
+started = time.perf_counter()
+import {module}
+print(json.dumps({{"ms": (time.perf_counter() - started) * 1000}}))
+"""
+
+FIRST_TOOL_SNIPPET = """
+import asyncio, json, time
+started = time.perf_counter()
+from fastmcp import Client
+from garmin_workouts_mcp.main import mcp
+
+async def first_call():
+    async with Client(mcp) as client:
+        await client.call_tool("generate_workout_data_prompt", {"description": "easy 5k"})
+
+asyncio.run(first_call())
+print(json.dumps({"ms": (time.perf_counter() - started) * 1000}))
+"""
+
+# Default budgets in milliseconds; generous enough for a laptop, tight enough
+# to catch a heavy dependency slipping back into the import path
+DEFAULT_BUDGETS = {
+    "server_import": 1500,
+    "cli_import": 1000,
+    "first_tool_response": 2500,
+}
+
+
+def run_snippet(code: str) -> float:
+    """Run ``code`` in a fresh interpreter and return the milliseconds it reports."""
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])["ms"]
+
+
+def measure(code: str, runs: int) -> float:
+    """Median of ``runs`` fresh-interpreter measurements, after one warm-up run."""
+    run_snippet(code)  # populate the bytecode cache
+    return statistics.median(run_snippet(code) for _ in range(runs))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Runs per measurement")
+    for name, budget in DEFAULT_BUDGETS.items():
+        parser.add_argument(
+            f"--max-{name.replace('_', '-')}-ms",
+            type=float,
+            default=budget,
+            dest=name,
+            help=f"Budget for {name.replace('_', ' ')} (default: {budget})",
+        )
+    args = parser.parse_args()
+
+    benchmarks = {
+        "server_import": IMPORT_SNIPPET.format(module="garmin_workouts_mcp.main"),
+        "cli_import": IMPORT_SNIPPET.format(
+            module="garmin_workouts_mcp.schedule_training_plan"
+        ),
+        "first_tool_response": FIRST_TOOL_SNIPPET,
+    }
+
+    failed = False
+    for name, code in benchmarks.items():
+        elapsed = measure(code, args.runs)
+        budget = getattr(args, name)
+        status = "ok" if elapsed <= budget else "OVER BUDGET"
+        failed = failed or elapsed > budget
+        print(f"{name:<22} {elapsed:8.1f} ms  (budget {budget:.0f} ms)  {status}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
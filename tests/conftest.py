@@ -0,0 +1,35 @@
+import pytest
+
+import garmin_workouts_mcp.activity_store as activity_store_module
+import garmin_workouts_mcp.client as client_module
+import garmin_workouts_mcp.metrics as metrics_module
+import garmin_workouts_mcp.ratelimit as ratelimit_module
+import garmin_workouts_mcp.workout_index as workout_index_module
+
+
+@pytest.fixture(autouse=True)
+def fresh_garmin_client(monkeypatch):
+    """Give every test its own shared client so cached responses don't leak."""
+    monkeypatch.setattr(client_module, "_client", None)
+    monkeypatch.setattr(client_module, "_athlete_clients", {})
+    monkeypatch.setattr(ratelimit_module, "_limiter", None)
+    monkeypatch.setattr(metrics_module, "_metrics", None)
+
+
+@pytest.fixture(autouse=True)
+def isolated_data_home(monkeypatch, tmp_path):
+    """Keep local data files (activity and workout indexes, ...) in a per-test directory."""
+    monkeypatch.setenv(activity_store_module.DATA_HOME_ENV, str(tmp_path))
+    monkeypatch.setattr(activity_store_module, "_store", None)
+    monkeypatch.setattr(activity_store_module, "_athlete_stores", {})
+    monkeypatch.setattr(workout_index_module, "_index", None)
+    monkeypatch.setattr(workout_index_module, "_athlete_indexes", {})
+    yield
+    if activity_store_module._store is not None:
+        activity_store_module._store.close()
+    for store in activity_store_module._athlete_stores.values():
+        store.close()
+    if workout_index_module._index is not None:
+        workout_index_module._index.close()
+    for index in workout_index_module._athlete_indexes.values():
+        index.close()
@@ -0,0 +1,105 @@
+from datetime import date
+
+import pytest
+
+from garmin_workouts_mcp.activity_store import (
+    RESUME_BEFORE,
+    SYNCED_THROUGH,
+    ActivityStore,
+)
+
+
+def activity(activity_id, start, type_key="running", distance=10000.0, name="Run"):
+    return {
+        "activityId": activity_id,
+        "activityName": name,
+        "activityType": {"typeKey": type_key},
+        "startTimeLocal": start,
+        "startTimeGMT": start,
+        "distance": distance,
+        "duration": distance / 3,
+    }
+
+
+@pytest.fixture
+def store():
+    store = ActivityStore(":memory:")
+    store.upsert(
+        [
+            activity(1, "2025-05-31 07:00:00", distance=5000.0, name="Easy Run"),
+            activity(
+                2, "2025-06-01 07:00:00", distance=21100.0, name="Half 100% effort"
+            ),
+            activity(
+                3,
+                "2025-06-15 18:00:00",
+                type_key="cycling",
+                distance=40000.0,
+                name="Ride",
+            ),
+            activity(4, "2025-06-30 23:30:00", distance=8000.0, name="Evening run"),
+        ]
+    )
+    yield store
+    store.close()
+
+
+def test_query_date_range_inclusive(store):
+    result = store.query(start_date=date(2025, 6, 1), end_date=date(2025, 6, 30))
+    assert [a["activityId"] for a in result] == [4, 3, 2]
+
+
+def test_query_type_and_distance(store):
+    result = store.query(type_key="running", min_distance=6000)
+    assert [a["activityId"] for a in result] == [4, 2]
+    assert [a["activityId"] for a in store.query(max_distance=5000)] == [1]
+
+
+def test_query_name_case_insensitive_and_escaped(store):
+    assert [a["activityId"] for a in store.query(name="RUN")] == [4, 1]
+    assert [a["activityId"] for a in store.query(name="100%")] == [2]
+    assert store.query(name="_") == []
+
+
+def test_query_limit_returns_most_recent(store):
+    assert [a["activityId"] for a in store.query(limit=2)] == [4, 3]
+
+
+def test_known_ids_and_latest(store):
+    assert store.known_ids([1, 4, 99]) == {1, 4}
+    assert store.known_ids([]) == set()
+    assert store.latest_start_time() == "2025-06-30 23:30:00"
+
+
+def test_upsert_replaces_and_retain_deletes(store):
+    store.upsert([activity(1, "2025-05-31 07:00:00", name="Renamed")])
+    assert store.count() == 4
+    assert store.query(name="Renamed")[0]["activityId"] == 1
+
+    assert store.retain([1, 2]) == 2
+    assert store.count() == 2
+
+
+def test_sync_marks_written_with_activities(store):
+    assert store.sync_mark(SYNCED_THROUGH) is None
+
+    store.upsert(
+        [activity(5, "2025-07-01 07:00:00")],
+        marks={RESUME_BEFORE: "2025-07-01 07:00:00"},
+    )
+    assert store.sync_mark(RESUME_BEFORE) == "2025-07-01 07:00:00"
+
+    store.set_sync_marks({SYNCED_THROUGH: "2025-07-01 07:00:00", RESUME_BEFORE: None})
+    assert store.sync_mark(SYNCED_THROUGH) == "2025-07-01 07:00:00"
+    assert store.sync_mark(RESUME_BEFORE) is None
+
+
+def test_store_persists_to_file(tmp_path):
+    path = str(tmp_path / "nested" / "activities.sqlite3")
+    store = ActivityStore(path)
+    store.upsert([activity(1, "2025-06-01 07:00:00")])
+    store.close()
+
+    reopened = ActivityStore(path)
+    assert reopened.count() == 1
+    reopened.close()
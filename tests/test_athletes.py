@@ -0,0 +1,59 @@
+import pytest
+
+from garmin_workouts_mcp.athletes import (
+    athlete_dir,
+    athlete_scoped,
+    current_athlete,
+    use_athlete,
+    validate_athlete,
+)
+
+
+@pytest.mark.parametrize("athlete", ["jane", "jane.doe@example.com", "A-1_b"])
+def test_valid_athletes(athlete):
+    assert validate_athlete(athlete) == athlete
+
+
+@pytest.mark.parametrize("athlete", ["", "../jane", ".hidden", "a/b", "x" * 65, 42])
+def test_invalid_athletes_rejected(athlete):
+    with pytest.raises(ValueError, match="Invalid athlete"):
+        validate_athlete(athlete)
+
+
+def test_athlete_dir():
+    assert athlete_dir("/data", "jane") == "/data/athletes/jane"
+
+
+def test_use_athlete_restores_previous():
+    with use_athlete("jane"):
+        with use_athlete("joe"):
+            assert current_athlete.get() == "joe"
+        assert current_athlete.get() == "jane"
+    assert current_athlete.get() is None
+
+
+@pytest.mark.asyncio
+async def test_athlete_scoped():
+    @athlete_scoped
+    async def tool(workout_id: str, athlete: str = None):
+        return workout_id, current_athlete.get()
+
+    @athlete_scoped
+    def sync_tool(athlete: str = None):
+        return current_athlete.get()
+
+    assert await tool("1", athlete="jane") == ("1", "jane")
+    assert await tool("1", "joe") == ("1", "joe")
+    assert await tool("1") == ("1", None)
+    assert sync_tool(athlete="jane") == "jane"
+    assert current_athlete.get() is None
+    with pytest.raises(ValueError):
+        sync_tool(athlete="../etc")
+
+
+def test_athlete_scoped_requires_parameter():
+    with pytest.raises(TypeError):
+
+        @athlete_scoped
+        def tool():
+            pass
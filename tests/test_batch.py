@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from garmin_workouts_mcp.batch import map_bounded
+
+
+@pytest.mark.asyncio
+async def test_map_bounded_keeps_order_and_errors():
+    async def func(item):
+        await asyncio.sleep(0.01 * (5 - item))
+        if item == 2:
+            raise ValueError("bad item")
+        return item * 10
+
+    results = await map_bounded(func, range(5), concurrency=2)
+
+    assert [result for result, _ in results] == [0, 10, None, 30, 40]
+    assert isinstance(results[2][1], ValueError)
+    assert all(error is None for i, (_, error) in enumerate(results) if i != 2)
+
+
+@pytest.mark.asyncio
+async def test_map_bounded_limits_concurrency():
+    running = 0
+    peak = 0
+
+    async def func(item):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    await map_bounded(func, range(10), concurrency=3)
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_map_bounded_invalid_concurrency():
+    with pytest.raises(ValueError, match="concurrency must be positive"):
+        await map_bounded(lambda item: item, [1], concurrency=0)
@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+from garmin_workouts_mcp.cache import ResponseCache, make_cache_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_make_cache_key_sorts_params():
+    assert make_cache_key("/a", {"b": 1, "a": 2}) == make_cache_key(
+        "/a", {"a": 2, "b": 1}
+    )
+    assert make_cache_key("/a") == ("/a",)
+
+
+def test_get_counts_hits_and_misses():
+    cache = ResponseCache()
+    assert cache.get(("/a",)) is None
+    cache.set(("/a",), {"x": 1}, ttl=10)
+    assert cache.get(("/a",)) == {"x": 1}
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hitRate"] == 0.5
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = ResponseCache(clock=clock)
+    cache.set(("/a",), "value", ttl=5)
+
+    clock.now = 4.9
+    assert cache.get(("/a",)) == "value"
+    clock.now = 5.0
+    assert cache.get(("/a",)) is None
+    assert len(cache) == 0
+
+
+def test_lru_eviction():
+    cache = ResponseCache(max_entries=2)
+    cache.set(("/a",), 1, ttl=10)
+    cache.set(("/b",), 2, ttl=10)
+    cache.get(("/a",))  # /b is now least recently used
+    cache.set(("/c",), 3, ttl=10)
+
+    assert cache.get(("/b",)) is None
+    assert cache.get(("/a",)) == 1
+    assert cache.get(("/c",)) == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate_drops_all_params_for_path():
+    cache = ResponseCache()
+    cache.set(make_cache_key("/a", {"page": 1}), 1, ttl=10)
+    cache.set(make_cache_key("/a", {"page": 2}), 2, ttl=10)
+    cache.set(make_cache_key("/b"), 3, ttl=10)
+
+    assert cache.invalidate("/a") == 2
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_caches_none_and_loads_once():
+    cache = ResponseCache()
+    calls = []
+
+    async def loader():
+        calls.append(1)
+
+    assert await cache.get_or_load(("/a",), 10, loader) is None
+    assert await cache.get_or_load(("/a",), 10, loader) is None
+    assert len(calls) == 1
+
+
+def test_invalidate_prefix():
+    cache = ResponseCache()
+    cache.set(make_cache_key("/calendar-service/year/2025/month/5"), 1, ttl=10)
+    cache.set(make_cache_key("/calendar-service/year/2025/month/6"), 2, ttl=10)
+    cache.set(make_cache_key("/workout-service/workouts"), 3, ttl=10)
+
+    assert cache.invalidate_prefix("/calendar-service/") == 2
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_load_invalidated_while_running_not_cached():
+    cache = ResponseCache()
+    released = asyncio.Event()
+
+    async def slow_loader():
+        await released.wait()
+        return "before write"
+
+    async def loader():
+        return "after write"
+
+    key = make_cache_key("/a", {"page": 1})
+    load = asyncio.ensure_future(cache.get_or_load(key, 10, slow_loader))
+    await asyncio.sleep(0)
+    cache.invalidate("/a")
+    released.set()
+
+    assert await load == "before write"
+    assert await cache.get_or_load(key, 10, loader) == "after write"
+
+
+@pytest.mark.asyncio
+async def test_load_invalidated_by_prefix_not_cached():
+    cache = ResponseCache()
+    released = asyncio.Event()
+
+    async def slow_loader():
+        await released.wait()
+        return "before write"
+
+    load = asyncio.ensure_future(
+        cache.get_or_load(("/calendar/2025/5",), 10, slow_loader)
+    )
+    await asyncio.sleep(0)
+    cache.invalidate_prefix("/calendar/")
+    released.set()
+    await load
+
+    assert len(cache) == 0
@@ -0,0 +1,34 @@
+from datetime import date
+
+from garmin_workouts_mcp.calendar_view import months_in_range, slice_week, week_bounds
+
+
+def test_week_bounds_monday_start():
+    # 2025-06-10 is a Tuesday
+    assert week_bounds(date(2025, 6, 10), 1) == (date(2025, 6, 9), date(2025, 6, 15))
+
+
+def test_week_bounds_sunday_start():
+    assert week_bounds(date(2025, 6, 10), 0) == (date(2025, 6, 8), date(2025, 6, 14))
+
+
+def test_week_bounds_day_is_start():
+    assert week_bounds(date(2025, 6, 10), 2) == (date(2025, 6, 10), date(2025, 6, 16))
+
+
+def test_months_in_range_across_year_end():
+    assert months_in_range(date(2025, 12, 29), date(2026, 1, 4)) == [
+        (2025, 12),
+        (2026, 1),
+    ]
+    assert months_in_range(date(2025, 6, 9), date(2025, 6, 15)) == [(2025, 6)]
+
+
+def test_slice_week_deduplicates_overflow_days():
+    item = {"id": 1, "itemType": "workout", "date": "2025-07-01"}
+    week = slice_week(
+        [{"calendarItems": [item]}, {"calendarItems": [dict(item)]}, None],
+        date(2025, 6, 30),
+        date(2025, 7, 6),
+    )
+    assert week["calendarItems"] == [item]
@@ -0,0 +1,419 @@
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+import garmin_workouts_mcp.client as client_module
+from garmin_workouts_mcp.client import GarminAPIError, GarminClient, get_client
+from garmin_workouts_mcp.metrics import get_metrics
+from garmin_workouts_mcp.ratelimit import AdaptiveRateLimiter
+from garmin_workouts_mcp.retry import RetryPolicy
+
+
+async def no_sleep(delay):
+    pass
+
+
+class FakeToken:
+    """Stand-in for garth's OAuth2Token."""
+
+    def __init__(self, value: str = "token", expires_at: float = None):
+        self.value = value
+        self.expires_at = expires_at if expires_at is not None else time.time() + 3600
+
+    @property
+    def expired(self):
+        return self.expires_at < time.time()
+
+    def __str__(self):
+        return f"Bearer {self.value}"
+
+
+def make_garth_client(token=None):
+    garth_client = MagicMock()
+    garth_client.domain = "garmin.com"
+    garth_client.oauth2_token = token if token is not None else FakeToken()
+    return garth_client
+
+
+class TestGarminClient:
+    """Test cases for the async Garmin client."""
+
+    @pytest.mark.asyncio
+    async def test_connectapi_sends_auth_and_decodes_json(self):
+        """Test that requests carry the garth token and JSON is decoded."""
+        seen = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen["url"] = str(request.url)
+            seen["auth"] = request.headers["Authorization"]
+            return httpx.Response(200, json={"workoutId": 1})
+
+        client = GarminClient(
+            make_garth_client(), transport=httpx.MockTransport(handler)
+        )
+        result = await client.connectapi(
+            "/workout-service/workouts", params={"limit": 5}
+        )
+        await client.aclose()
+
+        assert result == {"workoutId": 1}
+        assert (
+            seen["url"]
+            == "https://connectapi.garmin.com/workout-service/workouts?limit=5"
+        )
+        assert seen["auth"] == "Bearer token"
+
+    @pytest.mark.asyncio
+    async def test_json_body_encoded(self):
+        """Test that a json= body is sent compactly encoded with a JSON content type."""
+        seen = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen["body"] = request.content
+            seen["content_type"] = request.headers["Content-Type"]
+            return httpx.Response(200, json={"workoutId": 1})
+
+        client = GarminClient(
+            make_garth_client(), transport=httpx.MockTransport(handler)
+        )
+        await client.connectapi(
+            "/workout-service/workout",
+            method="POST",
+            json={"workoutName": "Tempo", "steps": []},
+        )
+        await client.aclose()
+
+        assert seen["body"] == b'{"workoutName":"Tempo","steps":[]}'
+        assert seen["content_type"] == "application/json"
+
+    @pytest.mark.asyncio
+    async def test_connectapi_no_content_returns_none(self):
+        """Test that a 204 response returns None."""
+        client = GarminClient(
+            make_garth_client(),
+            transport=httpx.MockTransport(lambda request: httpx.Response(204)),
+        )
+        assert await client.connectapi("/x", method="DELETE") is None
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_connectapi_error_status_raises(self):
+        """Test that error statuses raise GarminAPIError with the status code."""
+        client = GarminClient(
+            make_garth_client(),
+            transport=httpx.MockTransport(lambda request: httpx.Response(404)),
+        )
+        with pytest.raises(GarminAPIError) as exc_info:
+            await client.connectapi("/missing")
+        await client.aclose()
+
+        assert exc_info.value.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_requests_recorded_in_metrics(self):
+        """Test that each request's latency, status and body size is recorded per endpoint."""
+        client = GarminClient(
+            make_garth_client(),
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(
+                    404 if request.url.path.endswith("/2") else 200, content=b'{"a": 1}'
+                )
+            ),
+            retry_policy=RetryPolicy(max_attempts=1),
+        )
+        await client.connectapi("/workout-service/workout/1")
+        with pytest.raises(GarminAPIError):
+            await client.connectapi("/workout-service/workout/2")
+        await client.aclose()
+
+        endpoint = get_metrics().snapshot()["endpoints"][
+            "GET /workout-service/workout/{id}"
+        ]
+        assert endpoint["count"] == 2
+        assert endpoint["errors"] == 1
+        assert endpoint["bytes"] == 2 * len(b'{"a": 1}')
+
+    @pytest.mark.asyncio
+    async def test_throttling_feeds_rate_limiter(self):
+        """Test that 429 responses slow the limiter and successes speed it up."""
+        statuses = iter([429, 200])
+        limiter = AdaptiveRateLimiter(rate=4.0, increase=0.5)
+        client = GarminClient(
+            make_garth_client(),
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(next(statuses), json={})
+            ),
+            limiter=limiter,
+            retry_policy=RetryPolicy(max_attempts=1),
+        )
+
+        with pytest.raises(GarminAPIError):
+            await client.connectapi("/a")
+        assert limiter.rate == 2.0
+        await client.connectapi("/a")
+        assert limiter.rate == 2.5
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_transient_errors_retried(self):
+        """Test that a reset connection and a 503 are retried for GET."""
+        attempts = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            attempts.append(request.method)
+            if len(attempts) == 1:
+                raise httpx.ReadError("connection reset")
+            if len(attempts) == 2:
+                return httpx.Response(503)
+            return httpx.Response(200, json={"ok": True})
+
+        client = GarminClient(
+            make_garth_client(),
+            transport=httpx.MockTransport(handler),
+            retry_policy=RetryPolicy(sleep=no_sleep),
+        )
+        assert await client.connectapi("/a") == {"ok": True}
+        await client.aclose()
+        assert len(attempts) == 3
+
+    @pytest.mark.asyncio
+    async def test_post_not_retried_after_server_error(self):
+        """Test that a POST which may have been processed is not repeated."""
+        attempts = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            attempts.append(request.method)
+            return httpx.Response(503)
+
+        client = GarminClient(
+            make_garth_client(),
+            transport=httpx.MockTransport(handler),
+            retry_policy=RetryPolicy(sleep=no_sleep),
+        )
+        with pytest.raises(GarminAPIError):
+            await client.connectapi("/a", method="POST", json={})
+        await client.aclose()
+        assert attempts == ["POST"]
+
+    @pytest.mark.asyncio
+    async def test_expired_token_refreshed_once(self):
+        """Test that concurrent calls with an expired token refresh only once."""
+        garth_client = make_garth_client(FakeToken("old", expires_at=0))
+
+        def refresh():
+            time.sleep(0.05)
+            garth_client.oauth2_token = FakeToken("new")
+
+        garth_client.refresh_oauth2.side_effect = refresh
+        auth_headers = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            auth_headers.append(request.headers["Authorization"])
+            return httpx.Response(200, json={})
+
+        client = GarminClient(garth_client, transport=httpx.MockTransport(handler))
+        await asyncio.gather(*(client.connectapi(f"/x/{i}") for i in range(5)))
+        await client.aclose()
+
+        garth_client.refresh_oauth2.assert_called_once()
+        assert auth_headers == ["Bearer new"] * 5
+
+    @pytest.mark.asyncio
+    async def test_concurrent_auth_failures_renew_once(self, tmp_path):
+        """Test that concurrent 401s trigger one renewal, persisted to the token dir."""
+        garth_client = make_garth_client(FakeToken("revoked"))
+
+        def refresh():
+            time.sleep(0.05)
+            garth_client.oauth2_token = FakeToken("new")
+
+        garth_client.refresh_oauth2.side_effect = refresh
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.01)
+            if request.headers["Authorization"] == "Bearer revoked":
+                return httpx.Response(401)
+            return httpx.Response(200, json={})
+
+        client = GarminClient(
+            garth_client,
+            transport=httpx.MockTransport(handler),
+            token_dir=str(tmp_path),
+        )
+        await asyncio.gather(
+            *(client.connectapi(f"/x/{i}") for i in range(4)),
+            client.connectapi("/y", method="POST", json={}),
+        )
+        await client.aclose()
+
+        garth_client.refresh_oauth2.assert_called_once()
+        garth_client.login.assert_not_called()
+        garth_client.dump.assert_called_once_with(str(tmp_path))
+
+    @pytest.mark.asyncio
+    async def test_rejected_refresh_logs_in_again(self, monkeypatch):
+        """Test that a failed token refresh falls back to a credential login."""
+        monkeypatch.setenv("GARMIN_EMAIL", "runner@example.com")
+        monkeypatch.setenv("GARMIN_PASSWORD", "secret")
+        garth_client = make_garth_client(FakeToken("old", expires_at=0))
+        garth_client.refresh_oauth2.side_effect = Exception("refresh token expired")
+
+        def login(email, password):
+            garth_client.oauth2_token = FakeToken("fresh")
+
+        garth_client.login.side_effect = login
+
+        client = GarminClient(
+            garth_client,
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, json={})),
+        )
+        await client.connectapi("/a")
+        await client.aclose()
+
+        garth_client.login.assert_called_once_with("runner@example.com", "secret")
+        garth_client.dump.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_background_refresh_ahead_of_expiry(self, monkeypatch):
+        """Test that the token is renewed before it expires, without any request."""
+        monkeypatch.setattr(client_module, "TOKEN_REFRESH_MARGIN", 60.0)
+        monkeypatch.setattr(client_module, "TOKEN_REFRESH_MIN_INTERVAL", 0.0)
+        garth_client = make_garth_client(
+            FakeToken("old", expires_at=time.time() + 60.05)
+        )
+        refreshed = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        def refresh():
+            garth_client.oauth2_token = FakeToken("new", expires_at=time.time() + 3600)
+            loop.call_soon_threadsafe(refreshed.set)
+
+        garth_client.refresh_oauth2.side_effect = refresh
+
+        client = GarminClient(garth_client)
+        task = client.start_token_refresher()
+        await asyncio.wait_for(refreshed.wait(), timeout=2)
+        await client.aclose()
+
+        assert task.cancelled()
+        garth_client.refresh_oauth2.assert_called_once()
+        assert str(garth_client.oauth2_token) == "Bearer new"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_gets_coalesced(self):
+        """Test that identical concurrent GETs share one HTTP request."""
+        requests = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(str(request.url))
+            await asyncio.sleep(0.02)
+            return httpx.Response(200, json={"ok": True})
+
+        client = GarminClient(
+            make_garth_client(), transport=httpx.MockTransport(handler)
+        )
+        results = await asyncio.gather(
+            client.connectapi("/a", params={"x": 1}),
+            client.connectapi("/a", params={"x": 1}),
+            client.connectapi("/a", params={"x": 2}),
+        )
+        await client.aclose()
+
+        assert results == [{"ok": True}] * 3
+        assert len(requests) == 2
+        assert client.singleflight.shared == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_posts_not_coalesced(self):
+        """Test that non-GET requests are always sent."""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request.method)
+            return httpx.Response(200, json={})
+
+        client = GarminClient(
+            make_garth_client(), transport=httpx.MockTransport(handler)
+        )
+        await asyncio.gather(
+            client.connectapi("/a", method="POST", json={}),
+            client.connectapi("/a", method="POST", json={}),
+        )
+        await client.aclose()
+
+        assert requests == ["POST", "POST"]
+
+    @pytest.mark.asyncio
+    async def test_http_client_is_reused(self):
+        """Test that the pooled HTTP client is shared between calls."""
+        client = GarminClient(
+            make_garth_client(),
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, json=[])),
+        )
+        await client.connectapi("/a")
+        first = client._http
+        await client.connectapi("/b")
+
+        assert client._http is first
+        await client.aclose()
+        assert client._http is None
+
+
+def save_athlete_tokens(garth_home, athlete):
+    """Write garth token files for an athlete as `--login-athlete` would."""
+    import garth
+    from garth.auth_tokens import OAuth1Token, OAuth2Token
+
+    now = int(time.time())
+    garth_client = garth.Client()
+    garth_client.configure(
+        oauth1_token=OAuth1Token(
+            oauth_token="t", oauth_token_secret="s", domain="garmin.com"
+        ),
+        oauth2_token=OAuth2Token(
+            scope="",
+            jti="",
+            token_type="Bearer",
+            access_token=f"{athlete}-token",
+            refresh_token="r",
+            expires_in=3600,
+            expires_at=now + 3600,
+            refresh_token_expires_in=7200,
+            refresh_token_expires_at=now + 7200,
+        ),
+        domain="garmin.com",
+    )
+    garth_client.dump(str(garth_home / "athletes" / athlete))
+
+
+class TestAthleteClients:
+    """Test cases for the per-athlete client pool."""
+
+    def test_each_athlete_has_own_client(self, monkeypatch, tmp_path):
+        """Test that athletes get separate tokens, caches and rate limiters."""
+        monkeypatch.setenv("GARTH_HOME", str(tmp_path))
+        save_athlete_tokens(tmp_path, "jane")
+        save_athlete_tokens(tmp_path, "joe")
+
+        jane = get_client("jane")
+        joe = get_client("joe")
+
+        assert get_client("jane") is jane
+        assert jane is not joe
+        assert str(jane.garth.oauth2_token) == "Bearer jane-token"
+        assert str(joe.garth.oauth2_token) == "Bearer joe-token"
+        assert jane.cache is not joe.cache
+        assert jane.limiter is not joe.limiter
+        assert jane.token_dir == str(tmp_path / "athletes" / "jane")
+        assert not jane.relogin_from_env
+        assert get_client() is not jane
+
+    def test_unknown_athlete(self, monkeypatch, tmp_path):
+        """Test that an athlete without saved tokens gets a helpful error."""
+        monkeypatch.setenv("GARTH_HOME", str(tmp_path))
+
+        with pytest.raises(ValueError, match="--login-athlete jane"):
+            get_client("jane")
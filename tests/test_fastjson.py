@@ -0,0 +1,47 @@
+import json
+from datetime import date
+
+import pytest
+
+from garmin_workouts_mcp import fastjson
+
+BACKENDS = ["pydantic-core"]
+if fastjson.orjson is not None:
+    BACKENDS.append("orjson")
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request, monkeypatch):
+    """Run a test against every available backend."""
+    if request.param == "pydantic-core":
+        monkeypatch.setattr(fastjson, "orjson", None)
+    return request.param
+
+
+def test_round_trip(backend):
+    doc = {
+        "activityId": 123,
+        "activityName": "Lauf in Zürich",
+        "distance": 10000.5,
+        "splits": [{"n": 1}, {"n": 2}],
+        "device": None,
+        "manual": False,
+    }
+    encoded = fastjson.dumps(doc)
+
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == doc
+    assert fastjson.loads(encoded) == doc
+    assert fastjson.loads(encoded.decode()) == doc
+    assert fastjson.dumps_str(doc) == encoded.decode()
+
+
+def test_compact_utf8(backend):
+    assert fastjson.dumps({"a": [1, 2], "b": "ü"}) == '{"a":[1,2],"b":"ü"}'.encode()
+
+
+def test_non_json_values(backend):
+    assert json.loads(fastjson.dumps({"day": date(2025, 6, 1), 1: "x"})) == {
+        "day": "2025-06-01",
+        "1": "x",
+    }
@@ -1,6 +1,9 @@
 import pytest
+from garmin_workouts_mcp import garmin_workout
 from garmin_workouts_mcp.garmin_workout import (
     make_payload,
+    make_payloads,
+    shutdown_process_pool,
     get_sport_type,
     process_step,
     process_regular_step,
@@ -12,6 +15,9 @@ from garmin_workouts_mcp.garmin_workout import (
     convert_value_to_unit,
     estimate_step_duration,
     calculate_steps_duration,
+    payload_to_workout,
+    diff_workouts,
+    guess_distance_unit,
     DEFAULT_PACE,
 )
 
@@ -341,3 +347,399 @@ def test_calculate_steps_duration_mixed_steps():
         300 + int(500 * (2 / (2.77 + 3.33))) + 2 * (60 + int(100 * (2 / (2.77 + 3.33))))
     )
     assert duration == expected_duration
+
+
+def test_make_payload_estimates_in_one_pass():
+    workout_data = {
+        "name": "Intervals",
+        "type": "running",
+        "steps": [
+            {"stepType": "warmup", "stepDuration": 720},
+            {
+                "stepType": "repeat",
+                "numberOfIterations": 3,
+                "steps": [
+                    {
+                        "stepType": "interval",
+                        "endConditionType": "distance",
+                        "stepDistance": 1,
+                        "distanceUnit": "km",
+                        "target": {
+                            "type": "pace",
+                            "value": [4.0, 4.0],
+                            "unit": "min_per_km",
+                        },
+                    },
+                    {
+                        "stepType": "repeat",
+                        "numberOfIterations": 2,
+                        "steps": [{"stepType": "recovery", "stepDuration": 60}],
+                    },
+                ],
+            },
+        ],
+    }
+    payload = make_payload(workout_data)
+
+    assert payload["estimatedDurationInSecs"] == calculate_estimated_duration(
+        payload["workoutSegments"]
+    )
+    assert payload["estimatedDurationInSecs"] == 720 + 3 * (240 + 2 * 60)
+    # Only the 3 x 1km: the time steps have no pace or speed target
+    assert payload["estimatedDistanceInMeters"] == 3000
+
+
+def test_make_payload_distance_from_speed_target():
+    payload = make_payload(
+        {
+            "name": "Ride",
+            "type": "cycling",
+            "steps": [
+                {
+                    "stepType": "interval",
+                    "stepDuration": 3600,
+                    "target": {"type": "speed", "value": [8.0, 10.0]},
+                }
+            ],
+        }
+    )
+
+    assert payload["estimatedDistanceInMeters"] == 9.0 * 3600
+
+
+def test_make_payload_no_distance_without_pace():
+    steps = [
+        {
+            "stepType": "repeat",
+            "numberOfIterations": 3,
+            "steps": [{"stepType": "interval", "stepDuration": 60}],
+        }
+    ]
+    strength = make_payload({"name": "Circuit", "type": "strength", "steps": steps})
+    cycling = make_payload(
+        {
+            "name": "Ride",
+            "type": "cycling",
+            "steps": [
+                {"stepType": "interval", "stepDuration": 600},
+                {
+                    "stepType": "interval",
+                    "endConditionType": "distance",
+                    "stepDistance": 5,
+                    "distanceUnit": "km",
+                },
+            ],
+        }
+    )
+
+    assert strength["estimatedDurationInSecs"] == 180
+    assert strength["estimatedDistanceInMeters"] == 0
+    assert cycling["estimatedDistanceInMeters"] == 5000
+
+
+def test_make_payload_deeply_nested_repeats():
+    import sys
+
+    depth = sys.getrecursionlimit() + 100
+    steps = [{"stepType": "interval", "stepDuration": 60}]
+    for _ in range(depth):
+        steps = [
+            {"stepType": "recovery", "stepDuration": 30},
+            {"stepType": "repeat", "numberOfIterations": 1, "steps": steps},
+        ]
+
+    payload = make_payload({"name": "Deep", "type": "running", "steps": steps})
+
+    assert payload["estimatedDurationInSecs"] == depth * 30 + 60
+    assert calculate_estimated_duration(payload["workoutSegments"]) == depth * 30 + 60
+
+    # Step orders are assigned depth-first, in input order
+    level = payload["workoutSegments"][0]["workoutSteps"]
+    for expected_order in range(1, 2 * depth, 2):
+        recovery, repeat = level
+        assert recovery["stepOrder"] == expected_order
+        assert repeat["stepOrder"] == expected_order + 1
+        level = repeat["workoutSteps"]
+    assert level[0]["stepOrder"] == 2 * depth + 1
+
+
+def test_process_repeat_step_nested_step_order():
+    result = process_repeat_step(
+        {
+            "stepType": "repeat",
+            "numberOfIterations": 2,
+            "steps": [
+                {
+                    "stepType": "repeat",
+                    "numberOfIterations": 3,
+                    "steps": [{"stepType": "interval", "stepDuration": 10}],
+                },
+                {"stepType": "recovery", "stepDuration": 20},
+            ],
+        },
+        5,
+    )
+
+    outer = result["step"]
+    inner, recovery = outer["workoutSteps"]
+    assert [
+        outer["stepOrder"],
+        inner["stepOrder"],
+        inner["workoutSteps"][0]["stepOrder"],
+    ] == [5, 6, 7]
+    assert recovery["stepOrder"] == 8
+    assert result["stepOrder"] == 9
+    assert result["duration"] == 2 * (3 * 10 + 20)
+
+
+def batch_workouts(count):
+    return [
+        {
+            "name": f"W{i}",
+            "type": "running",
+            "steps": [{"stepType": "interval", "stepDuration": 60 + i}],
+        }
+        if i % 7
+        else {"name": f"W{i}", "type": "rowing", "steps": []}
+        for i in range(count)
+    ]
+
+
+def test_make_payloads_in_process_keeps_order_and_errors():
+    results = make_payloads(batch_workouts(10))
+
+    assert len(results) == 10
+    for i, (payload, error) in enumerate(results):
+        if i % 7:
+            assert error is None
+            assert payload["workoutName"] == f"W{i}"
+            assert payload["estimatedDurationInSecs"] == 60 + i
+        else:
+            assert payload is None
+            assert isinstance(error, ValueError)
+            assert str(error) == "Unsupported sport type: rowing"
+
+
+def test_make_payloads_process_pool(monkeypatch):
+    monkeypatch.setattr(garmin_workout.os, "cpu_count", lambda: 2)
+    workouts = batch_workouts(600)
+
+    try:
+        results = make_payloads(workouts, threshold=1)
+        assert garmin_workout._pool is not None
+    finally:
+        shutdown_process_pool()
+
+    assert garmin_workout._pool is None
+    expected = make_payloads(workouts)
+    assert [payload for payload, _ in results] == [payload for payload, _ in expected]
+    assert [str(error) for _, error in results] == [str(error) for _, error in expected]
+
+
+class FakePool:
+    """Process pool stand-in compiling chunks in-process."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def map(self, func, chunks):
+        self.chunks.extend(chunks)
+        return map(func, chunks)
+
+
+def test_make_payloads_honours_small_threshold(monkeypatch):
+    pool = FakePool()
+    monkeypatch.setattr(garmin_workout.os, "cpu_count", lambda: 2)
+    monkeypatch.setattr(garmin_workout, "_get_process_pool", lambda: pool)
+
+    make_payloads(batch_workouts(9), threshold=10)
+    assert pool.chunks == []
+
+    workouts = batch_workouts(11)
+    results = make_payloads(workouts, threshold=10)
+
+    assert [len(chunk) for chunk in pool.chunks] == [6, 5]
+    assert [payload for payload, _ in results] == [
+        payload for payload, _ in make_payloads(workouts)
+    ]
+
+
+INTERVAL_WORKOUT = {
+    "name": "Intervals",
+    "type": "running",
+    "steps": [
+        {
+            "stepName": "Warm up",
+            "stepType": "warmup",
+            "endConditionType": "time",
+            "stepDuration": 600,
+        },
+        {
+            "stepType": "repeat",
+            "numberOfIterations": 4,
+            "steps": [
+                {
+                    "stepName": "Fast",
+                    "stepDescription": "Hard",
+                    "stepType": "interval",
+                    "endConditionType": "distance",
+                    "stepDistance": 1,
+                    "distanceUnit": "km",
+                    "target": {
+                        "type": "pace",
+                        "value": [4.0, 4.5],
+                        "unit": "min_per_km",
+                    },
+                },
+                {
+                    "stepType": "recovery",
+                    "endConditionType": "time",
+                    "stepDuration": 120,
+                    "target": {
+                        "type": "heart rate",
+                        "value": [120, 140],
+                        "unit": "bpm",
+                    },
+                },
+            ],
+        },
+        {
+            "stepType": "cooldown",
+            "endConditionType": "distance",
+            "stepDistance": 400,
+            "distanceUnit": "m",
+        },
+    ],
+}
+
+
+def test_payload_to_workout_round_trip():
+    decoded = payload_to_workout(make_payload(INTERVAL_WORKOUT))
+
+    assert decoded == {
+        "name": "Intervals",
+        "type": "running",
+        "steps": [
+            {"stepType": "warmup", "endConditionType": "time", "stepDuration": 600},
+            {
+                "stepType": "repeat",
+                "numberOfIterations": 4,
+                "steps": [
+                    {
+                        "stepType": "interval",
+                        "stepDescription": "Hard",
+                        "endConditionType": "distance",
+                        "stepDistance": 1,
+                        "distanceUnit": "km",
+                        "target": {
+                            "type": "pace",
+                            "value": [4.0, 4.5],
+                            "unit": "min_per_km",
+                        },
+                    },
+                    {
+                        "stepType": "recovery",
+                        "endConditionType": "time",
+                        "stepDuration": 120,
+                        "target": {
+                            "type": "heart rate",
+                            "value": [120, 140],
+                            "unit": "bpm",
+                        },
+                    },
+                ],
+            },
+            {
+                "stepType": "cooldown",
+                "endConditionType": "distance",
+                "stepDistance": 400,
+                "distanceUnit": "m",
+            },
+        ],
+    }
+    assert diff_workouts(INTERVAL_WORKOUT, decoded) == []
+
+
+def test_payload_to_workout_preferred_unit_and_sport():
+    payload = make_payload(
+        {
+            "name": "Ride",
+            "type": "cycling",
+            "steps": [
+                {
+                    "stepType": "interval",
+                    "endConditionType": "distance",
+                    "stepDistance": 2,
+                    "distanceUnit": "km",
+                }
+            ],
+        }
+    )
+    step = payload["workoutSegments"][0]["workoutSteps"][0]
+    step["preferredEndConditionUnit"] = {"unitKey": "meter"}
+
+    decoded = payload_to_workout(payload)
+
+    assert decoded["type"] == "cycling"
+    assert decoded["steps"][0]["stepDistance"] == 2000
+    assert decoded["steps"][0]["distanceUnit"] == "m"
+
+
+def test_guess_distance_unit():
+    assert guess_distance_unit(5000) == "km"
+    assert guess_distance_unit(1609.344 * 2) == "mile"
+    assert guess_distance_unit(400) == "m"
+    assert guess_distance_unit(1500) == "m"
+
+
+def test_payload_to_workout_deeply_nested():
+    depth = 2000
+    workout = {
+        "name": "Deep",
+        "type": "running",
+        "steps": [{"stepType": "interval", "stepDuration": 1}],
+    }
+    for _ in range(depth):
+        workout["steps"] = [
+            {"stepType": "repeat", "numberOfIterations": 1, "steps": workout["steps"]}
+        ]
+
+    decoded = payload_to_workout(make_payload(workout))
+
+    step = decoded["steps"][0]
+    for _ in range(depth - 1):
+        step = step["steps"][0]
+    assert step["steps"] == [
+        {"stepType": "interval", "endConditionType": "time", "stepDuration": 1}
+    ]
+
+
+def test_diff_workouts_reports_paths():
+    decoded = payload_to_workout(make_payload(INTERVAL_WORKOUT))
+    changed = payload_to_workout(make_payload(INTERVAL_WORKOUT))
+    changed["steps"][1]["numberOfIterations"] = 5
+    changed["steps"][1]["steps"][0]["target"]["value"] = [4.0, 4.6]
+    del changed["steps"][2]
+
+    assert diff_workouts(decoded, changed) == [
+        "$.steps: 3 items != 2 items",
+    ]
+
+    del decoded["steps"][2]
+    assert diff_workouts(decoded, changed) == [
+        "$.steps[1].numberOfIterations: 4 != 5",
+        "$.steps[1].steps[0].target.value[1]: 4.5 != 4.6",
+    ]
+
+
+def test_diff_workouts_tolerates_rounding():
+    assert diff_workouts({"value": 4.0}, {"value": 4.0001}) == []
+    assert diff_workouts({"type": "Running"}, {"type": "running"}) == []
+    assert diff_workouts({"stepName": "A"}, {"stepName": "B"}) == []
+    assert (
+        diff_workouts(
+            {"stepDistance": 1, "distanceUnit": "km"},
+            {"stepDistance": 1000, "distanceUnit": "m"},
+        )
+        == []
+    )
@@ -24,6 +24,15 @@ class TestMCPIntegration:
             "delete_workout",
             "upload_workout",
             "generate_workout_data_prompt",
+            "get_cache_stats",
+            "get_workouts",
+            "get_activities",
+            "upload_workouts",
+            "sync_activities",
+            "query_activities",
+            "get_server_metrics",
+            "compile_workout",
+            "get_training_load",
         }
 
         # FastMCP returns tools as a dictionary of FunctionTool objects
@@ -44,9 +53,9 @@ class TestMCPIntegration:
         """Test that the MCP server has the correct name."""
         assert mcp.name == "GarminConnectWorkoutsServer"
 
-    @patch("garmin_workouts_mcp.main.garth.resume")
-    @patch("garmin_workouts_mcp.main.garth.save")
-    @patch("garmin_workouts_mcp.main.garth.login")
+    @patch("garth.resume")
+    @patch("garth.save")
+    @patch("garth.login")
     def test_login_integration_success(self, mock_garth_login, mock_save, mock_resume):
         """Test successful login flow when resume works."""
         # Arrange
@@ -60,9 +69,9 @@ class TestMCPIntegration:
         mock_garth_login.assert_not_called()
         mock_save.assert_not_called()
 
-    @patch("garmin_workouts_mcp.main.garth.resume")
-    @patch("garmin_workouts_mcp.main.garth.save")
-    @patch("garmin_workouts_mcp.main.garth.login")
+    @patch("garth.resume")
+    @patch("garth.save")
+    @patch("garth.login")
     @patch.dict(
         "os.environ",
         {"GARMIN_EMAIL": "test@example.com", "GARMIN_PASSWORD": "password123"},
@@ -83,8 +92,8 @@ class TestMCPIntegration:
         mock_garth_login.assert_called_once_with("test@example.com", "password123")
         mock_save.assert_called_once_with("~/.garth")
 
-    @patch("garmin_workouts_mcp.main.garth.resume")
-    @patch("garmin_workouts_mcp.main.garth.login")
+    @patch("garth.resume")
+    @patch("garth.login")
     @patch.dict(
         "os.environ",
         {"GARMIN_EMAIL": "test@example.com", "GARMIN_PASSWORD": "password123"},
@@ -108,7 +117,7 @@ class TestMCPIntegration:
         mock_logger.error.assert_called_once()
         mock_exit.assert_called_once_with(1)
 
-    @patch("garmin_workouts_mcp.main.garth.resume")
+    @patch("garth.resume")
     @patch.dict("os.environ", {}, clear=True)
     def test_login_integration_no_credentials_raises_error(self, mock_resume):
         """Test login flow when no credentials are provided via env vars."""
@@ -123,3 +132,58 @@ class TestMCPIntegration:
             login()
 
         mock_resume.assert_called_once_with("~/.garth")
+
+
+class TestTransports:
+    """Test cases for choosing the transport and sharing state between sessions."""
+
+    @patch("garmin_workouts_mcp.main.login")
+    @patch("garmin_workouts_mcp.main.mcp.run")
+    def test_main_defaults_to_stdio(self, mock_run, mock_login):
+        """Test that without options the server runs over stdio."""
+        import garmin_workouts_mcp.main as main_module
+
+        main_module.main([])
+
+        mock_login.assert_called_once()
+        mock_run.assert_called_once_with()
+
+    @patch("garmin_workouts_mcp.main.login")
+    @patch("garmin_workouts_mcp.main.run_http")
+    def test_main_http_transport(self, mock_run_http, mock_login, monkeypatch):
+        """Test that the HTTP transport is configured from flags and environment."""
+        import garmin_workouts_mcp.main as main_module
+
+        monkeypatch.setenv(main_module.MAX_CONCURRENCY_ENV, "4")
+        main_module.main(["--transport", "http", "--port", "9000"])
+
+        mock_run_http.assert_called_once_with("127.0.0.1", 9000, "/mcp", 4)
+
+    def test_invalid_concurrency_rejected(self):
+        """Test that a concurrency limit below one is refused."""
+        import garmin_workouts_mcp.main as main_module
+
+        with pytest.raises(SystemExit):
+            main_module.parse_args(["--max-concurrency", "0"])
+
+    @pytest.mark.asyncio
+    async def test_http_app_keeps_client_warm_between_sessions(self, monkeypatch):
+        """Test that sessions share one client, which lives until the app shuts down."""
+        from fastmcp import Client
+
+        import garmin_workouts_mcp.client as client_module
+        import garmin_workouts_mcp.main as main_module
+
+        monkeypatch.setattr(mcp, "middleware", list(mcp.middleware))
+        app = main_module.create_http_app(max_concurrency=2)
+
+        async with app.router.lifespan_context(app):
+            shared = main_module.get_client()
+            for _ in range(2):
+                async with Client(mcp) as client:
+                    await client.call_tool("get_cache_stats", {})
+                assert client_module._client is shared
+            metrics = main_module.get_server_metrics.fn()
+
+        assert client_module._client is None
+        assert len(metrics["sessions"]) == 2
@@ -1,12 +1,13 @@
 import pytest
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 
 class TestListWorkouts:
     """Test cases for the list_workouts tool."""
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_list_workouts_success(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_list_workouts_success(self, mock_connectapi):
         """Test successful retrieval of workouts."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -31,7 +32,7 @@ class TestListWorkouts:
         mock_connectapi.return_value = expected_workouts
 
         # Act
-        result = list_workouts_func()
+        result = await list_workouts_func()
 
         # Assert
         mock_connectapi.assert_called_once_with("/workout-service/workouts")
@@ -40,8 +41,9 @@ class TestListWorkouts:
         assert result["workouts"][0]["workoutName"] == "Easy Run"
         assert result["workouts"][1]["workoutName"] == "Bike Intervals"
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_list_workouts_empty_list(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_list_workouts_empty_list(self, mock_connectapi):
         """Test when no workouts are returned."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -52,15 +54,16 @@ class TestListWorkouts:
         mock_connectapi.return_value = []
 
         # Act
-        result = list_workouts_func()
+        result = await list_workouts_func()
 
         # Assert
         mock_connectapi.assert_called_once_with("/workout-service/workouts")
         assert result == {"workouts": []}
         assert len(result["workouts"]) == 0
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_list_workouts_api_error(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_list_workouts_api_error(self, mock_connectapi):
         """Test when the Garmin API raises an exception."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -72,12 +75,13 @@ class TestListWorkouts:
 
         # Act & Assert
         with pytest.raises(Exception, match="API connection failed"):
-            list_workouts_func()
+            await list_workouts_func()
 
         mock_connectapi.assert_called_once_with("/workout-service/workouts")
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_list_workouts_none_response(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_list_workouts_none_response(self, mock_connectapi):
         """Test when the API returns None."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -88,7 +92,7 @@ class TestListWorkouts:
         mock_connectapi.return_value = None
 
         # Act
-        result = list_workouts_func()
+        result = await list_workouts_func()
 
         # Assert
         mock_connectapi.assert_called_once_with("/workout-service/workouts")
@@ -98,8 +102,9 @@ class TestListWorkouts:
 class TestGetWorkout:
     """Test cases for the get_workout tool."""
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_get_workout_success(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_get_workout_success(self, mock_connectapi):
         """Test successful retrieval of a specific workout."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -116,7 +121,7 @@ class TestGetWorkout:
         mock_connectapi.return_value = expected_workout
 
         # Act
-        result = get_workout_func(workout_id)
+        result = await get_workout_func(workout_id)
 
         # Assert
         mock_connectapi.assert_called_once_with(
@@ -125,8 +130,9 @@ class TestGetWorkout:
         assert result == {"workout": expected_workout}
         assert result["workout"]["workoutId"] == workout_id
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_get_workout_not_found(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_get_workout_not_found(self, mock_connectapi):
         """Test get_workout when the workout is not found."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -138,7 +144,7 @@ class TestGetWorkout:
         mock_connectapi.return_value = None
 
         # Act
-        result = get_workout_func(workout_id)
+        result = await get_workout_func(workout_id)
 
         # Assert
         mock_connectapi.assert_called_once_with(
@@ -146,8 +152,9 @@ class TestGetWorkout:
         )
         assert result == {"workout": None}
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_get_workout_api_error(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_get_workout_api_error(self, mock_connectapi):
         """Test get_workout when the API call fails."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -160,14 +167,15 @@ class TestGetWorkout:
 
         # Act & Assert
         with pytest.raises(Exception, match="API Error"):
-            get_workout_func(workout_id)
+            await get_workout_func(workout_id)
 
 
 class TestScheduleWorkout:
     """Test cases for the schedule_workout tool."""
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_schedule_workout_success(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_schedule_workout_success(self, mock_connectapi):
         """Test successful workout scheduling."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -181,7 +189,7 @@ class TestScheduleWorkout:
         mock_connectapi.return_value = expected_response
 
         # Act
-        result = schedule_workout_func(workout_id, date)
+        result = await schedule_workout_func(workout_id, date)
 
         # Assert
         mock_connectapi.assert_called_once_with(
@@ -191,7 +199,8 @@ class TestScheduleWorkout:
         )
         assert result == {"workoutScheduleId": "schedule_456"}
 
-    def test_schedule_workout_invalid_date_format(
+    @pytest.mark.asyncio
+    async def test_schedule_workout_invalid_date_format(
         self,
     ):
         """Test schedule_workout with invalid date format."""
@@ -203,10 +212,11 @@ class TestScheduleWorkout:
         with pytest.raises(
             ValueError, match=r"Date must be in ISO format \(YYYY-MM-DD\)"
         ):
-            schedule_workout_func("123", "01/15/2024")
+            await schedule_workout_func("123", "01/15/2024")
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_schedule_workout_api_error(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_schedule_workout_api_error(self, mock_connectapi):
         """Test schedule_workout when the API call fails."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -220,14 +230,15 @@ class TestScheduleWorkout:
 
         # Act & Assert
         with pytest.raises(Exception, match="API Error"):
-            schedule_workout_func(workout_id, date)
+            await schedule_workout_func(workout_id, date)
 
 
 class TestDeleteWorkout:
     """Test cases for the delete_workout tool."""
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_delete_workout_success(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_delete_workout_success(self, mock_connectapi):
         """Test successful workout deletion."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -239,7 +250,7 @@ class TestDeleteWorkout:
         mock_connectapi.return_value = None
 
         # Act
-        result = delete_workout_func(workout_id)
+        result = await delete_workout_func(workout_id)
 
         # Assert
         mock_connectapi.assert_called_once_with(
@@ -247,8 +258,9 @@ class TestDeleteWorkout:
         )
         assert result is True
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_delete_workout_api_error(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_delete_workout_api_error(self, mock_connectapi):
         """Test delete_workout when API raises an exception."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -260,7 +272,7 @@ class TestDeleteWorkout:
         mock_connectapi.side_effect = Exception("API error")
 
         # Act
-        result = delete_workout_func(workout_id)
+        result = await delete_workout_func(workout_id)
 
         # Assert
         mock_connectapi.assert_called_once_with(
@@ -272,8 +284,9 @@ class TestDeleteWorkout:
 class TestGetActivity:
     """Test cases for the get_activity tool."""
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_get_activity_success(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_get_activity_success(self, mock_connectapi):
         """Test successful retrieval of a specific activity."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -293,7 +306,7 @@ class TestGetActivity:
         mock_connectapi.return_value = expected_activity
 
         # Act
-        result = get_activity_func(activity_id)
+        result = await get_activity_func(activity_id)
 
         # Assert
         mock_connectapi.assert_called_once_with(
@@ -302,8 +315,9 @@ class TestGetActivity:
         assert result == expected_activity
         assert result["activityId"] == activity_id
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_get_activity_not_found(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_get_activity_not_found(self, mock_connectapi):
         """Test get_activity when the activity is not found."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -315,7 +329,7 @@ class TestGetActivity:
         mock_connectapi.return_value = None
 
         # Act
-        result = get_activity_func(activity_id)
+        result = await get_activity_func(activity_id)
 
         # Assert
         mock_connectapi.assert_called_once_with(
@@ -323,8 +337,9 @@ class TestGetActivity:
         )
         assert result is None
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_get_activity_api_error(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_get_activity_api_error(self, mock_connectapi):
         """Test get_activity when the API call fails."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -337,18 +352,49 @@ class TestGetActivity:
 
         # Act & Assert
         with pytest.raises(Exception, match="API Error"):
-            get_activity_func(activity_id)
+            await get_activity_func(activity_id)
 
         mock_connectapi.assert_called_once_with(
             f"/activity-service/activity/{activity_id}"
         )
 
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_get_activity_with_fields(self, mock_connectapi):
+        """Test trimming an activity to a named profile."""
+        # Import the actual function, not the FunctionTool wrapper
+        import garmin_workouts_mcp.main as main_module
+
+        get_activity_func = main_module.get_activity.fn
+
+        # Arrange
+        mock_connectapi.return_value = {
+            "activityId": 1,
+            "activityName": "Morning Run",
+            "summaryDTO": {"distance": 5000, "averageHR": 150, "maxHR": 170},
+            "splitSummaries": [{"distance": 1000}] * 5,
+        }
+
+        # Act
+        result = await get_activity_func("1", fields="hr")
+        full = await get_activity_func("1")
+
+        # Assert
+        assert result == {
+            "activityId": 1,
+            "activityName": "Morning Run",
+            "summaryDTO": {"averageHR": 150, "maxHR": 170},
+        }
+        assert "splitSummaries" in full
+        mock_connectapi.assert_called_once()
+
 
 class TestListActivities:
     """Test cases for the list_activities tool."""
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_list_activities_default_params(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_list_activities_default_params(self, mock_connectapi):
         """Test listing activities with default parameters."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -375,7 +421,7 @@ class TestListActivities:
         mock_connectapi.return_value = expected_activities
 
         # Act
-        result = list_activities_func()
+        result = await list_activities_func()
 
         # Assert
         mock_connectapi.assert_called_once_with(
@@ -386,8 +432,9 @@ class TestListActivities:
         assert result == {"activities": expected_activities}
         assert len(result["activities"]) == 2
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_list_activities_with_pagination(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_list_activities_with_pagination(self, mock_connectapi):
         """Test listing activities with custom pagination parameters."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -399,7 +446,7 @@ class TestListActivities:
         mock_connectapi.return_value = expected_activities
 
         # Act
-        result = list_activities_func(limit=50, start=100)
+        result = await list_activities_func(limit=50, start=100)
 
         # Assert
         mock_connectapi.assert_called_once_with(
@@ -409,8 +456,9 @@ class TestListActivities:
         )
         assert result == {"activities": expected_activities}
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_list_activities_with_activity_type_filter(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_list_activities_with_activity_type_filter(self, mock_connectapi):
         """Test listing activities filtered by activity type."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -428,7 +476,7 @@ class TestListActivities:
         mock_connectapi.return_value = expected_activities
 
         # Act
-        result = list_activities_func(activityType="running")
+        result = await list_activities_func(activityType="running")
 
         # Assert
         mock_connectapi.assert_called_once_with(
@@ -438,8 +486,9 @@ class TestListActivities:
         )
         assert result == {"activities": expected_activities}
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_list_activities_with_search_filter(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_list_activities_with_search_filter(self, mock_connectapi):
         """Test listing activities filtered by search term."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -457,7 +506,7 @@ class TestListActivities:
         mock_connectapi.return_value = expected_activities
 
         # Act
-        result = list_activities_func(search="Morning")
+        result = await list_activities_func(search="Morning")
 
         # Assert
         mock_connectapi.assert_called_once_with(
@@ -467,8 +516,9 @@ class TestListActivities:
         )
         assert result == {"activities": expected_activities}
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_list_activities_with_all_filters(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_list_activities_with_all_filters(self, mock_connectapi):
         """Test listing activities with all filters applied."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -480,7 +530,7 @@ class TestListActivities:
         mock_connectapi.return_value = expected_activities
 
         # Act
-        result = list_activities_func(
+        result = await list_activities_func(
             limit=10, start=5, activityType="cycling", search="bike"
         )
 
@@ -497,8 +547,9 @@ class TestListActivities:
         )
         assert result == {"activities": expected_activities}
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_list_activities_empty_result(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_list_activities_empty_result(self, mock_connectapi):
         """Test listing activities when no activities are found."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -509,7 +560,7 @@ class TestListActivities:
         mock_connectapi.return_value = []
 
         # Act
-        result = list_activities_func()
+        result = await list_activities_func()
 
         # Assert
         mock_connectapi.assert_called_once_with(
@@ -519,8 +570,9 @@ class TestListActivities:
         )
         assert result == {"activities": []}
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_list_activities_api_error(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_list_activities_api_error(self, mock_connectapi):
         """Test list_activities when the API call fails."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -532,7 +584,7 @@ class TestListActivities:
 
         # Act & Assert
         with pytest.raises(Exception, match="API connection failed"):
-            list_activities_func()
+            await list_activities_func()
 
         mock_connectapi.assert_called_once_with(
             "/activitylist-service/activities/search/activities",
@@ -540,12 +592,146 @@ class TestListActivities:
             params={"limit": 20, "start": 0},
         )
 
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_list_activities_all_pages(self, mock_connectapi):
+        """Test walking all pages up to a date bound."""
+        # Import the actual function, not the FunctionTool wrapper
+        import garmin_workouts_mcp.main as main_module
+
+        list_activities_func = main_module.list_activities.fn
+
+        # Arrange
+        total = 230
+
+        async def fake_connectapi(path, method, params):
+            first = params["start"]
+            last = min(first + params["limit"], total)
+            return [{"activityId": i} for i in range(first, last)]
+
+        mock_connectapi.side_effect = fake_connectapi
+
+        # Act
+        result = await list_activities_func(
+            activityType="running", startDate="2025-01-01", all_pages=True
+        )
+
+        # Assert
+        assert [a["activityId"] for a in result["activities"]] == list(range(total))
+        assert result["pagination"] == {
+            "start": 0,
+            "count": total,
+            "pages": 3,
+            "truncated": False,
+        }
+        first_call = mock_connectapi.call_args_list[0]
+        assert first_call.kwargs["params"] == {
+            "limit": 100,
+            "start": 0,
+            "activityType": "running",
+            "startDate": "2025-01-01",
+        }
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_list_activities_all_pages_max_activities(self, mock_connectapi):
+        """Test that max_activities bounds an all-pages walk."""
+        # Import the actual function, not the FunctionTool wrapper
+        import garmin_workouts_mcp.main as main_module
+
+        list_activities_func = main_module.list_activities.fn
+
+        # Arrange
+        async def fake_connectapi(path, method, params):
+            return [{"activityId": i} for i in range(params["limit"])]
+
+        mock_connectapi.side_effect = fake_connectapi
+
+        # Act
+        result = await list_activities_func(all_pages=True, max_activities=150)
+
+        # Assert
+        assert len(result["activities"]) == 150
+        assert result["pagination"]["truncated"] is True
+        assert mock_connectapi.call_count == 2
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_list_activities_all_pages_exactly_max_activities(
+        self, mock_connectapi
+    ):
+        """Test that a walk ending exactly at max_activities is not reported truncated."""
+        # Import the actual function, not the FunctionTool wrapper
+        import garmin_workouts_mcp.main as main_module
+
+        list_activities_func = main_module.list_activities.fn
+
+        # Arrange
+        total = 200
+
+        async def fake_connectapi(path, method, params):
+            first = params["start"]
+            last = min(first + params["limit"], total)
+            return [{"activityId": i} for i in range(first, last)]
+
+        mock_connectapi.side_effect = fake_connectapi
+
+        # Act
+        result = await list_activities_func(all_pages=True, max_activities=total)
+
+        # Assert
+        assert len(result["activities"]) == total
+        assert result["pagination"] == {
+            "start": 0,
+            "count": total,
+            "pages": 2,
+            "truncated": False,
+        }
+
+    @pytest.mark.asyncio
+    async def test_list_activities_invalid_date(self):
+        """Test that a malformed startDate is rejected."""
+        # Import the actual function, not the FunctionTool wrapper
+        import garmin_workouts_mcp.main as main_module
+
+        list_activities_func = main_module.list_activities.fn
+
+        with pytest.raises(ValueError, match=r"startDate must be in ISO format"):
+            await list_activities_func(startDate="01/01/2025")
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_list_activities_with_fields(self, mock_connectapi):
+        """Test trimming every listed activity to the given fields."""
+        # Import the actual function, not the FunctionTool wrapper
+        import garmin_workouts_mcp.main as main_module
+
+        list_activities_func = main_module.list_activities.fn
+
+        # Arrange
+        mock_connectapi.return_value = [
+            {"activityId": 1, "distance": 5000, "description": "x"},
+            {"activityId": 2, "distance": 8000, "description": "y"},
+        ]
+
+        # Act
+        result = await list_activities_func(fields=["activityId", "distance"])
+
+        # Assert
+        assert result == {
+            "activities": [
+                {"activityId": 1, "distance": 5000},
+                {"activityId": 2, "distance": 8000},
+            ]
+        }
+
 
 class TestGetActivityWeather:
     """Test cases for the get_activity_weather tool."""
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_get_activity_weather_success(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_get_activity_weather_success(self, mock_connectapi):
         """Test successful retrieval of activity weather data."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -566,7 +752,7 @@ class TestGetActivityWeather:
         mock_connectapi.return_value = expected_weather
 
         # Act
-        result = get_activity_weather_func(activity_id)
+        result = await get_activity_weather_func(activity_id)
 
         # Assert
         mock_connectapi.assert_called_once_with(
@@ -576,8 +762,9 @@ class TestGetActivityWeather:
         assert result["temperature"] == 22.5
         assert result["weatherCondition"] == "partly_cloudy"
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_get_activity_weather_no_data(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_get_activity_weather_no_data(self, mock_connectapi):
         """Test get_activity_weather when no weather data is available."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -589,7 +776,7 @@ class TestGetActivityWeather:
         mock_connectapi.return_value = None
 
         # Act
-        result = get_activity_weather_func(activity_id)
+        result = await get_activity_weather_func(activity_id)
 
         # Assert
         mock_connectapi.assert_called_once_with(
@@ -597,8 +784,9 @@ class TestGetActivityWeather:
         )
         assert result is None
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_get_activity_weather_api_error(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_get_activity_weather_api_error(self, mock_connectapi):
         """Test get_activity_weather when the API call fails."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -611,14 +799,15 @@ class TestGetActivityWeather:
 
         # Act & Assert
         with pytest.raises(Exception, match="Weather service unavailable"):
-            get_activity_weather_func(activity_id)
+            await get_activity_weather_func(activity_id)
 
         mock_connectapi.assert_called_once_with(
             f"/activity-service/activity/{activity_id}/weather"
         )
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_get_activity_weather_empty_response(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_get_activity_weather_empty_response(self, mock_connectapi):
         """Test get_activity_weather when API returns empty response."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -630,7 +819,7 @@ class TestGetActivityWeather:
         mock_connectapi.return_value = {}
 
         # Act
-        result = get_activity_weather_func(activity_id)
+        result = await get_activity_weather_func(activity_id)
 
         # Assert
         mock_connectapi.assert_called_once_with(
@@ -666,9 +855,10 @@ class TestGenerateWorkoutDataPrompt:
 class TestUploadWorkout:
     """Test cases for the upload_workout tool."""
 
+    @pytest.mark.asyncio
     @patch("garmin_workouts_mcp.main.make_payload")
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_upload_workout_success(self, mock_connectapi, mock_make_payload):
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_upload_workout_success(self, mock_connectapi, mock_make_payload):
         """Test successful workout upload."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -682,7 +872,7 @@ class TestUploadWorkout:
         mock_connectapi.return_value = {"workoutId": "new_workout_123"}
 
         # Act
-        result = upload_workout_func(workout_data)
+        result = await upload_workout_func(workout_data)
 
         # Assert
         assert result["workoutId"] == "new_workout_123"
@@ -691,9 +881,12 @@ class TestUploadWorkout:
             "/workout-service/workout", method="POST", json=mock_payload
         )
 
+    @pytest.mark.asyncio
     @patch("garmin_workouts_mcp.main.make_payload")
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_upload_workout_no_workout_id(self, mock_connectapi, mock_make_payload):
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_upload_workout_no_workout_id(
+        self, mock_connectapi, mock_make_payload
+    ):
         """Test upload_workout when no workout ID is returned."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -707,14 +900,144 @@ class TestUploadWorkout:
 
         # Act & Assert
         with pytest.raises(Exception, match="No workout ID returned"):
-            upload_workout_func(workout_data)
+            await upload_workout_func(workout_data)
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_upload_workout_reports_every_error(self, mock_connectapi):
+        """Invalid workout data is rejected with all errors and their paths, before any request."""
+        import garmin_workouts_mcp.main as main_module
+
+        workout_data = {
+            "name": "Broken",
+            "type": "running",
+            "steps": [
+                {"stepType": "warmup"},
+                {"stepDuration": 60, "target": {"type": "zone"}},
+            ],
+        }
+
+        with pytest.raises(ValueError) as exc_info:
+            await main_module.upload_workout.fn(workout_data)
+
+        message = str(exc_info.value)
+        assert "$.steps[0].stepDuration: Invalid or missing stepDuration" in message
+        assert "$.steps[1].stepType: Missing stepType" in message
+        assert "$.steps[1].target.type: Unsupported target type: zone" in message
+        mock_connectapi.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_upload_identical_workout_reuses_id(self, mock_connectapi):
+        """Uploading the same workout twice returns the first ID without a second POST."""
+        import garmin_workouts_mcp.main as main_module
+
+        workout_data = {
+            "name": "Easy",
+            "type": "running",
+            "steps": [{"stepType": "interval", "stepDuration": 600}],
+        }
+        mock_connectapi.side_effect = [{"workoutId": 42}, {"workoutId": 42}]
+
+        first = await main_module.upload_workout.fn(workout_data)
+        second = await main_module.upload_workout.fn(
+            dict(reversed(workout_data.items()))
+        )
+
+        assert first == second == {"workoutId": "42"}
+        methods = [
+            call.kwargs.get("method", "GET") for call in mock_connectapi.call_args_list
+        ]
+        assert methods == ["POST", "GET"]
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_concurrent_identical_uploads_create_one_workout(
+        self, mock_connectapi
+    ):
+        """Identical workouts uploaded concurrently share a single POST."""
+        import asyncio
+
+        import garmin_workouts_mcp.main as main_module
+
+        workout_data = {
+            "name": "Easy",
+            "type": "running",
+            "steps": [{"stepType": "interval", "stepDuration": 600}],
+        }
+        created = []
+
+        async def create(path, method="GET", **kwargs):
+            await asyncio.sleep(0.01)
+            created.append(100 + len(created))
+            return {"workoutId": created[-1]}
+
+        mock_connectapi.side_effect = create
+
+        result = await main_module.upload_workouts.fn([workout_data] * 3)
+
+        assert [item["workoutId"] for item in result["results"]] == ["100"] * 3
+        assert created == [100]
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_upload_reuploads_when_indexed_workout_was_deleted(
+        self, mock_connectapi
+    ):
+        """A workout deleted on Garmin Connect is uploaded again."""
+        import garmin_workouts_mcp.main as main_module
+        from garmin_workouts_mcp.client import GarminAPIError
+
+        workout_data = {
+            "name": "Easy",
+            "type": "running",
+            "steps": [{"stepType": "interval", "stepDuration": 600}],
+        }
+        mock_connectapi.side_effect = [
+            {"workoutId": 1},
+            GarminAPIError("Not found", status_code=404),
+            {"workoutId": 2},
+        ]
+
+        await main_module.upload_workout.fn(workout_data)
+        result = await main_module.upload_workout.fn(workout_data)
+
+        assert result == {"workoutId": "2"}
+        assert mock_connectapi.call_count == 3
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_delete_workout_forgets_upload(self, mock_connectapi):
+        """After delete_workout, the same workout is uploaded again."""
+        import garmin_workouts_mcp.main as main_module
+
+        workout_data = {
+            "name": "Easy",
+            "type": "running",
+            "steps": [{"stepType": "interval", "stepDuration": 600}],
+        }
+        mock_connectapi.side_effect = [{"workoutId": 1}, None, {"workoutId": 2}]
+
+        await main_module.upload_workout.fn(workout_data)
+        assert await main_module.delete_workout.fn("1") is True
+        result = await main_module.upload_workout.fn(workout_data)
+
+        assert result == {"workoutId": "2"}
+        assert [
+            call.kwargs.get("method") for call in mock_connectapi.call_args_list
+        ] == [
+            "POST",
+            "DELETE",
+            "POST",
+        ]
 
 
 class TestGetCalendar:
     """Test cases for the get_calendar tool."""
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_get_calendar_monthly_success(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_get_calendar_monthly_success(self, mock_connectapi):
         """Test successful retrieval of monthly calendar data."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -729,7 +1052,7 @@ class TestGetCalendar:
         mock_connectapi.return_value = expected_calendar
 
         # Act
-        result = get_calendar_func(year, month)
+        result = await get_calendar_func(year, month)
 
         # Assert
         mock_connectapi.assert_called_once_with("/calendar-service/year/2025/month/5")
@@ -740,8 +1063,9 @@ class TestGetCalendar:
         assert result["period"]["day"] is None
         assert result["period"]["start"] is None
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_get_calendar_weekly_success(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_get_calendar_weekly_success(self, mock_connectapi):
         """Test successful retrieval of weekly calendar data."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -750,33 +1074,40 @@ class TestGetCalendar:
 
         # Arrange
         year, month, day = 2025, 6, 10
-        expected_calendar = {
+        morning_run = {
+            "id": 1,
+            "itemType": "workout",
+            "date": "2025-06-10",
+            "title": "Morning Run",
+        }
+        month_calendar = {
             "calendarItems": [
-                {
-                    "date": "2025-06-10",
-                    "workouts": [{"workoutId": "123", "workoutName": "Morning Run"}],
-                    "activities": [],
-                }
+                {"id": 2, "itemType": "workout", "date": "2025-06-08"},
+                morning_run,
+                {"id": 3, "itemType": "activity", "date": "2025-06-16"},
             ]
         }
-        mock_connectapi.return_value = expected_calendar
+        mock_connectapi.return_value = month_calendar
 
         # Act
-        result = get_calendar_func(year, month, day)
+        result = await get_calendar_func(year, month, day)
 
         # Assert
-        mock_connectapi.assert_called_once_with(
-            "/calendar-service/year/2025/month/5/day/10/start/1"
-        )
-        assert result["calendar"] == expected_calendar
+        mock_connectapi.assert_called_once_with("/calendar-service/year/2025/month/5")
+        assert result["calendar"] == {
+            "startDate": "2025-06-09",
+            "endDate": "2025-06-15",
+            "calendarItems": [morning_run],
+        }
         assert result["view_type"] == "week"
         assert result["period"]["year"] == year
         assert result["period"]["month"] == month
         assert result["period"]["day"] == day
         assert result["period"]["start"] == 1
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_get_calendar_weekly_custom_start(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_get_calendar_weekly_custom_start(self, mock_connectapi):
         """Test weekly calendar with custom start parameter."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -788,16 +1119,105 @@ class TestGetCalendar:
         mock_connectapi.return_value = {}
 
         # Act
-        result = get_calendar_func(year, month, day, start)
+        result = await get_calendar_func(year, month, day, start)
 
         # Assert
-        mock_connectapi.assert_called_once_with(
-            "/calendar-service/year/2025/month/5/day/10/start/2"
-        )
+        mock_connectapi.assert_called_once_with("/calendar-service/year/2025/month/5")
+        assert result["calendar"]["startDate"] == "2025-06-10"
+        assert result["calendar"]["endDate"] == "2025-06-16"
         assert result["view_type"] == "week"
         assert result["period"]["start"] == 2
 
-    def test_get_calendar_invalid_year(self):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_get_calendar_week_spanning_months(self, mock_connectapi):
+        """Test that a week crossing a month boundary merges both months."""
+        # Import the actual function, not the FunctionTool wrapper
+        import garmin_workouts_mcp.main as main_module
+
+        get_calendar_func = main_module.get_calendar.fn
+
+        # Arrange
+        months = {
+            "/calendar-service/year/2025/month/5": {
+                "calendarItems": [
+                    {"id": 1, "itemType": "workout", "date": "2025-06-30"}
+                ]
+            },
+            "/calendar-service/year/2025/month/6": {
+                "calendarItems": [
+                    {"id": 2, "itemType": "workout", "date": "2025-07-06"}
+                ]
+            },
+        }
+        mock_connectapi.side_effect = lambda path: months[path]
+
+        # Act
+        result = await get_calendar_func(2025, 7, 3)
+
+        # Assert
+        assert mock_connectapi.call_count == 2
+        assert [item["id"] for item in result["calendar"]["calendarItems"]] == [1, 2]
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_get_calendar_weeks_share_cached_month(self, mock_connectapi):
+        """Test that weekly views of the same month reuse one monthly fetch."""
+        # Import the actual function, not the FunctionTool wrapper
+        import garmin_workouts_mcp.main as main_module
+
+        get_calendar_func = main_module.get_calendar.fn
+
+        # Arrange
+        mock_connectapi.return_value = {"calendarItems": []}
+
+        # Act
+        for day in (9, 16, 23):
+            await get_calendar_func(2025, 6, day)
+        await get_calendar_func(2025, 6)
+
+        # Assert
+        mock_connectapi.assert_called_once_with("/calendar-service/year/2025/month/5")
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_schedule_workout_invalidates_month(self, mock_connectapi):
+        """Test that scheduling a workout refreshes the affected cached month."""
+        # Import the actual function, not the FunctionTool wrapper
+        import garmin_workouts_mcp.main as main_module
+
+        get_calendar_func = main_module.get_calendar.fn
+        schedule_workout_func = main_module.schedule_workout.fn
+
+        # Arrange
+        mock_connectapi.side_effect = [
+            {"calendarItems": []},
+            {"workoutScheduleId": 7},
+            {"calendarItems": [{"id": 7, "itemType": "workout", "date": "2025-06-12"}]},
+        ]
+
+        # Act
+        await get_calendar_func(2025, 6, 10)
+        await schedule_workout_func("1", "2025-06-12")
+        result = await get_calendar_func(2025, 6, 10)
+
+        # Assert
+        assert mock_connectapi.call_count == 3
+        assert len(result["calendar"]["calendarItems"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_get_calendar_day_out_of_range_for_month(self):
+        """Test get_calendar with a day that does not exist in the month."""
+        # Import the actual function, not the FunctionTool wrapper
+        import garmin_workouts_mcp.main as main_module
+
+        get_calendar_func = main_module.get_calendar.fn
+
+        with pytest.raises(ValueError, match="Day 30 is out of range for 2025-02"):
+            await get_calendar_func(2025, 2, 30)
+
+    @pytest.mark.asyncio
+    async def test_get_calendar_invalid_year(self):
         """Test get_calendar with invalid year."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -808,15 +1228,16 @@ class TestGetCalendar:
         with pytest.raises(
             ValueError, match="Year must be between 1900 and 2100, got 1899"
         ):
-            get_calendar_func(1899, 6)
+            await get_calendar_func(1899, 6)
 
         # Test year too high
         with pytest.raises(
             ValueError, match="Year must be between 1900 and 2100, got 2101"
         ):
-            get_calendar_func(2101, 6)
+            await get_calendar_func(2101, 6)
 
-    def test_get_calendar_invalid_month(self):
+    @pytest.mark.asyncio
+    async def test_get_calendar_invalid_month(self):
         """Test get_calendar with invalid month."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -825,13 +1246,14 @@ class TestGetCalendar:
 
         # Test month too low
         with pytest.raises(ValueError, match="Month must be between 1 and 12, got 0"):
-            get_calendar_func(2025, 0)
+            await get_calendar_func(2025, 0)
 
         # Test month too high
         with pytest.raises(ValueError, match="Month must be between 1 and 12, got 13"):
-            get_calendar_func(2025, 13)
+            await get_calendar_func(2025, 13)
 
-    def test_get_calendar_invalid_day(self):
+    @pytest.mark.asyncio
+    async def test_get_calendar_invalid_day(self):
         """Test get_calendar with invalid day."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -840,14 +1262,15 @@ class TestGetCalendar:
 
         # Test day too low
         with pytest.raises(ValueError, match="Day must be between 1 and 31, got 0"):
-            get_calendar_func(2025, 6, 0)
+            await get_calendar_func(2025, 6, 0)
 
         # Test day too high
         with pytest.raises(ValueError, match="Day must be between 1 and 31, got 32"):
-            get_calendar_func(2025, 6, 32)
+            await get_calendar_func(2025, 6, 32)
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_get_calendar_empty_response(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_get_calendar_empty_response(self, mock_connectapi):
         """Test get_calendar when API returns empty response."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -858,14 +1281,15 @@ class TestGetCalendar:
         mock_connectapi.return_value = None
 
         # Act
-        result = get_calendar_func(2025, 6)
+        result = await get_calendar_func(2025, 6)
 
         # Assert
         assert result["calendar"] is None
         assert result["view_type"] == "month"
 
-    @patch("garmin_workouts_mcp.main.garth.connectapi")
-    def test_get_calendar_api_error(self, mock_connectapi):
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_get_calendar_api_error(self, mock_connectapi):
         """Test get_calendar when API raises an exception."""
         # Import the actual function, not the FunctionTool wrapper
         import garmin_workouts_mcp.main as main_module
@@ -877,6 +1301,767 @@ class TestGetCalendar:
 
         # Act & Assert
         with pytest.raises(Exception, match="API connection failed"):
-            get_calendar_func(2025, 6)
+            await get_calendar_func(2025, 6)
 
         mock_connectapi.assert_called_once_with("/calendar-service/year/2025/month/5")
+
+
+class TestResponseCaching:
+    """Test cases for caching of read-only tools and invalidation on writes."""
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_get_activity_cached(self, mock_connectapi):
+        """Test that repeated get_activity calls hit Garmin once."""
+        import garmin_workouts_mcp.main as main_module
+
+        get_activity_func = main_module.get_activity.fn
+        get_cache_stats_func = main_module.get_cache_stats.fn
+
+        # Arrange
+        mock_connectapi.return_value = {"activityId": "1"}
+
+        # Act
+        first = await get_activity_func("1")
+        second = await get_activity_func("1")
+
+        # Assert
+        mock_connectapi.assert_called_once_with("/activity-service/activity/1")
+        assert first == second == {"activityId": "1"}
+        stats = get_cache_stats_func()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_errors_not_cached(self, mock_connectapi):
+        """Test that a failed call is retried on the next request."""
+        import garmin_workouts_mcp.main as main_module
+
+        get_workout_func = main_module.get_workout.fn
+
+        # Arrange
+        mock_connectapi.side_effect = [Exception("API Error"), {"workoutId": "1"}]
+
+        # Act & Assert
+        with pytest.raises(Exception, match="API Error"):
+            await get_workout_func("1")
+        assert await get_workout_func("1") == {"workout": {"workoutId": "1"}}
+        assert mock_connectapi.call_count == 2
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.make_payload")
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_upload_invalidates_workout_list(
+        self, mock_connectapi, mock_make_payload
+    ):
+        """Test that uploading a workout refreshes the cached workout list."""
+        import garmin_workouts_mcp.main as main_module
+
+        list_workouts_func = main_module.list_workouts.fn
+        upload_workout_func = main_module.upload_workout.fn
+
+        # Arrange
+        mock_make_payload.return_value = {}
+        mock_connectapi.side_effect = [[], {"workoutId": "2"}, [{"workoutId": "2"}]]
+
+        # Act
+        await list_workouts_func()
+        await upload_workout_func({"name": "W", "type": "running", "steps": []})
+        result = await list_workouts_func()
+
+        # Assert
+        assert result == {"workouts": [{"workoutId": "2"}]}
+        assert mock_connectapi.call_count == 3
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_delete_invalidates_workout(self, mock_connectapi):
+        """Test that deleting a workout drops its cached details."""
+        import garmin_workouts_mcp.main as main_module
+
+        get_workout_func = main_module.get_workout.fn
+        delete_workout_func = main_module.delete_workout.fn
+
+        # Arrange
+        mock_connectapi.side_effect = [{"workoutId": "1"}, None, None]
+
+        # Act
+        await get_workout_func("1")
+        await delete_workout_func("1")
+        result = await get_workout_func("1")
+
+        # Assert
+        assert result == {"workout": None}
+        assert mock_connectapi.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_list_in_flight_during_upload_not_cached(self):
+        """Test that a list fetched during an upload is neither cached nor shared."""
+        import asyncio
+        from unittest.mock import MagicMock
+
+        import httpx
+
+        import garmin_workouts_mcp.client as client_module
+        import garmin_workouts_mcp.main as main_module
+
+        list_workouts_func = main_module.list_workouts.fn
+        upload_workout_func = main_module.upload_workout.fn
+
+        # Arrange
+        workouts = ["old"]
+        first_list_sent = asyncio.Event()
+        release_first_list = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "POST":
+                workouts.append("new")
+                return httpx.Response(200, json={"workoutId": "new"})
+            snapshot = list(workouts)
+            if not first_list_sent.is_set():
+                first_list_sent.set()
+                await release_first_list.wait()
+            return httpx.Response(200, json=snapshot)
+
+        garth_client = MagicMock()
+        garth_client.domain = "garmin.com"
+        garth_client.oauth2_token.expired = False
+        client_module._client = client_module.GarminClient(
+            garth_client, transport=httpx.MockTransport(handler)
+        )
+        workout_data = {
+            "name": "Easy Run",
+            "type": "running",
+            "steps": [{"stepType": "interval", "stepDuration": 600}],
+        }
+
+        # Act
+        slow_list = asyncio.ensure_future(list_workouts_func())
+        await first_list_sent.wait()
+        await upload_workout_func(workout_data)
+        list_after_upload = asyncio.ensure_future(list_workouts_func())
+        await asyncio.sleep(0.01)
+        release_first_list.set()
+        results = await asyncio.gather(slow_list, list_after_upload)
+        cached = await list_workouts_func()
+        await client_module.close_client()
+
+        # Assert
+        assert results[0] == {"workouts": ["old"]}
+        assert results[1] == {"workouts": ["old", "new"]}
+        assert cached == {"workouts": ["old", "new"]}
+
+
+class TestBatchFetch:
+    """Test cases for the get_workouts and get_activities tools."""
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_get_workouts_keyed_with_errors(self, mock_connectapi):
+        """Test that results are keyed by ID and failures are reported per item."""
+        import garmin_workouts_mcp.main as main_module
+
+        get_workouts_func = main_module.get_workouts.fn
+
+        # Arrange
+        async def fake_connectapi(path):
+            if path.endswith("/2"):
+                raise RuntimeError("Not found")
+            return {"workoutId": path.rsplit("/", 1)[1]}
+
+        mock_connectapi.side_effect = fake_connectapi
+
+        # Act
+        result = await get_workouts_func(["1", "2", "3", "1"])
+
+        # Assert
+        assert result == {
+            "workouts": {"1": {"workoutId": "1"}, "3": {"workoutId": "3"}},
+            "errors": {"2": "Not found"},
+        }
+        assert mock_connectapi.call_count == 3
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_get_activities_with_fields(self, mock_connectapi):
+        """Test batch activity retrieval with a projection."""
+        import garmin_workouts_mcp.main as main_module
+
+        get_activities_func = main_module.get_activities.fn
+
+        # Arrange
+        mock_connectapi.side_effect = lambda path: {
+            "activityId": path.rsplit("/", 1)[1],
+            "activityName": "Run",
+            "metadataDTO": {},
+        }
+
+        # Act
+        result = await get_activities_func(["10", "11"], fields="activityName")
+
+        # Assert
+        assert result == {
+            "activities": {
+                "10": {"activityName": "Run"},
+                "11": {"activityName": "Run"},
+            },
+            "errors": {},
+        }
+
+    @pytest.mark.asyncio
+    async def test_batch_id_limits(self):
+        """Test that empty and oversized ID lists are rejected."""
+        import garmin_workouts_mcp.main as main_module
+
+        get_activities_func = main_module.get_activities.fn
+
+        with pytest.raises(ValueError, match="At least one ID must be provided"):
+            await get_activities_func([])
+        with pytest.raises(ValueError, match="At most 100 IDs"):
+            await get_activities_func([str(i) for i in range(101)])
+
+
+class TestCompileWorkout:
+    """Test cases for the compile_workout tool."""
+
+    @pytest.mark.asyncio
+    async def test_compile_structured_workout(self):
+        """A fully understood description compiles without fallback."""
+        import garmin_workouts_mcp.main as main_module
+
+        result = await main_module.compile_workout.fn(
+            "3km warmup at zone 2, 4x(5min at 173-180bpm, 3min jog), 2km cooldown",
+            name="Threshold",
+        )
+
+        workout = result["workout"]
+        assert result["fallback"] is False
+        assert result["unparsed"] == []
+        assert workout["name"] == "Threshold"
+        assert [step["stepType"] for step in workout["steps"]] == [
+            "warmup",
+            "repeat",
+            "cooldown",
+        ]
+        repeat = workout["steps"][1]
+        assert repeat["numberOfIterations"] == 4
+        assert repeat["steps"][0]["target"] == {
+            "type": "heart rate",
+            "value": [173, 180],
+            "unit": "bpm",
+        }
+        # 3km + 2km at the default pace, plus 4 x 8min
+        assert result["estimatedDurationInSecs"] == 1800 + 4 * 480
+        assert "workoutId" not in result
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_compile_and_upload(self, mock_connectapi):
+        """With upload=True the compiled workout is uploaded."""
+        import garmin_workouts_mcp.main as main_module
+
+        mock_connectapi.return_value = {"workoutId": 7}
+
+        result = await main_module.compile_workout.fn(
+            "10km easy run at zone 2", upload=True
+        )
+
+        assert result["workoutId"] == "7"
+        args, kwargs = mock_connectapi.call_args
+        assert args == ("/workout-service/workout",)
+        assert kwargs["method"] == "POST"
+        assert kwargs["json"]["workoutName"] == "10km easy run at zone 2"
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_compile_reports_fallback_and_skips_upload(self, mock_connectapi):
+        """Parts that are not understood are reported and nothing is uploaded."""
+        import garmin_workouts_mcp.main as main_module
+
+        result = await main_module.compile_workout.fn(
+            "hill sprints, 10min easy", sport="cycling", upload=True
+        )
+
+        assert result["fallback"] is True
+        assert result["unparsed"] == ["hill sprints"]
+        assert result["workout"]["type"] == "cycling"
+        assert "workoutId" not in result
+        mock_connectapi.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    @pytest.mark.parametrize(
+        "description, unparsed",
+        [
+            ("4x(5min at zone 2, flamingo dance)", ["flamingo dance"]),
+            ("10x400m at 5k pace", ["10x400m at 5k pace"]),
+        ],
+    )
+    async def test_compile_reports_dropped_repeat_parts(
+        self, mock_connectapi, description, unparsed
+    ):
+        """Steps dropped from a repeat, or a repeat compiled as one step, are a fallback."""
+        import garmin_workouts_mcp.main as main_module
+
+        result = await main_module.compile_workout.fn(description, upload=True)
+
+        assert result["fallback"] is True
+        assert result["unparsed"] == unparsed
+        assert "workoutId" not in result
+        mock_connectapi.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_compile_default_name_keeps_repeat_whole(self):
+        """The default name is the first step, not split inside a repeat."""
+        import garmin_workouts_mcp.main as main_module
+
+        result = await main_module.compile_workout.fn(
+            "4x(5min at zone 4, 3min jog), 10min easy"
+        )
+
+        assert result["fallback"] is False
+        assert result["workout"]["name"] == "4x(5min at zone 4, 3min jog)"
+
+    @pytest.mark.asyncio
+    async def test_compile_unsupported_sport(self):
+        """An unsupported sport is rejected."""
+        import garmin_workouts_mcp.main as main_module
+
+        with pytest.raises(ValueError, match="Unsupported sport type"):
+            await main_module.compile_workout.fn("10km easy", sport="rowing")
+
+
+class TestUploadWorkouts:
+    """Test cases for the upload_workouts tool."""
+
+    @staticmethod
+    def workout(name, duration=600):
+        return {
+            "name": name,
+            "type": "running",
+            "steps": [
+                {
+                    "stepName": "Run",
+                    "stepType": "interval",
+                    "endConditionType": "time",
+                    "stepDuration": duration,
+                }
+            ],
+        }
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_upload_workouts_partial_failure(self, mock_connectapi):
+        """Test that results are reported per workout and failures don't stop others."""
+        import garmin_workouts_mcp.main as main_module
+
+        upload_workouts_func = main_module.upload_workouts.fn
+
+        # Arrange
+        async def fake_connectapi(path, method, json):
+            if json["workoutName"] == "Tue":
+                raise RuntimeError("Service unavailable")
+            return {"workoutId": 100 + len(json["workoutName"])}
+
+        mock_connectapi.side_effect = fake_connectapi
+
+        # Act
+        result = await upload_workouts_func(
+            [self.workout("Mon"), self.workout("Tue"), self.workout("Wed!")]
+        )
+
+        # Assert
+        assert result == {
+            "results": [
+                {"index": 0, "name": "Mon", "workoutId": "103"},
+                {"index": 1, "name": "Tue", "error": "Service unavailable"},
+                {"index": 2, "name": "Wed!", "workoutId": "104"},
+            ],
+            "uploaded": 2,
+            "failed": 1,
+        }
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_upload_workouts_validates_before_upload(self, mock_connectapi):
+        """Test that any invalid workout aborts the batch before network I/O."""
+        import garmin_workouts_mcp.main as main_module
+
+        upload_workouts_func = main_module.upload_workouts.fn
+
+        # Act & Assert
+        with pytest.raises(ValueError) as exc_info:
+            await upload_workouts_func(
+                [
+                    self.workout("Mon"),
+                    self.workout("Tue", duration=0),
+                    {"name": "Wed", "type": "rowing", "steps": []},
+                ]
+            )
+
+        message = str(exc_info.value)
+        assert (
+            "workouts[1].steps[0].stepDuration: Invalid or missing stepDuration"
+            in message
+        )
+        assert "workouts[2].type: Unsupported sport type: rowing" in message
+        assert "workouts[0]" not in message
+        mock_connectapi.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_upload_workouts_empty(self):
+        """Test that an empty list is rejected."""
+        import garmin_workouts_mcp.main as main_module
+
+        upload_workouts_func = main_module.upload_workouts.fn
+
+        with pytest.raises(ValueError, match="At least one workout must be provided"):
+            await upload_workouts_func([])
+
+
+class TestActivityIndex:
+    """Test cases for the sync_activities and query_activities tools."""
+
+    @staticmethod
+    def activities(ids):
+        return [
+            {
+                "activityId": i,
+                "activityName": f"Run {i}",
+                "activityType": {"typeKey": "running"},
+                "startTimeLocal": f"2025-06-{i:02d} 07:00:00",
+                "distance": 1000.0 * i,
+            }
+            for i in ids
+        ]
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_incremental_sync_fetches_only_new(self, mock_connectapi):
+        """Test that a second sync stops at the first already indexed activity."""
+        import garmin_workouts_mcp.main as main_module
+
+        sync_activities_func = main_module.sync_activities.fn
+        query_activities_func = main_module.query_activities.fn
+
+        # Arrange: newest first, as returned by Garmin
+        history = self.activities(range(20, 0, -1))
+        mock_connectapi.side_effect = lambda path, method, params: history[
+            params["start"] : params["start"] + params["limit"]
+        ]
+
+        # Act
+        first = await sync_activities_func()
+        history[:0] = self.activities([22, 21])
+        second = await sync_activities_func()
+
+        # Assert
+        assert first["added"] == 20
+        assert second == {
+            "added": 2,
+            "total": 22,
+            "latestStartTime": "2025-06-22 07:00:00",
+        }
+        assert mock_connectapi.call_count == 2
+
+        mock_connectapi.reset_mock()
+        result = query_activities_func(
+            startDate="2025-06-10", endDate="2025-06-12", fields="activityId"
+        )
+        assert result == {
+            "activities": [{"activityId": 12}, {"activityId": 11}, {"activityId": 10}],
+            "count": 3,
+        }
+        mock_connectapi.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_full_sync_drops_deleted(self, mock_connectapi):
+        """Test that a full sync removes activities no longer on Garmin Connect."""
+        import garmin_workouts_mcp.main as main_module
+
+        sync_activities_func = main_module.sync_activities.fn
+
+        # Arrange
+        history = self.activities([3, 2, 1])
+        mock_connectapi.side_effect = lambda path, method, params: history[
+            params["start"] : params["start"] + params["limit"]
+        ]
+        await sync_activities_func()
+        del history[1]
+
+        # Act
+        result = await sync_activities_func(full=True)
+
+        # Assert
+        assert result["added"] == 2
+        assert result["total"] == 2
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_interrupted_sync_resumes_without_gap(self, mock_connectapi):
+        """Test that a sync failing partway is completed by the next incremental sync."""
+        from datetime import datetime, timedelta
+
+        import garmin_workouts_mcp.main as main_module
+        from garmin_workouts_mcp.client import GarminAPIError
+
+        sync_activities_func = main_module.sync_activities.fn
+
+        # Arrange: 250 activities, one every 6 hours, newest first
+        first_start = datetime(2025, 1, 1, 7)
+        history = [
+            {
+                "activityId": i,
+                "activityName": f"Run {i}",
+                "activityType": {"typeKey": "running"},
+                "startTimeLocal": (first_start + timedelta(hours=6 * i)).strftime(
+                    "%Y-%m-%d %H:%M:%S"
+                ),
+            }
+            for i in range(250, 0, -1)
+        ]
+        failing = {"start": 100}
+
+        def list_activities(path, method, params):
+            if params["start"] == failing["start"] and "endDate" not in params:
+                raise GarminAPIError(
+                    "Garmin API error 503: unavailable", status_code=503
+                )
+            matching = [
+                a
+                for a in history
+                if a["startTimeLocal"][:10] <= params.get("endDate", "9999")
+            ]
+            return matching[params["start"] : params["start"] + params["limit"]]
+
+        mock_connectapi.side_effect = list_activities
+
+        # Act: the first sync fails on page 2, after page 1 was stored
+        with pytest.raises(GarminAPIError):
+            await sync_activities_func()
+        assert main_module.get_activity_store().count() == 100
+
+        failing["start"] = None
+        history[:0] = [
+            {**history[0], "activityId": 252, "startTimeLocal": "2025-03-20 07:00:00"},
+            {**history[0], "activityId": 251, "startTimeLocal": "2025-03-19 07:00:00"},
+        ]
+        result = await sync_activities_func()
+
+        # Assert: the new activities and the rest of the history are stored
+        assert result["added"] == 152
+        assert result["total"] == 252
+        # The resumed pass lists activities from the day of the last stored one
+        assert any(
+            "endDate" in c.kwargs["params"] for c in mock_connectapi.call_args_list
+        )
+
+        mock_connectapi.reset_mock()
+        again = await sync_activities_func()
+        assert again["added"] == 0
+        assert mock_connectapi.call_count == 1
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_get_training_load(self, mock_connectapi):
+        """Test that training load is computed from the synced index as a compact table."""
+        import garmin_workouts_mcp.main as main_module
+
+        # Arrange
+        history = [
+            {**activity, "duration": 1800.0, "activityTrainingLoad": 50.0}
+            for activity in self.activities(range(20, 0, -1))
+        ]
+        mock_connectapi.side_effect = lambda path, method, params: history[
+            params["start"] : params["start"] + params["limit"]
+        ]
+
+        # Act
+        result = await main_module.get_training_load.fn(weeks=2, endDate="2025-06-15")
+
+        # Assert: 2025-06-02 .. 2025-06-15, two Monday-based weeks
+        assert result["startDate"] == "2025-06-02"
+        rows = result["weekly"]["rows"]
+        assert [row[:5] for row in rows] == [
+            ["2025-06-02", 7, sum(range(2, 9)), 3.5, 350.0],
+            ["2025-06-09", 7, sum(range(9, 16)), 3.5, 350.0],
+        ]
+        assert result["current"]["tsb"] == rows[-1][7]
+        assert "daily" not in result
+
+        # A second call without sync reads only the local index
+        mock_connectapi.reset_mock()
+        again = await main_module.get_training_load.fn(
+            weeks=2, endDate="2025-06-15", sync=False
+        )
+        assert again == result
+        mock_connectapi.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_training_load_invalid_weeks(self):
+        """Test that an out-of-range number of weeks is rejected."""
+        import garmin_workouts_mcp.main as main_module
+
+        with pytest.raises(ValueError, match="weeks must be between 1 and 104"):
+            await main_module.get_training_load.fn(weeks=0, sync=False)
+
+    def test_query_activities_invalid_date(self):
+        """Test that a malformed endDate is rejected."""
+        import garmin_workouts_mcp.main as main_module
+
+        with pytest.raises(ValueError, match=r"endDate must be in ISO format"):
+            main_module.query_activities.fn(endDate="June")
+
+
+class TestServerMetrics:
+    """Test cases for tool instrumentation and the get_server_metrics tool."""
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_tool_calls_and_stages_recorded(self, mock_connectapi):
+        """Test that tool calls, failures and make_payload runs show up in the metrics."""
+        import garmin_workouts_mcp.main as main_module
+
+        mock_connectapi.side_effect = [{"workoutId": 1}, Exception("API Error")]
+        workout_data = {
+            "name": "Easy Run",
+            "type": "running",
+            "steps": [
+                {
+                    "stepName": "Run",
+                    "stepType": "interval",
+                    "endConditionType": "time",
+                    "stepDuration": 600,
+                    "target": {"type": "no target"},
+                }
+            ],
+        }
+
+        # Act
+        await main_module.upload_workout.fn(workout_data)
+        with pytest.raises(Exception, match="API Error"):
+            await main_module.get_workout.fn("1")
+        metrics = main_module.get_server_metrics.fn()
+
+        # Assert
+        assert metrics["tools"]["upload_workout"]["count"] == 1
+        assert metrics["tools"]["upload_workout"]["errors"] == 0
+        assert metrics["tools"]["get_workout"]["errors"] == 1
+        assert metrics["stages"]["make_payload"]["count"] == 1
+        assert metrics["tools"]["upload_workout"]["p50Ms"] is not None
+        assert "cache" in metrics and "rateLimiter" in metrics
+        assert "prometheusFile" not in metrics
+
+    def test_prometheus_file_written(self, monkeypatch, tmp_path):
+        """Test that the Prometheus dump is refreshed when a metrics file is configured."""
+        import garmin_workouts_mcp.main as main_module
+        from garmin_workouts_mcp.metrics import METRICS_FILE_ENV
+
+        path = tmp_path / "metrics.prom"
+        monkeypatch.setenv(METRICS_FILE_ENV, str(path))
+
+        main_module.get_cache_stats.fn()
+        metrics = main_module.get_server_metrics.fn()
+
+        assert metrics["prometheusFile"] == str(path)
+        assert (
+            'garmin_mcp_tool_duration_seconds_count{tool="get_cache_stats"} 1'
+            in path.read_text()
+        )
+
+
+class TestAthletes:
+    """Test cases for tools acting on behalf of several athletes."""
+
+    @pytest.fixture(autouse=True)
+    def athlete_clients(self, monkeypatch):
+        """Create athlete clients without saved tokens."""
+        from unittest.mock import MagicMock
+
+        import garmin_workouts_mcp.client as client_module
+
+        monkeypatch.setattr(
+            client_module,
+            "create_athlete_client",
+            lambda athlete: client_module.GarminClient(MagicMock()),
+        )
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_cache_partitioned_by_athlete(self, mock_connectapi):
+        """Test that one athlete's cached responses are never served to another."""
+        import garmin_workouts_mcp.main as main_module
+        from garmin_workouts_mcp.athletes import current_athlete
+
+        get_workout_func = main_module.get_workout.fn
+        seen = []
+
+        async def connectapi(path, **kwargs):
+            seen.append(current_athlete.get())
+            return {"workoutId": "1", "owner": current_athlete.get()}
+
+        mock_connectapi.side_effect = connectapi
+
+        # Act
+        jane = await get_workout_func("1", athlete="jane")
+        joe = await get_workout_func("1", athlete="joe")
+        jane_again = await get_workout_func("1", athlete="jane")
+        default = await get_workout_func("1")
+
+        # Assert
+        assert seen == ["jane", "joe", None]
+        assert jane == jane_again == {"workout": {"workoutId": "1", "owner": "jane"}}
+        assert joe["workout"]["owner"] == "joe"
+        assert default["workout"]["owner"] is None
+        assert main_module.get_cache_stats.fn(athlete="jane")["hits"] == 1
+        assert main_module.get_cache_stats.fn(athlete="joe")["hits"] == 0
+
+    @pytest.mark.asyncio
+    @patch("garmin_workouts_mcp.main.connectapi", new_callable=AsyncMock)
+    async def test_activity_index_per_athlete(self, mock_connectapi, tmp_path):
+        """Test that each athlete's activities are synced into their own index."""
+        import garmin_workouts_mcp.main as main_module
+
+        mock_connectapi.side_effect = lambda path, method, params: (
+            TestActivityIndex.activities([1, 2]) if params["start"] == 0 else []
+        )
+
+        # Act
+        await main_module.sync_activities.fn(athlete="jane")
+
+        # Assert
+        assert main_module.query_activities.fn(athlete="jane")["count"] == 2
+        assert main_module.query_activities.fn(athlete="joe")["count"] == 0
+        assert main_module.query_activities.fn()["count"] == 0
+        assert (tmp_path / "athletes" / "jane" / "activities.sqlite3").exists()
+
+    @pytest.mark.asyncio
+    async def test_invalid_athlete_rejected(self):
+        """Test that an athlete identifier that is not a safe name is refused."""
+        import garmin_workouts_mcp.main as main_module
+
+        with pytest.raises(ValueError, match="Invalid athlete"):
+            await main_module.list_workouts.fn(athlete="../other")
+
+    @patch("garth.Client")
+    @patch.dict(
+        "os.environ",
+        {
+            "GARMIN_EMAIL": "jane@example.com",
+            "GARMIN_PASSWORD": "secret",
+            "GARTH_HOME": "/tokens",
+        },
+    )
+    def test_login_athlete(self, mock_garth_client):
+        """Test that --login-athlete saves the athlete's tokens and does not start the server."""
+        import garmin_workouts_mcp.main as main_module
+
+        with patch.object(main_module.mcp, "run") as mock_run:
+            main_module.main(["--login-athlete", "jane"])
+
+        garth_client = mock_garth_client.return_value
+        garth_client.login.assert_called_once_with("jane@example.com", "secret")
+        garth_client.dump.assert_called_once_with("/tokens/athletes/jane")
+        mock_run.assert_not_called()
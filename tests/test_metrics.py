@@ -0,0 +1,115 @@
+import pytest
+
+from garmin_workouts_mcp.fastjson import dumps_str
+from garmin_workouts_mcp.metrics import (
+    LatencyHistogram,
+    MetricsRegistry,
+    endpoint_label,
+    get_metrics,
+    instrument_tool,
+    timed_serializer,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_endpoint_label_collapses_ids():
+    assert (
+        endpoint_label("/workout-service/workout/123")
+        == "/workout-service/workout/{id}"
+    )
+    assert (
+        endpoint_label("/calendar-service/year/2025/month/0")
+        == "/calendar-service/year/{id}/month/{id}"
+    )
+    assert endpoint_label("/workout-service/workouts") == "/workout-service/workouts"
+
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for _ in range(90):
+        histogram.observe(0.02)
+    for _ in range(10):
+        histogram.observe(0.8)
+
+    assert 0.01 <= histogram.percentile(50) <= 0.025
+    assert histogram.percentile(90) <= 0.025
+    assert 0.5 <= histogram.percentile(99) <= 0.8
+    summary = histogram.summary()
+    assert summary["count"] == 100
+    assert summary["maxMs"] == 800.0
+
+
+def test_empty_histogram():
+    assert LatencyHistogram().percentile(50) is None
+    assert LatencyHistogram().summary()["p99Ms"] is None
+
+
+def test_time_stage_records_errors():
+    clock = FakeClock()
+    metrics = MetricsRegistry(clock=clock)
+
+    with metrics.time_stage("make_payload"):
+        clock.now += 0.004
+    with pytest.raises(ValueError), metrics.time_stage("make_payload"):
+        raise ValueError("bad step")
+
+    stage = metrics.snapshot()["stages"]["make_payload"]
+    assert stage["count"] == 2
+    assert stage["errors"] == 1
+    assert stage["maxMs"] == 4.0
+
+
+def test_prometheus_dump(tmp_path):
+    metrics = MetricsRegistry()
+    metrics.observe_request("GET", "/workout-service/workout/1", 0.03, size=120)
+    metrics.observe_request("GET", "/workout-service/workout/2", 0.07, error=True)
+
+    path = metrics.write_prometheus(str(tmp_path / "out" / "metrics.prom"))
+    with open(path) as f:
+        text = f.read()
+
+    labels = 'endpoint="GET /workout-service/workout/{id}"'
+    assert "# TYPE garmin_mcp_request_duration_seconds histogram" in text
+    assert f'garmin_mcp_request_duration_seconds_bucket{{{labels},le="0.05"}} 1' in text
+    assert f'garmin_mcp_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"garmin_mcp_request_errors_total{{{labels}}} 1" in text
+    assert f"garmin_mcp_request_response_bytes_total{{{labels}}} 120" in text
+    assert "garmin_mcp_tool" not in text
+
+
+@pytest.mark.asyncio
+async def test_instrument_tool():
+    @instrument_tool
+    async def fetch(fail: bool = False) -> dict:
+        if fail:
+            raise RuntimeError("boom")
+        return {"a": 1}
+
+    @instrument_tool
+    def prompt() -> str:
+        return "héllo"
+
+    assert await fetch() == {"a": 1}
+    with pytest.raises(RuntimeError):
+        await fetch(fail=True)
+    assert prompt() == "héllo"
+
+    tools = get_metrics().snapshot()["tools"]
+    assert tools["fetch"]["count"] == 2
+    assert tools["fetch"]["errors"] == 1
+    assert tools["prompt"]["count"] == 1
+    assert fetch.__name__ == "fetch"
+
+
+def test_timed_serializer():
+    serialize = timed_serializer(dumps_str)
+
+    assert serialize({"a": 1}) == '{"a":1}'
+    assert get_metrics().snapshot()["stages"]["json_encode"]["count"] == 1
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from fastmcp import Client, FastMCP
+
+from garmin_workouts_mcp.fastjson import dumps_str
+from garmin_workouts_mcp.metrics import get_metrics, timed_serializer
+from garmin_workouts_mcp.middleware import (
+    SessionMetricsMiddleware,
+    ToolConcurrencyMiddleware,
+    ToolResultSizeMiddleware,
+)
+
+
+def make_server(*middleware):
+    server = FastMCP(
+        name="test",
+        middleware=list(middleware),
+        tool_serializer=timed_serializer(dumps_str),
+    )
+    state = {"running": 0, "peak": 0}
+
+    @server.tool
+    async def slow() -> str:
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(0.02)
+        state["running"] -= 1
+        return "done"
+
+    @server.tool
+    def document() -> list:
+        return [{"name": "Zürich"}]
+
+    @server.tool
+    def fail() -> str:
+        raise ValueError("boom")
+
+    return server, state
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_spans_sessions():
+    server, state = make_server(ToolConcurrencyMiddleware(2))
+
+    async def session():
+        async with Client(server) as client:
+            await asyncio.gather(*(client.call_tool("slow", {}) for _ in range(3)))
+
+    await asyncio.gather(session(), session())
+
+    assert state["peak"] == 2
+    assert get_metrics().snapshot()["stages"]["tool_queue"]["count"] == 6
+
+
+def test_concurrency_limit_must_be_positive():
+    with pytest.raises(ValueError):
+        ToolConcurrencyMiddleware(0)
+
+
+@pytest.mark.asyncio
+async def test_session_metrics():
+    server, _ = make_server(SessionMetricsMiddleware())
+
+    async with Client(server) as first:
+        await first.call_tool("slow", {})
+        await first.call_tool("fail", {}, raise_on_error=False)
+    async with Client(server) as second:
+        await second.call_tool("slow", {})
+
+    sessions = list(get_metrics().snapshot()["sessions"].values())
+    assert len(sessions) == 2
+    # Most recently active session first
+    assert sessions[0]["count"] == 1
+    assert sessions[1]["count"] == 2
+    assert sessions[1]["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_tool_result_size_from_serialized_content():
+    server, _ = make_server(ToolResultSizeMiddleware())
+
+    async with Client(server) as client:
+        await client.call_tool("document", {})
+        await client.call_tool("slow", {})
+
+    snapshot = get_metrics().snapshot()
+    assert snapshot["tools"]["document"]["bytes"] == len('[{"name":"Zürich"}]'.encode())
+    assert snapshot["tools"]["slow"]["bytes"] == len(b"done")
+    # Encoded once, by the server's serializer; strings are sent as is
+    assert snapshot["stages"]["json_encode"]["count"] == 1
@@ -0,0 +1,81 @@
+import asyncio
+from itertools import chain
+
+import pytest
+
+from garmin_workouts_mcp.pagination import iter_pages
+
+
+def make_fetcher(total: int, delay: float = 0.0):
+    """Fake paged endpoint over `total` numbered items, recording requests."""
+    requests = []
+
+    async def fetch_page(start, limit):
+        requests.append((start, limit))
+        await asyncio.sleep(delay)
+        return list(range(start, min(start + limit, total)))
+
+    return fetch_page, requests
+
+
+async def collect(pages):
+    return [page async for page in pages]
+
+
+@pytest.mark.asyncio
+async def test_walks_all_pages_in_order():
+    fetch_page, _ = make_fetcher(250)
+    pages = await collect(iter_pages(fetch_page, page_size=100))
+
+    assert [len(page) for page in pages] == [100, 100, 50]
+    assert list(chain.from_iterable(pages)) == list(range(250))
+
+
+@pytest.mark.asyncio
+async def test_max_items_bounds_last_page():
+    fetch_page, requests = make_fetcher(1000)
+    pages = await collect(
+        iter_pages(fetch_page, page_size=100, start=10, max_items=150)
+    )
+
+    assert list(chain.from_iterable(pages)) == list(range(10, 160))
+    assert requests == [(10, 100), (110, 50)]
+
+
+@pytest.mark.asyncio
+async def test_exact_multiple_stops_on_empty_page():
+    fetch_page, _ = make_fetcher(200)
+    pages = await collect(iter_pages(fetch_page, page_size=100, prefetch=1))
+
+    assert [len(page) for page in pages] == [100, 100]
+
+
+@pytest.mark.asyncio
+async def test_prefetch_overlaps_requests():
+    fetch_page, _ = make_fetcher(400, delay=0.05)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    pages = await collect(iter_pages(fetch_page, page_size=100, prefetch=4))
+    elapsed = loop.time() - started
+
+    assert len(pages) == 4
+    # Sequential fetching of five pages would take at least 0.25s
+    assert elapsed < 0.2
+
+
+@pytest.mark.asyncio
+async def test_error_propagates():
+    async def fetch_page(start, limit):
+        if start >= 100:
+            raise RuntimeError("boom")
+        return list(range(limit))
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await collect(iter_pages(fetch_page, page_size=100))
+
+
+@pytest.mark.asyncio
+async def test_invalid_page_size():
+    fetch_page, _ = make_fetcher(10)
+    with pytest.raises(ValueError, match="page_size must be positive"):
+        await collect(iter_pages(fetch_page, page_size=0))
@@ -0,0 +1,65 @@
+import pytest
+
+from garmin_workouts_mcp.projection import (
+    COMPILED_PROFILES,
+    apply_projection,
+    compile_projection,
+    resolve_fields,
+)
+
+ACTIVITY = {
+    "activityId": 1,
+    "activityName": "Morning Run",
+    "activityTypeDTO": {"typeKey": "running", "typeId": 1},
+    "summaryDTO": {"distance": 10000.0, "duration": 3000.0, "averageHR": 150.0},
+    "metadataDTO": {"hasPolyline": True},
+}
+
+
+def test_compile_projection_builds_tree():
+    assert compile_projection(("a", "b.c", "b.d")) == {
+        "a": None,
+        "b": {"c": None, "d": None},
+    }
+
+
+def test_compile_projection_whole_parent_wins():
+    assert compile_projection(("b.c", "b")) == {"b": None}
+    assert compile_projection(("b", "b.c")) == {"b": None}
+
+
+def test_apply_projection_nested_and_missing_paths():
+    projection = resolve_fields("activityName,summaryDTO.distance,missing.path")
+    assert apply_projection(ACTIVITY, projection) == {
+        "activityName": "Morning Run",
+        "summaryDTO": {"distance": 10000.0},
+    }
+
+
+def test_apply_projection_lists_and_none():
+    projection = resolve_fields(["activityId"])
+    assert apply_projection([ACTIVITY, ACTIVITY], projection) == [
+        {"activityId": 1},
+        {"activityId": 1},
+    ]
+    assert apply_projection(None, projection) is None
+    assert apply_projection(ACTIVITY, None) is ACTIVITY
+
+
+def test_profile_resolves_to_precompiled_projection():
+    assert resolve_fields("summary") is COMPILED_PROFILES["summary"]
+    summary = apply_projection(ACTIVITY, resolve_fields("summary"))
+    assert summary["activityTypeDTO"] == {"typeKey": "running"}
+    assert "metadataDTO" not in summary
+
+
+def test_profiles_and_paths_mixed():
+    projection = resolve_fields(["hr", "metadataDTO"])
+    result = apply_projection(ACTIVITY, projection)
+    assert result["summaryDTO"] == {"duration": 3000.0, "averageHR": 150.0}
+    assert result["metadataDTO"] == {"hasPolyline": True}
+
+
+def test_resolve_fields_empty():
+    with pytest.raises(ValueError, match="fields must name a profile"):
+        resolve_fields(" , ")
@@ -0,0 +1,90 @@
+import pytest
+
+from garmin_workouts_mcp.ratelimit import AdaptiveRateLimiter, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_burst_then_paced():
+    clock = FakeClock()
+    limiter = AdaptiveRateLimiter(rate=2.0, burst=2, clock=clock)
+
+    assert limiter.reserve() == 0.0
+    assert limiter.reserve() == 0.0
+    assert limiter.reserve() == pytest.approx(0.5)
+    assert limiter.reserve() == pytest.approx(1.0)
+
+
+def test_tokens_refill_over_time():
+    clock = FakeClock()
+    limiter = AdaptiveRateLimiter(rate=2.0, burst=2, clock=clock)
+    limiter.reserve()
+    limiter.reserve()
+
+    clock.now = 1.0
+    assert limiter.reserve() == 0.0
+    assert limiter.reserve() == 0.0
+    assert limiter.reserve() > 0
+
+
+def test_throttle_cuts_rate_once_per_cooldown():
+    clock = FakeClock()
+    limiter = AdaptiveRateLimiter(rate=4.0, min_rate=0.5, clock=clock)
+
+    limiter.record(429)
+    limiter.record(503)
+    assert limiter.rate == 2.0
+    assert limiter.throttled == 2
+
+    clock.now = 2.0
+    limiter.record(500)
+    assert limiter.rate == 1.0
+
+    for seconds in (4.0, 6.0, 8.0):
+        clock.now = seconds
+        limiter.record(429)
+    assert limiter.rate == 0.5
+
+
+def test_success_raises_rate_up_to_max():
+    limiter = AdaptiveRateLimiter(rate=1.0, max_rate=1.2, increase=0.1)
+    limiter.record(200)
+    assert limiter.rate == pytest.approx(1.1)
+    limiter.record(204)
+    limiter.record(200)
+    assert limiter.rate == pytest.approx(1.2)
+
+
+def test_client_errors_do_not_adapt():
+    limiter = AdaptiveRateLimiter(rate=1.0)
+    limiter.record(404)
+    assert limiter.rate == 1.0
+    assert limiter.throttled == 0
+
+
+def test_retry_after_delays_next_request():
+    clock = FakeClock()
+    limiter = AdaptiveRateLimiter(rate=2.0, burst=4, clock=clock)
+    limiter.on_throttle(retry_after=3)
+
+    # Rate halved to 1/s and three seconds of debt
+    assert limiter.reserve() == pytest.approx(4.0)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("5") == 5.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") is None
+
+
+@pytest.mark.asyncio
+async def test_acquire_without_wait():
+    limiter = AdaptiveRateLimiter(burst=1)
+    await limiter.acquire()
+    assert limiter.stats()["waitedSeconds"] == 0.0
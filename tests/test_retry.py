@@ -0,0 +1,108 @@
+import random
+
+import httpx
+import pytest
+
+from garmin_workouts_mcp.client import GarminAPIError
+from garmin_workouts_mcp.retry import RetryPolicy
+
+
+class FakeTime:
+    """Clock and sleep that advance virtual time instantly."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    async def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+def make_policy(fake_time, **kwargs):
+    return RetryPolicy(
+        clock=fake_time.clock, sleep=fake_time.sleep, rng=random.Random(0), **kwargs
+    )
+
+
+def failing(errors, result="ok"):
+    errors = list(errors)
+    calls = []
+
+    async def func():
+        calls.append(1)
+        if errors:
+            raise errors.pop(0)
+        return result
+
+    return func, calls
+
+
+@pytest.mark.parametrize(
+    "error, idempotent, expected",
+    [
+        (GarminAPIError("x", status_code=503), True, True),
+        (GarminAPIError("x", status_code=429), True, True),
+        (GarminAPIError("x", status_code=404), True, False),
+        (GarminAPIError("x", status_code=400), True, False),
+        (GarminAPIError("x", status_code=503), False, False),
+        (GarminAPIError("x", status_code=429), False, True),
+        (httpx.ReadTimeout("x"), True, True),
+        (httpx.ReadTimeout("x"), False, False),
+        (httpx.ConnectError("x"), False, True),
+        (ValueError("x"), True, False),
+    ],
+)
+def test_is_retryable(error, idempotent, expected):
+    assert RetryPolicy().is_retryable(error, idempotent) is expected
+
+
+def test_backoff_full_jitter_bounded():
+    policy = RetryPolicy(base_delay=1.0, max_delay=4.0, rng=random.Random(1))
+    for attempt in range(1, 10):
+        assert 0 <= policy.backoff(attempt) <= min(4.0, 2 ** (attempt - 1))
+    assert policy.backoff(1, retry_after=10) == 10
+
+
+@pytest.mark.asyncio
+async def test_retries_until_success():
+    fake_time = FakeTime()
+    func, calls = failing([GarminAPIError("x", status_code=502)] * 2)
+
+    assert await make_policy(fake_time).run(func) == "ok"
+    assert len(calls) == 3
+    assert len(fake_time.sleeps) == 2
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_attempts():
+    fake_time = FakeTime()
+    func, calls = failing([GarminAPIError("x", status_code=503)] * 5)
+
+    with pytest.raises(GarminAPIError):
+        await make_policy(fake_time, max_attempts=3).run(func)
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_deadline_stops_retries():
+    fake_time = FakeTime()
+    func, calls = failing([GarminAPIError("x", status_code=429, retry_after=20)] * 3)
+
+    with pytest.raises(GarminAPIError):
+        await make_policy(fake_time, deadline=30).run(func)
+    # The second Retry-After wait would end past the deadline
+    assert len(calls) == 2
+    assert fake_time.sleeps == [20]
+
+
+@pytest.mark.asyncio
+async def test_post_idempotency_override():
+    fake_time = FakeTime()
+    func, calls = failing([GarminAPIError("x", status_code=503)])
+
+    assert await make_policy(fake_time).run(func, "POST", idempotent=True) == "ok"
+    assert len(calls) == 2
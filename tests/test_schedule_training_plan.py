@@ -0,0 +1,97 @@
+import copy
+
+from garmin_workouts_mcp.garmin_workout import make_payload
+from garmin_workouts_mcp.models import WorkoutData
+from garmin_workouts_mcp.schedule_training_plan import GarminWorkoutScheduler
+
+PLANNED = {
+    "name": "Tempo Tuesday",
+    "type": "running",
+    "steps": [
+        {
+            "stepName": "Warm up",
+            "stepType": "warmup",
+            "endConditionType": "time",
+            "stepDuration": 600,
+        },
+        {
+            "stepName": "Main set",
+            "stepType": "repeat",
+            "numberOfIterations": 3,
+            "steps": [
+                {
+                    "stepName": "Tempo",
+                    "stepType": "interval",
+                    "endConditionType": "distance",
+                    "stepDistance": 2,
+                    "distanceUnit": "km",
+                    "target": {
+                        "type": "pace",
+                        "value": [4.5, 4.75],
+                        "unit": "min_per_km",
+                    },
+                },
+                {
+                    "stepName": "Jog",
+                    "stepType": "recovery",
+                    "endConditionType": "time",
+                    "stepDuration": 90,
+                },
+            ],
+        },
+    ],
+}
+
+
+def existing_workout(workout=PLANNED, name="Tempo Tuesday"):
+    """A Garmin workout as uploaded from ``workout`` and returned by the workout endpoint."""
+    payload = make_payload(workout)
+    payload["workoutName"] = name
+    payload["workoutId"] = 123
+    return payload
+
+
+def test_workouts_match_same_plan():
+    scheduler = GarminWorkoutScheduler(dry_run=True)
+
+    assert scheduler.workouts_match(
+        existing_workout(name="Week 3 - Tempo Tuesday"), WorkoutData(**PLANNED)
+    )
+
+
+def test_workouts_match_ignores_units_and_labels():
+    scheduler = GarminWorkoutScheduler(dry_run=True)
+    existing = existing_workout()
+    tempo = existing["workoutSegments"][0]["workoutSteps"][1]["workoutSteps"][0]
+    tempo["preferredEndConditionUnit"] = {"unitKey": "meter"}
+    tempo["description"] = "Edited in Garmin Connect"
+
+    assert scheduler.workouts_match(existing, WorkoutData(**PLANNED))
+
+
+def test_workouts_match_detects_changed_structure():
+    scheduler = GarminWorkoutScheduler(dry_run=True)
+    changed = copy.deepcopy(PLANNED)
+    changed["steps"][1]["numberOfIterations"] = 4
+
+    assert not scheduler.workouts_match(
+        existing_workout(changed), WorkoutData(**PLANNED)
+    )
+
+
+def test_workouts_match_detects_changed_target():
+    scheduler = GarminWorkoutScheduler(dry_run=True)
+    changed = copy.deepcopy(PLANNED)
+    changed["steps"][1]["steps"][0]["target"]["value"] = [5.0, 5.25]
+
+    assert not scheduler.workouts_match(
+        existing_workout(changed), WorkoutData(**PLANNED)
+    )
+
+
+def test_workouts_match_requires_related_names():
+    scheduler = GarminWorkoutScheduler(dry_run=True)
+
+    assert not scheduler.workouts_match(
+        existing_workout(name="Long run"), WorkoutData(**PLANNED)
+    )
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from garmin_workouts_mcp.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_call():
+    group = SingleFlight()
+    calls = []
+
+    async def func():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"value": 42}
+
+    results = await asyncio.gather(*(group.do("key", func) for _ in range(5)))
+
+    assert results == [{"value": 42}] * 5
+    assert len(calls) == 1
+    assert group.started == 1
+    assert group.shared == 4
+    assert len(group) == 0
+
+
+@pytest.mark.asyncio
+async def test_key_released_after_completion():
+    group = SingleFlight()
+    calls = []
+
+    async def func():
+        calls.append(1)
+        return len(calls)
+
+    assert await group.do("key", func) == 1
+    assert await group.do("key", func) == 2
+
+
+@pytest.mark.asyncio
+async def test_exception_shared_by_all_waiters():
+    group = SingleFlight()
+
+    async def func():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        group.do("key", func), group.do("key", func), return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert len(group) == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_call():
+    group = SingleFlight()
+
+    async def func():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    first = asyncio.ensure_future(group.do("key", func))
+    second = asyncio.ensure_future(group.do("key", func))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "done"
+
+
+@pytest.mark.asyncio
+async def test_forgotten_call_not_joined():
+    group = SingleFlight()
+    calls = []
+
+    async def func():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    first = asyncio.ensure_future(group.do(("/a", 1), func))
+    await asyncio.sleep(0)
+    assert group.forget(lambda key: key[0] == "/a") == 1
+    second = asyncio.ensure_future(group.do(("/a", 1), func))
+
+    assert await first == 2
+    assert await second == 2
+    assert len(calls) == 2
+    assert len(group) == 0
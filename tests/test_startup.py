@@ -0,0 +1,29 @@
+import subprocess
+import sys
+
+import pytest
+
+# Modules that must not be loaded just by importing an entry point; they are
+# imported on first use to keep per-session cold starts fast
+DEFERRED_IMPORTS = {
+    "garmin_workouts_mcp.main": ["garth"],
+    "garmin_workouts_mcp.schedule_training_plan": [
+        "garth",
+        "rich.progress",
+        "rich.table",
+    ],
+}
+
+
+@pytest.mark.parametrize("module, deferred", DEFERRED_IMPORTS.items())
+def test_entry_point_defers_heavy_imports(module, deferred):
+    """Test that importing an entry point in a fresh interpreter skips deferred modules."""
+    code = (
+        "import sys\n"
+        f"import {module}\n"
+        f"print(','.join(m for m in {deferred!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == ""
@@ -0,0 +1,104 @@
+from datetime import date
+
+import pytest
+
+from garmin_workouts_mcp.activity_store import ActivityStore
+from garmin_workouts_mcp.training_load import (
+    WARMUP_DAYS,
+    compute_training_load,
+    exponential_average,
+    report_period,
+)
+
+
+def test_report_period_starts_on_monday():
+    # 2025-06-18 is a Wednesday
+    assert report_period(date(2025, 6, 18), 2) == (date(2025, 6, 9), date(2025, 6, 18))
+
+
+def test_exponential_average():
+    assert exponential_average([7.0, 0.0], 7) == [1.0, pytest.approx(6 / 7)]
+    constant = exponential_average([100.0] * 500, 42)
+    assert constant[-1] == pytest.approx(100.0, abs=0.01)
+
+
+def test_compute_training_load_weekly_table():
+    totals = [
+        ("2025-06-02", 10000.0, 3600.0, 70.0, 1),
+        ("2025-06-04", 5000.0, 1800.0, 35.0, 1),
+        ("2025-06-10", 21100.0, 7200.0, 140.0, 2),
+        # Before the warm-up window: ignored
+        ("2024-01-01", 42000.0, 14400.0, 300.0, 1),
+    ]
+
+    result = compute_training_load(
+        totals, date(2025, 6, 2), date(2025, 6, 11), daily=True
+    )
+
+    assert result["weekly"]["columns"][:5] == [
+        "weekStart",
+        "activities",
+        "distanceKm",
+        "durationH",
+        "load",
+    ]
+    rows = result["weekly"]["rows"]
+    assert [row[:5] for row in rows] == [
+        ["2025-06-02", 2, 15.0, 1.5, 105.0],
+        ["2025-06-09", 2, 21.1, 2.0, 140.0],
+    ]
+    daily = result["daily"]["rows"]
+    assert len(daily) == 10
+    assert daily[0][:2] == ["2025-06-02", 70.0]
+    assert daily[0][2] == 10.0  # ATL after one day: 70 / 7
+    assert result["current"] == {
+        "atl": daily[-1][2],
+        "ctl": daily[-1][3],
+        "tsb": daily[-1][4],
+    }
+    assert rows[-1][5:] == daily[-1][2:]
+
+
+def test_warmup_history_seeds_chronic_load():
+    start = date(2025, 6, 2)
+    history = [
+        (date.fromordinal(start.toordinal() - d).isoformat(), 0.0, 0.0, 50.0, 1)
+        for d in range(1, WARMUP_DAYS + 1)
+    ]
+
+    result = compute_training_load(history, start, start)
+
+    assert result["current"]["ctl"] > 40
+    assert result["weekly"]["rows"][0][1] == 0
+
+
+def test_daily_totals():
+    store = ActivityStore(":memory:")
+    store.upsert(
+        [
+            {
+                "activityId": i,
+                "activityType": {"typeKey": type_key},
+                "startTimeLocal": start,
+                "distance": 1000.0,
+                "duration": 600.0,
+                **({"activityTrainingLoad": 20.5} if i != 3 else {}),
+            }
+            for i, start, type_key in [
+                (1, "2025-06-01 07:00:00", "running"),
+                (2, "2025-06-01 18:00:00", "cycling"),
+                (3, "2025-06-02 07:00:00", "running"),
+                (4, "2025-06-03 07:00:00", "running"),
+            ]
+        ]
+    )
+
+    assert store.daily_totals(date(2025, 6, 1), date(2025, 6, 2)) == [
+        ("2025-06-01", 2000.0, 1200.0, 41.0, 2),
+        ("2025-06-02", 1000.0, 600.0, 0.0, 1),
+    ]
+    assert store.daily_totals(
+        date(2025, 6, 1), date(2025, 6, 3), type_key="cycling"
+    ) == [
+        ("2025-06-01", 1000.0, 600.0, 20.5, 1),
+    ]
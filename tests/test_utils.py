@@ -0,0 +1,52 @@
+from garmin_workouts_mcp.utils import (
+    compile_workout_description,
+    parse_workout_intelligently,
+    split_workout_description,
+)
+
+
+def test_split_workout_description_keeps_repeats_whole():
+    assert split_workout_description(
+        "2km warmup, 6x(1km at 170bpm, 90sec recovery) then 2km cooldown"
+    ) == [
+        "2km warmup",
+        "6x(1km at 170bpm, 90sec recovery)",
+        "2km cooldown",
+    ]
+
+
+def test_compile_workout_description_reports_unparsed_segments():
+    workout, unparsed = compile_workout_description(
+        "2km warmup, strides, 20min tempo", "Tempo Run"
+    )
+
+    assert unparsed == ["strides"]
+    assert [step.stepType for step in workout.steps] == ["warmup", "interval"]
+
+
+def test_compile_workout_description_falls_back_to_single_step():
+    workout, unparsed = compile_workout_description("fartlek", "Fartlek")
+
+    assert unparsed == ["fartlek"]
+    assert len(workout.steps) == 1
+    assert workout.steps[0].stepDuration == 1800
+    assert parse_workout_intelligently("fartlek", "Fartlek") == workout
+
+
+def test_compile_workout_description_reports_unparsed_repeat_steps():
+    workout, unparsed = compile_workout_description(
+        "4x(5min at zone 2, flamingo dance)", "Intervals"
+    )
+
+    assert unparsed == ["flamingo dance"]
+    assert len(workout.steps[0].steps) == 1
+
+
+def test_compile_workout_description_reports_repeat_without_parentheses():
+    workout, unparsed = compile_workout_description(
+        "2km warmup, 10x400m at 5k pace", "Intervals"
+    )
+
+    # Still compiled (as a single 400m step), but reported
+    assert unparsed == ["10x400m at 5k pace"]
+    assert workout.steps[1].stepDistance == 400
@@ -0,0 +1,171 @@
+import pytest
+
+from garmin_workouts_mcp.garmin_workout import make_payload
+from garmin_workouts_mcp.validation import (
+    WorkoutValidationError,
+    json_path,
+    validate_workout,
+    workout_errors,
+)
+
+
+def test_json_path():
+    assert (
+        json_path(("steps", 1, "steps", 0, "stepDuration"))
+        == "$.steps[1].steps[0].stepDuration"
+    )
+    assert json_path(()) == "$"
+
+
+def test_valid_workout_has_no_errors():
+    workout = {
+        "name": "Intervals",
+        "type": "running",
+        "steps": [
+            {
+                "stepType": "warmup",
+                "endConditionType": "distance",
+                "stepDistance": 2,
+                "distanceUnit": "km",
+            },
+            {
+                "stepType": "repeat",
+                "numberOfIterations": 4,
+                "steps": [
+                    {
+                        "stepType": "interval",
+                        "stepDuration": 240,
+                        "target": {
+                            "type": "pace",
+                            "value": [4.0, 4.2],
+                            "unit": "min_per_km",
+                        },
+                    },
+                    {
+                        "stepType": "recovery",
+                        "stepDuration": 120,
+                        "target": {"type": "no target", "value": None},
+                    },
+                ],
+            },
+        ],
+    }
+
+    assert workout_errors(workout) == []
+    assert make_payload(validate_workout(workout)) == make_payload(workout)
+
+
+def test_all_errors_are_reported_with_paths():
+    workout = {
+        "name": "Broken",
+        "type": "rowing",
+        "steps": [
+            {"stepName": "Warmup", "stepType": "warmup"},
+            {
+                "stepType": "repeat",
+                "numberOfIterations": 3,
+                "steps": [
+                    {"stepDuration": 60, "target": {"type": "heart_rate_zone"}},
+                    {
+                        "stepType": "interval",
+                        "endConditionType": "distance",
+                        "stepDistance": 400,
+                        "distanceUnit": "yd",
+                    },
+                    {"stepType": "interval", "stepDuration": "fast"},
+                ],
+            },
+            {"stepType": "repeat", "numberOfIterations": 0, "steps": []},
+            {
+                "stepType": "interval",
+                "stepDuration": 60,
+                "target": {"type": "pace", "value": [0, 5], "unit": "min_per_km"},
+            },
+        ],
+    }
+
+    errors = {error["path"]: error["message"] for error in workout_errors(workout)}
+
+    assert errors == {
+        "$.type": "Unsupported sport type: rowing",
+        "$.steps[0].stepDuration": "Invalid or missing stepDuration for step: Warmup",
+        "$.steps[1].steps[0].stepType": "Missing stepType for step: Unnamed Step",
+        "$.steps[1].steps[0].target.type": "Unsupported target type: heart_rate_zone",
+        "$.steps[1].steps[1].distanceUnit": "Unsupported distance unit: yd",
+        "$.steps[1].steps[2].stepDuration": "Input should be a valid number, unable to parse string as a number",
+        "$.steps[2].numberOfIterations": (
+            "Repeat step Unnamed Step needs a positive numberOfIterations and a non-empty steps list"
+        ),
+        "$.steps[3].target.value": "Pace targets must be positive minutes per km",
+    }
+
+
+def test_validate_workout_normalizes_and_raises():
+    normalized = validate_workout(
+        {
+            "name": "Easy",
+            "type": "running",
+            "steps": [{"stepType": "interval", "stepDuration": "600"}],
+            "extra": 1,
+        }
+    )
+    assert normalized == {
+        "name": "Easy",
+        "type": "running",
+        "steps": [{"stepType": "interval", "stepDuration": 600}],
+    }
+
+    with pytest.raises(WorkoutValidationError) as exc_info:
+        validate_workout(
+            {"name": "Easy", "type": "running", "steps": [{"stepType": "interval"}]}
+        )
+    assert isinstance(exc_info.value, ValueError)
+    assert (
+        str(exc_info.value)
+        == "$.steps[0].stepDuration: Invalid or missing stepDuration for step: Unnamed Step"
+    )
+    assert len(exc_info.value.errors) == 1
+
+
+def test_fractional_duration_accepted_like_make_payload():
+    workout = {
+        "name": "Strides",
+        "type": "running",
+        "steps": [{"stepType": "interval", "stepDuration": 37.5}],
+    }
+
+    normalized = validate_workout(workout)
+
+    assert normalized["steps"][0]["stepDuration"] == 37.5
+    assert make_payload(normalized) == make_payload(workout)
+
+    whole = validate_workout(
+        {**workout, "steps": [{"stepType": "interval", "stepDuration": 60.0}]}
+    )
+    assert whole["steps"][0]["stepDuration"] == 60
+    assert isinstance(whole["steps"][0]["stepDuration"], int)
+
+
+def test_deeply_nested_workout_validates():
+    depth = 1000
+    steps = [{"stepType": "interval", "stepDuration": 60}]
+    for _ in range(depth):
+        steps = [{"stepType": "repeat", "numberOfIterations": 1, "steps": steps}]
+    workout = {"name": "Deep", "type": "running", "steps": steps}
+
+    assert workout_errors(workout) == []
+    assert make_payload(validate_workout(workout)) == make_payload(workout)
+
+    # An invalid innermost step is reported with its full path
+    innermost = workout["steps"][0]
+    for _ in range(depth - 1):
+        innermost = innermost["steps"][0]
+    innermost["steps"][0]["stepDuration"] = 0
+
+    errors = workout_errors(workout)
+    assert errors == [
+        {
+            "path": "$" + ".steps[0]" * (depth + 1) + ".stepDuration",
+            "message": "Invalid or missing stepDuration for step: Unnamed Step",
+        }
+    ]
@@ -0,0 +1,49 @@
+from garmin_workouts_mcp.workout_index import (
+    WorkoutIndex,
+    get_workout_index,
+    payload_hash,
+)
+
+
+def test_payload_hash_ignores_key_order():
+    a = {
+        "workoutName": "Run",
+        "sportType": {"sportTypeId": 1, "sportTypeKey": "running"},
+    }
+    b = {
+        "sportType": {"sportTypeKey": "running", "sportTypeId": 1},
+        "workoutName": "Run",
+    }
+
+    assert payload_hash(a) == payload_hash(b)
+    assert payload_hash(a) != payload_hash({**a, "workoutName": "Other"})
+
+
+def test_put_get_and_discard():
+    index = WorkoutIndex(":memory:")
+
+    assert index.get("abc") is None
+    index.put("abc", 123)
+    index.put("def", "123")
+    index.put("ghi", "456")
+
+    assert index.get("abc") == "123"
+    assert index.count() == 3
+    assert index.discard("123") == 2
+    assert index.get("abc") is None
+    assert index.get("ghi") == "456"
+
+
+def test_index_persists_and_is_per_athlete(tmp_path):
+    path = str(tmp_path / "workouts.sqlite3")
+    index = WorkoutIndex(path)
+    index.put("abc", "1")
+    index.close()
+
+    reopened = WorkoutIndex(path)
+    assert reopened.get("abc") == "1"
+    reopened.close()
+
+    get_workout_index().put("abc", "1")
+    assert get_workout_index("jane").get("abc") is None
+    assert get_workout_index("jane") is get_workout_index("jane")